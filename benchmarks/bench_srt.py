@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Benchmark for the shared srt module of transcription-tools.
+
+Generates a seeded SRT file (default 100k cues) and reports parse and
+parse+serialize throughput, the memory held per parsed Cue, and whether the
+round trip is byte-identical.
+
+Usage:
+    python benchmarks/bench_srt.py
+    python benchmarks/bench_srt.py --cues 1000000 --crlf
+"""
+
+import argparse
+import io
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# generators puts the skill script directories on sys.path
+from generators import generate_srt  # noqa: E402
+import srt  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cues", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--crlf", action="store_true", help="use CRLF line endings")
+    args = parser.parse_args()
+
+    data = generate_srt(args.cues, args.seed, "\r\n" if args.crlf else "\n")
+    print(f"Input: {args.cues} cues, {len(data.encode('utf-8')) / 1e6:.1f} MB")
+
+    start = time.perf_counter()
+    count = sum(1 for _ in srt.iter_cues(io.StringIO(data, newline="")))
+    elapsed = time.perf_counter() - start
+    print(f"Stream parse:    {elapsed:.2f}s ({count / elapsed:,.0f} cues/s)")
+
+    tracemalloc.start()
+    fmt = srt.SrtFormat()
+    cues = srt.parse(data, fmt)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"Parsed cues:     {held / len(cues):.0f} bytes/cue held")
+
+    start = time.perf_counter()
+    out = srt.compose(cues, fmt)
+    elapsed = time.perf_counter() - start
+    print(f"Serialize:       {elapsed:.2f}s ({len(cues) / elapsed:,.0f} cues/s)")
+    print(f"Round trip:      {'identical' if out == data else 'DIFFERENT'}")
+    return 0 if out == data else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
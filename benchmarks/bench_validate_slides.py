@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Per-line cost benchmark for validate_slides.py.
+
+Generates a large seeded synthetic Marp deck and reports:
+
+1. ns/line of matching the per-line patterns of the PATTERNS registry
+   through inline ``re.match(str, ...)`` calls vs. their precompiled objects
+   (the same patterns on both sides, so only the lookup cost differs).
+2. ns/line of a full ``SlideValidator.validate_content`` run, optionally for
+   an older copy of validate_slides.py for a before/after comparison.
+
+Usage:
+    python benchmarks/bench_validate_slides.py
+    python benchmarks/bench_validate_slides.py --slides 5000 --compare old/validate_slides.py
+"""
+
+import argparse
+import importlib.util
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# generators puts the skill script directories on sys.path
+from generators import generate_deck  # noqa: E402
+import validate_slides  # noqa: E402
+
+
+def bench_patterns(lines: list[str], repeat: int) -> tuple[float, float]:
+    """Return ns/line for inline string patterns vs. registry patterns.
+
+    Both sides run the same registry patterns; the inline side passes the
+    pattern strings, as the validator did before the registry.
+    """
+    per_line = [
+        ("findall", validate_slides.CLASS_RE),
+        ("match", validate_slides.TABLE_SEPARATOR_RE),
+        ("match", validate_slides.LIST_MARKER_RE),
+    ]
+    inline = [(getattr(re, method), regex.pattern) for method, regex in per_line]
+    compiled = [getattr(regex, method) for method, regex in per_line]
+
+    best_inline = best_compiled = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            for func, pattern in inline:
+                func(pattern, line)
+        best_inline = min(best_inline, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for line in lines:
+            for func in compiled:
+                func(line)
+        best_compiled = min(best_compiled, time.perf_counter() - start)
+
+    n = len(lines)
+    return best_inline / n * 1e9, best_compiled / n * 1e9
+
+
+def bench_validator(module, content: str, repeat: int) -> float:
+    """Return ns/line of a full validation run."""
+    best = float("inf")
+    for _ in range(repeat):
+        validator = module.SlideValidator()
+        start = time.perf_counter()
+        validator.validate_content(content)
+        best = min(best, time.perf_counter() - start)
+    return best / content.count("\n") * 1e9
+
+
+def load_module(path: Path, name: str):
+    """Import a validate_slides.py copy from an arbitrary path."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slides", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--compare", type=Path, help="older validate_slides.py to benchmark as 'before'"
+    )
+    args = parser.parse_args()
+
+    content = generate_deck(args.slides, args.seed)
+    lines = content.split("\n")
+    print(f"Deck: {args.slides} slides, {len(lines)} lines")
+
+    inline_ns, compiled_ns = bench_patterns(lines, args.repeat)
+    print(
+        f"Pattern matching: inline {inline_ns:.0f} ns/line, registry {compiled_ns:.0f} ns/line"
+    )
+
+    if args.compare:
+        before = load_module(args.compare, "validate_slides_before")
+        print(
+            f"Validator before: {bench_validator(before, content, args.repeat):.0f} ns/line"
+        )
+    print(
+        f"Validator after:  {bench_validator(validate_slides, content, args.repeat):.0f} ns/line"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""Seeded synthetic inputs for the benchmarks.
+
+Every generator is deterministic for a given seed so results stay comparable
+across runs and machines.
+"""
+
+import io
+import json
+import random
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MARP_SCRIPTS = ROOT / "marp-slide-writer" / "skills" / "marp-slide-writer" / "scripts"
+SRT_SCRIPTS = (
+    ROOT / "transcription-tools" / "skills" / "srt-transcription-fixer" / "scripts"
+)
+VALIDATE_PY = (
+    ROOT
+    / "claude-dev-kit"
+    / "skills"
+    / "claude-skill-creator"
+    / "examples"
+    / "3-skill-with-scripts"
+    / "scripts"
+    / "validate.py"
+)
+for _path in (MARP_SCRIPTS, SRT_SCRIPTS):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import srt  # noqa: E402
+
+DECK_WORDS = [
+    "Claude",
+    "コード",
+    "スライド",
+    "設定",
+    "API",
+    "ファイル",
+    "ルール",
+    "test",
+    "日本語の説明",
+]
+JAPANESE_WORDS = ["コード", "スライド", "設定", "ファイル", "ルール", "日本語の説明", "開発"]
+ASCII_WORDS = ["Claude", "API", "test", "config", "deploy", "hooks", "agent"]
+
+SRT_WORDS = [
+    "クロードコード",
+    "では",
+    "ファイル",
+    "設定",
+    "ルール",
+    "できます",
+    "API",
+    "、",
+    "。",
+]
+
+
+@dataclass(frozen=True)
+class DeckMix:
+    """Probabilities that shape a generated deck.
+
+    ``japanese_ratio=None`` draws from the original mixed word list so decks
+    generated before the mix existed stay byte-identical.
+    """
+
+    code: float = 0.5
+    table: float = 0.3
+    max_bullets: int = 8
+    japanese_ratio: float | None = None
+
+
+DECK_MIXES = {
+    "default": DeckMix(),
+    "code-heavy": DeckMix(code=0.9, table=0.1, max_bullets=3),
+    "table-heavy": DeckMix(code=0.1, table=0.9, max_bullets=3),
+    "bullet-heavy": DeckMix(code=0.1, table=0.1, max_bullets=14),
+    "japanese": DeckMix(japanese_ratio=1.0),
+    "ascii": DeckMix(japanese_ratio=0.0),
+}
+
+
+def generate_deck(slides: int, seed: int = 0, mix: DeckMix = DeckMix()) -> str:
+    """Build a deck mixing headings, bullets, code and tables."""
+    rng = random.Random(seed)
+
+    def word() -> str:
+        if mix.japanese_ratio is None:
+            return rng.choice(DECK_WORDS)
+        pool = JAPANESE_WORDS if rng.random() < mix.japanese_ratio else ASCII_WORDS
+        return rng.choice(pool)
+
+    def words(k: int) -> str:
+        return "".join(word() for _ in range(k))
+
+    parts = ["---\nmarp: true\n---\n"]
+    for _ in range(slides):
+        lines = []
+        if rng.random() < 0.2:
+            lines.append(f"<!-- _class: {rng.choice(['no-header', 'small-text'])} -->")
+        lines.append("# " + words(rng.randint(2, 6)))
+        if rng.random() < 0.4:
+            lines.append(words(4))
+        for _ in range(rng.randint(0, mix.max_bullets)):
+            lines.append(
+                " " * rng.choice([0, 0, 2, 4]) + "- " + words(rng.randint(1, 8))
+            )
+        if rng.random() < mix.code:
+            lines.append("```python")
+            lines.extend(words(rng.randint(1, 10)) for _ in range(rng.randint(1, 14)))
+            lines.append("```")
+        if rng.random() < mix.table:
+            lines.append("| a | b |")
+            lines.append("|---|---|")
+            lines.extend(
+                f"| {words(1)} | {words(2)} |" for _ in range(rng.randint(1, 6))
+            )
+        parts.append("\n".join(lines))
+    return "\n---\n".join(parts)
+
+
+def generate_srt(cues: int, seed: int = 0, newline: str = "\n") -> str:
+    """Build an SRT document with 1-2 text lines per cue."""
+    rng = random.Random(seed)
+    out = io.StringIO()
+    t = 0
+    for i in range(1, cues + 1):
+        duration = rng.randint(500, 4000)
+        out.write(f"{i}{newline}")
+        out.write(
+            f"{srt.format_timestamp(t)} --> {srt.format_timestamp(t + duration)}{newline}"
+        )
+        for _ in range(rng.choice((1, 1, 2))):
+            text = "".join(rng.choice(SRT_WORDS) for _ in range(rng.randint(2, 10)))
+            out.write(text + newline)
+        out.write(newline)
+        t += duration + rng.randint(0, 300)
+    return out.getvalue()
+
+
+def generate_project(root: Path) -> None:
+    """Lay out a small Node project that passes the example validate.py."""
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "package.json").write_text(
+        json.dumps({"name": "bench", "version": "1.0.0"}), encoding="utf-8"
+    )
+    (root / "README.md").write_text("# bench\n", encoding="utf-8")
+    (root / ".gitignore").write_text("node_modules/\n", encoding="utf-8")
+    (root / ".git").mkdir(exist_ok=True)
+    (root / "node_modules").mkdir(exist_ok=True)
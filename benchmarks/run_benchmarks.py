@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""Benchmark suite for the repository's scripts.
+
+Runs seeded workloads against validate_slides.py (Marp decks of several sizes
+and code/table/bullet/Japanese mixes), the srt-transcription-fixer scripts
+(SRT files from 1k cues up to 1M with --full) and the interpreter startup of
+each command-line script, including the claude-skill-creator example
+validate.py. Throughput, peak traced memory and startup time are written as
+JSON and compared against a stored baseline; metrics that got worse by more
+than --threshold are flagged and make the run exit with status 1.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --quick --suite deck,srt
+    python benchmarks/run_benchmarks.py --save-baseline
+    python benchmarks/run_benchmarks.py --baseline old.json --threshold 0.2
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# generators puts the skill script directories on sys.path
+from generators import (  # noqa: E402
+    DECK_MIXES,
+    MARP_SCRIPTS,
+    ROOT,
+    SRT_SCRIPTS,
+    VALIDATE_PY,
+    generate_deck,
+    generate_project,
+    generate_srt,
+)
+import remove_trailing_punctuation  # noqa: E402
+import srt  # noqa: E402
+import validate_slides  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_OUTPUT = RESULTS_DIR / "latest.json"
+DEFAULT_BASELINE = RESULTS_DIR / "baseline.json"
+
+
+@dataclass
+class Metric:
+    """One measured number."""
+
+    value: float
+    unit: str
+    higher_is_better: bool = True
+
+
+@dataclass
+class Config:
+    """Workload sizes for one run."""
+
+    slides: tuple[int, ...] = (100, 1000, 5000)
+    cues: tuple[int, ...] = (1_000, 10_000, 100_000)
+    repeat: int = 3
+    startup_runs: int = 5
+    seed: int = 0
+
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    """Return the fastest wall time of ``repeat`` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_mb(func: Callable[[], object]) -> float:
+    """Return the peak traced allocation of one call in MiB."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def bench_decks(config: Config) -> dict[str, Metric]:
+    """Validate generated decks for every size and content mix."""
+    metrics = {}
+    for mix_name, mix in DECK_MIXES.items():
+        for slides in config.slides:
+            content = generate_deck(slides, config.seed, mix)
+            lines = content.count("\n") + 1
+
+            def run() -> None:
+                validate_slides.SlideValidator().validate_content(content)
+
+            elapsed = _best_of(config.repeat, run)
+            metrics[f"deck.{mix_name}.{slides}.lines_per_s"] = Metric(
+                lines / elapsed, "lines/s"
+            )
+            if mix_name == "default":
+                metrics[f"deck.{mix_name}.{slides}.peak_mb"] = Metric(
+                    _peak_mb(run), "MiB", higher_is_better=False
+                )
+    return metrics
+
+
+def bench_srt(config: Config) -> dict[str, Metric]:
+    """Parse, serialize and fix generated SRT files of every size."""
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for cues in config.cues:
+            data = generate_srt(cues, config.seed)
+            path = Path(tmp) / f"{cues}.srt"
+            path.write_text(data, encoding="utf-8")
+            out = Path(tmp) / f"{cues}.out.srt"
+
+            def parse() -> None:
+                for _ in srt.iter_cues(io.StringIO(data, newline="")):
+                    pass
+
+            def fix() -> None:
+                remove_trailing_punctuation.process_srt(str(path), str(out), max_log=0)
+
+            parsed = srt.parse(data)
+            repeat = config.repeat if cues < 1_000_000 else 1
+            metrics[f"srt.{cues}.parse_cues_per_s"] = Metric(
+                cues / _best_of(repeat, parse), "cues/s"
+            )
+            metrics[f"srt.{cues}.serialize_cues_per_s"] = Metric(
+                cues / _best_of(repeat, lambda: srt.compose(parsed)), "cues/s"
+            )
+            del parsed
+            metrics[f"srt.{cues}.fix_cues_per_s"] = Metric(
+                cues / _best_of(repeat, fix), "cues/s"
+            )
+            # Streaming should keep this flat as the file grows
+            metrics[f"srt.{cues}.fix_peak_mb"] = Metric(
+                _peak_mb(fix), "MiB", higher_is_better=False
+            )
+    return metrics
+
+
+def bench_startup(config: Config) -> dict[str, Metric]:
+    """Time a cold interpreter running each command-line script."""
+    commands = {
+        "validate_slides": [str(MARP_SCRIPTS / "validate_slides.py"), "--help"],
+        "remove_trailing_punctuation": [
+            str(SRT_SCRIPTS / "remove_trailing_punctuation.py"),
+            "--help",
+        ],
+        "validate": [str(VALIDATE_PY)],
+    }
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / "project"
+        generate_project(project)
+        for name, args in commands.items():
+
+            def run() -> None:
+                subprocess.run(
+                    [sys.executable, *args],
+                    cwd=project,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    check=False,
+                )
+
+            metrics[f"startup.{name}.ms"] = Metric(
+                _best_of(config.startup_runs, run) * 1000, "ms", higher_is_better=False
+            )
+    return metrics
+
+
+SUITES: dict[str, Callable[[Config], dict[str, Metric]]] = {
+    "deck": bench_decks,
+    "srt": bench_srt,
+    "startup": bench_startup,
+}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(
+    current: dict[str, Metric], baseline: dict[str, Metric], threshold: float
+) -> list[tuple[str, float, float, float, bool]]:
+    """Return (name, baseline, current, change, regressed) for shared metrics."""
+    rows = []
+    for name, metric in current.items():
+        old = baseline.get(name)
+        if old is None or old.value == 0:
+            continue
+        change = (metric.value - old.value) / old.value
+        worse = -change if metric.higher_is_better else change
+        rows.append((name, old.value, metric.value, change, worse > threshold))
+    return rows
+
+
+def load_results(path: Path) -> dict[str, Metric]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {name: Metric(**metric) for name, metric in data["metrics"].items()}
+
+
+def write_results(path: Path, metrics: dict[str, Metric], config: Config) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "config": asdict(config),
+        },
+        "metrics": {name: asdict(metric) for name, metric in sorted(metrics.items())},
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--suite",
+        default=",".join(SUITES),
+        help=f"comma-separated suites to run ({', '.join(SUITES)})",
+    )
+    parser.add_argument("--quick", action="store_true", help="small sizes, one repeat")
+    parser.add_argument("--full", action="store_true", help="add the 1M-cue SRT file")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help="results JSON to compare against (skipped if missing)",
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="also store this run as the baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="relative slowdown that counts as a regression (default: 0.15)",
+    )
+    args = parser.parse_args()
+
+    if args.quick:
+        config = Config(slides=(100, 500), cues=(1_000, 10_000), repeat=1, startup_runs=2)
+    else:
+        config = Config()
+    if args.full:
+        config.cues = (*config.cues, 1_000_000)
+    config.seed = args.seed
+
+    names = [name.strip() for name in args.suite.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite: {', '.join(unknown)}")
+
+    metrics: dict[str, Metric] = {}
+    for name in names:
+        start = time.perf_counter()
+        results = SUITES[name](config)
+        metrics.update(results)
+        print(f"{name}: {len(results)} metrics in {time.perf_counter() - start:.1f}s")
+        for metric_name, metric in results.items():
+            print(f"  {metric_name:<44} {metric.value:>14,.1f} {metric.unit}")
+
+    write_results(args.output, metrics, config)
+    print(f"\nResults written to {args.output}")
+
+    regressed = []
+    if args.baseline.exists() and args.baseline.resolve() != args.output.resolve():
+        rows = compare(metrics, load_results(args.baseline), args.threshold)
+        print(f"\nCompared with {args.baseline} (threshold {args.threshold:.0%}):")
+        for name, old, new, change, is_regression in rows:
+            flag = "  REGRESSION" if is_regression else ""
+            print(f"  {name:<44} {old:>14,.1f} -> {new:>14,.1f} ({change:+.1%}){flag}")
+            if is_regression:
+                regressed.append(name)
+        print(f"{len(regressed)} regression(s) in {len(rows)} compared metrics")
+
+    if args.save_baseline:
+        write_results(args.baseline, metrics, config)
+        print(f"Baseline saved to {args.baseline}")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,12 +4,25 @@ Project Validator Script
 
 This script validates common project structure and configuration.
 It checks for required files, valid JSON, git setup, and dependencies.
+
+Each project directory is listed once with os.scandir and every check runs
+against that snapshot on a thread pool. With --monorepo, every package.json
+root below the given directory is validated in parallel, and --json prints
+one consolidated, machine-readable report.
+
+Usage:
+    python validate.py
+    python validate.py path/to/project
+    python validate.py --monorepo . --json > report.json
 """
 
-import os
+import argparse
 import json
+import os
 import sys
-from pathlib import Path
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 
 
 class Colors:
@@ -29,109 +42,251 @@ def check_mark(passed):
     return f"{Colors.RED}✗{Colors.END}"
 
 
-def validate_file_exists(filepath, description):
+# Directories never searched for packages in --monorepo mode (hidden ones too)
+SKIP_DIRS = {'node_modules', 'dist', 'build', 'coverage'}
+
+
+class Snapshot:
+    """Entries of one project directory, listed once with os.scandir
+
+    workspace is the --monorepo root the project was found under, or None
+    for a single project.
+    """
+
+    def __init__(self, root, entries=None, workspace=None):
+        self.root = root
+        if entries is None:
+            with os.scandir(root) as it:
+                entries = {entry.name: entry for entry in it}
+        self.entries = entries
+        self.workspace = workspace
+
+    def exists(self, name):
+        return name in self.entries
+
+    def exists_in_workspace(self, name):
+        """Check the project, then its parents up to the workspace root"""
+        if self.exists(name):
+            return True
+        root = os.path.abspath(self.root)
+        if self.workspace is None or root == self.workspace:
+            return False
+        return exists_upwards(os.path.dirname(root), name, self.workspace)
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+
+@lru_cache(maxsize=None)
+def exists_upwards(directory, name, top):
+    """Check directory and its parents up to top for name (cached across projects)"""
+    if os.path.exists(os.path.join(directory, name)):
+        return True
+    parent = os.path.dirname(directory)
+    return directory != top and parent != directory and exists_upwards(parent, name, top)
+
+
+# A check takes a Snapshot and returns (status, message, hint) where status is
+# 'pass', 'fail' or 'info'. Only required checks decide the exit code.
+Check = namedtuple('Check', 'name func required')
+
+
+def validate_file_exists(project, filename, description):
     """Check if a file exists"""
-    exists = os.path.exists(filepath)
-    status = check_mark(exists)
-    print(f"{status} {description}")
-    return exists
+    return ('pass' if project.exists(filename) else 'fail'), description, None
 
 
-def validate_json_file(filepath, description):
+def validate_json_file(project, filename, description):
     """Check if file exists and contains valid JSON"""
-    if not os.path.exists(filepath):
-        print(f"{check_mark(False)} {description} - file not found")
-        return False
+    if not project.exists(filename):
+        return 'fail', f"{description} - file not found", None
 
     try:
-        with open(filepath, 'r') as f:
+        with open(project.path(filename), 'r', encoding='utf-8') as f:
             json.load(f)
-        print(f"{check_mark(True)} {description}")
-        return True
+        return 'pass', description, None
     except json.JSONDecodeError as e:
-        print(f"{check_mark(False)} {description} - invalid JSON: {e}")
-        return False
+        return 'fail', f"{description} - invalid JSON: {e}", None
 
 
-def validate_git_repo():
-    """Check if directory is a git repository"""
-    is_git = os.path.exists('.git')
-    status = check_mark(is_git)
-    print(f"{status} Git repository initialized")
-    return is_git
+def validate_git_repo(project):
+    """Check if the project is a git repository (or inside the monorepo's)"""
+    is_git = project.exists_in_workspace('.git')
+    return ('pass' if is_git else 'fail'), 'Git repository initialized', None
 
 
-def validate_node_modules():
-    """Check if node_modules exists"""
-    exists = os.path.exists('node_modules')
-    status = check_mark(exists)
-    message = "node_modules installed"
-    if not exists:
-        message += f" - {Colors.YELLOW}run 'npm install'{Colors.END}"
-    print(f"{status} {message}")
-    return exists
+def validate_node_modules(project):
+    """Check if node_modules exists (monorepos may hoist it to a parent)"""
+    if project.exists_in_workspace('node_modules'):
+        return 'pass', 'node_modules installed', None
+    return 'fail', 'node_modules installed', "run 'npm install'"
 
 
-def validate_typescript():
+def validate_typescript(project):
     """Check if TypeScript is configured"""
-    has_tsconfig = os.path.exists('tsconfig.json')
-    if has_tsconfig:
-        print(f"{check_mark(True)} TypeScript configured (tsconfig.json found)")
-        return True
-    print(f"{Colors.BLUE}ℹ{Colors.END} TypeScript not configured (optional)")
-    return True  # Not an error, just optional
+    if project.exists('tsconfig.json'):
+        return 'pass', 'TypeScript configured (tsconfig.json found)', None
+    return 'info', 'TypeScript not configured (optional)', None
 
 
-def validate_env_file():
+def validate_env_file(project):
     """Check for environment configuration"""
-    has_env = os.path.exists('.env')
-    has_example = os.path.exists('.env.example')
-
-    if has_env:
-        print(f"{check_mark(True)} Environment file (.env) present")
-        return True
-    elif has_example:
-        print(f"{check_mark(False)} .env file missing - {Colors.YELLOW}copy from .env.example{Colors.END}")
-        return False
+    if project.exists('.env'):
+        return 'pass', 'Environment file (.env) present', None
+    elif project.exists('.env.example'):
+        return 'fail', '.env file missing', 'copy from .env.example'
     else:
-        print(f"{Colors.BLUE}ℹ{Colors.END} No environment files (may not be required)")
-        return True
+        return 'info', 'No environment files (may not be required)', None
 
 
-def main():
-    """Run all validation checks"""
-    print(f"\n{Colors.BOLD}=== Project Validation Report ==={Colors.END}\n")
+CHECKS = [
+    # Required files
+    Check('package.json', partial(validate_json_file, filename='package.json',
+                                  description='package.json found and valid'), True),
+    Check('readme', partial(validate_file_exists, filename='README.md',
+                            description='README.md exists'), True),
+    Check('gitignore', partial(validate_file_exists, filename='.gitignore',
+                               description='.gitignore present'), True),
+    # Git setup
+    Check('git', validate_git_repo, True),
+    # Dependencies
+    Check('node_modules', validate_node_modules, True),
+    # Optional configurations
+    Check('typescript', validate_typescript, False),  # Don't count as failure
+    Check('env', validate_env_file, False),           # May or may not be required
+]
 
-    checks = []
 
-    # Required files
-    checks.append(validate_json_file('package.json', 'package.json found and valid'))
-    checks.append(validate_file_exists('README.md', 'README.md exists'))
-    checks.append(validate_file_exists('.gitignore', '.gitignore present'))
+def run_check(check, project):
+    """Run one check, turning I/O errors into a failed result"""
+    try:
+        return check.func(project)
+    except (OSError, UnicodeDecodeError) as e:
+        return 'fail', f"{check.name} - {e}", None
 
-    # Git setup
-    checks.append(validate_git_repo())
 
-    # Dependencies
-    checks.append(validate_node_modules())
+def find_packages(top, executor):
+    """Return a Snapshot of every directory below top with a package.json
 
-    # Optional configurations
-    validate_typescript()  # Don't count as failure
-    validate_env_file()    # May or may not be required
+    Each directory level is listed in parallel; the listing that finds a
+    package.json becomes that package's snapshot.
+    """
+    def scan(path):
+        try:
+            with os.scandir(path) as it:
+                return {entry.name: entry for entry in it}
+        except OSError:
+            return {}
+
+    workspace = os.path.abspath(top)
+    packages = []
+    level = [top]
+    while level:
+        next_level = []
+        for path, entries in zip(level, executor.map(scan, level)):
+            if 'package.json' in entries:
+                packages.append(Snapshot(path, entries, workspace))
+            for name, entry in entries.items():
+                if (name not in SKIP_DIRS and not name.startswith('.')
+                        and entry.is_dir(follow_symlinks=False)):
+                    next_level.append(entry.path)
+        level = next_level
+    return sorted(packages, key=lambda project: project.root)
+
+
+def validate_projects(projects, executor):
+    """Run every check against every project concurrently
+
+    Returns a report dict with one entry per project in input order.
+    """
+    futures = [
+        [(check, executor.submit(run_check, check, project)) for check in CHECKS]
+        for project in projects
+    ]
+    report = {'projects': [], 'summary': {}}
+    for project, pending in zip(projects, futures):
+        checks = []
+        for check, future in pending:
+            status, message, hint = future.result()
+            checks.append({'name': check.name, 'status': status, 'message': message,
+                           'hint': hint, 'required': check.required})
+        failed = sum(1 for c in checks if c['required'] and c['status'] == 'fail')
+        report['projects'].append({'path': project.root, 'failed': failed,
+                                   'checks': checks})
+    report['summary'] = {
+        'projects': len(projects),
+        'failed_projects': sum(1 for p in report['projects'] if p['failed']),
+        'issues': sum(p['failed'] for p in report['projects']),
+    }
+    return report
+
+
+def print_checks(checks):
+    """Print one project's check results"""
+    for c in checks:
+        if c['status'] == 'info':
+            status = f"{Colors.BLUE}ℹ{Colors.END}"
+        else:
+            status = check_mark(c['status'] == 'pass')
+        hint = f" - {Colors.YELLOW}{c['hint']}{Colors.END}" if c['hint'] else ''
+        print(f"{status} {c['message']}{hint}")
+
+
+def print_report(report, monorepo):
+    """Print the human-readable report"""
+    print(f"\n{Colors.BOLD}=== Project Validation Report ==={Colors.END}\n")
+    for project in report['projects']:
+        if monorepo:
+            print(f"{Colors.BOLD}{project['path']}{Colors.END}")
+        print_checks(project['checks'])
+        if monorepo:
+            print()
 
     # Summary
     print(f"\n{Colors.BOLD}Summary:{Colors.END}")
-    passed = sum(checks)
-    total = len(checks)
-    failed = total - passed
+    summary = report['summary']
+    if monorepo:
+        print(f"{summary['projects']} package(s), "
+              f"{summary['failed_projects']} with issues")
 
-    if failed == 0:
+    if summary['issues'] == 0:
         print(f"{Colors.GREEN}✓ All checks passed! Project is properly configured.{Colors.END}")
-        sys.exit(0)
     else:
-        print(f"{Colors.RED}✗ {failed} issue(s) found.{Colors.END}")
+        print(f"{Colors.RED}✗ {summary['issues']} issue(s) found.{Colors.END}")
         print(f"\nRun suggested commands to fix issues.")
-        sys.exit(1)
+
+
+def main():
+    """Run all validation checks"""
+    parser = argparse.ArgumentParser(description='Validate project structure and configuration.')
+    parser.add_argument('path', nargs='?', default='.', help='project directory (default: .)')
+    parser.add_argument('--monorepo', action='store_true',
+                        help='validate every package.json root below path')
+    parser.add_argument('--json', action='store_true', help='print a JSON report')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='worker threads (default: Python\'s thread pool default)')
+    args = parser.parse_args()
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        try:
+            if args.monorepo:
+                projects = find_packages(args.path, executor)
+            else:
+                projects = [Snapshot(args.path)]
+        except OSError as e:
+            print(f"{check_mark(False)} Cannot read {args.path}: {e}")
+            sys.exit(1)
+        if not projects:
+            print(f"{check_mark(False)} No packages found below {args.path} "
+                  f"(no package.json)")
+            sys.exit(1)
+        report = validate_projects(projects, executor)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.monorepo)
+    sys.exit(1 if report['summary']['issues'] else 0)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,310 @@
+"""Table-driven layout rules for validate_slides.py.
+
+The layout limits that apply to a slide depend on its feature signature: the
+layout classes it uses, whether it has an h1 and a description, and which
+content kinds (code, bullets, table) it contains. Rules are matched in order
+and the first match wins; LayoutTable evaluates them once for every possible
+signature, so each slide dispatches with a single list lookup.
+
+Extra profiles (4:3 decks, vertical Shorts, ...) are JSON or YAML files:
+
+    {
+      "constraints": {"h1_bullet_max": 5, "bullet_max_chars": 24},
+      "rules": [
+        {"classes": ["vertical"], "when": {"code": true},
+         "limits": [{"measure": "code_lines", "label": "コード行数(vertical)",
+                     "max": 8, "recommended": 6}]}
+      ]
+    }
+
+``constraints`` overrides LayoutConstraints fields; ``rules`` are matched
+before the built-in rules unless ``"inherit": false`` drops those.
+"""
+
+import hashlib
+import json
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+# Signature bits after the class bits, in this order
+FEATURES = ("h1", "description", "code", "bullets", "table")
+# SlideFeatures counters a limit can measure
+MEASURES = ("code_lines", "bullet_count", "table_rows")
+# The table has 2**bits entries
+MAX_SIGNATURE_BITS = 16
+
+
+@dataclass
+class Limit:
+    """One limit on a measured count.
+
+    With ``recommended``, values above ``max`` are errors and values above
+    ``recommended`` are info; without it, exceeding ``max`` is a warning.
+    """
+
+    measure: str
+    label: str
+    max: int
+    recommended: int | None = None
+    # LayoutConstraints fields the values come from (built-in rules only);
+    # --stats suggests new values for these
+    max_field: str | None = None
+    recommended_field: str | None = None
+
+
+@dataclass
+class LayoutRule:
+    """Limits for slides whose signature matches.
+
+    Every class in ``classes`` must be present, and each ``when`` entry
+    requires a feature (see FEATURES) to be present or absent. ``skip``
+    exempts matching slides from all layout checks.
+    """
+
+    limits: list[Limit] = field(default_factory=list)
+    classes: list[str] = field(default_factory=list)
+    when: dict[str, bool] = field(default_factory=dict)
+    skip: bool = False
+
+
+@dataclass
+class LayoutProfile:
+    """Constraint overrides and rules loaded from a profile file."""
+
+    constraints: dict[str, int] = field(default_factory=dict)
+    rules: list[LayoutRule] = field(default_factory=list)
+    inherit: bool = True
+
+
+def _constraint_limit(
+    c, measure: str, label: str, name: str, recommended: bool = True
+) -> Limit:
+    """Limit reading ``{name}_max`` (and ``{name}_recommended``) from ``c``."""
+    max_field = f"{name}_max"
+    recommended_field = f"{name}_recommended" if recommended else None
+    return Limit(
+        measure,
+        label,
+        getattr(c, max_field),
+        getattr(c, recommended_field) if recommended else None,
+        max_field,
+        recommended_field,
+    )
+
+
+def default_rules(c) -> list[LayoutRule]:
+    """Return the built-in layout rules for LayoutConstraints ``c``."""
+    return [
+        # Title and section slides are exempt
+        LayoutRule(classes=["title"], skip=True),
+        LayoutRule(classes=["section"], skip=True),
+        LayoutRule(
+            [
+                _constraint_limit(
+                    c, "code_lines", "コード行数(no-header)", "noheader_code"
+                )
+            ],
+            classes=["no-header"],
+            when={"code": True},
+        ),
+        LayoutRule(
+            [
+                _constraint_limit(
+                    c, "bullet_count", "箇条書き行数(small-text)", "smalltext_bullet"
+                )
+            ],
+            classes=["small-text"],
+            when={"bullets": True},
+        ),
+        LayoutRule(
+            [
+                _constraint_limit(
+                    c,
+                    "bullet_count",
+                    "箇条書き行数(subtitle-safe)",
+                    "subtitlesafe_bullet",
+                )
+            ],
+            classes=["subtitle-safe"],
+            when={"bullets": True},
+        ),
+        LayoutRule(
+            [
+                _constraint_limit(
+                    c, "code_lines", "コード行数(h1+説明文+コード)", "h1_desc_code"
+                )
+            ],
+            when={"h1": True, "description": True, "code": True},
+        ),
+        LayoutRule(
+            [
+                _constraint_limit(
+                    c,
+                    "bullet_count",
+                    "箇条書き行数(h1+説明文+箇条書き)",
+                    "h1_desc_bullet",
+                )
+            ],
+            when={"h1": True, "description": True, "bullets": True},
+        ),
+        LayoutRule(
+            [
+                _constraint_limit(
+                    c,
+                    "bullet_count",
+                    "箇条書き過多(h1+箇条書き+コード)",
+                    "h1_bullet_code_bullet",
+                    recommended=False,
+                ),
+                _constraint_limit(
+                    c,
+                    "code_lines",
+                    "コード過多(h1+箇条書き+コード)",
+                    "h1_bullet_code_code",
+                    recommended=False,
+                ),
+            ],
+            when={"h1": True, "bullets": True, "code": True},
+        ),
+        LayoutRule(
+            [_constraint_limit(c, "code_lines", "コード行数(h1+コード)", "h1_code")],
+            when={"h1": True, "code": True},
+        ),
+        LayoutRule(
+            [
+                _constraint_limit(
+                    c, "bullet_count", "箇条書き行数(h1+箇条書き)", "h1_bullet"
+                )
+            ],
+            when={"h1": True, "bullets": True},
+        ),
+        LayoutRule(
+            [
+                _constraint_limit(
+                    c, "table_rows", "テーブル行数(h1+テーブル)", "h1_table"
+                )
+            ],
+            when={"h1": True, "table": True},
+        ),
+    ]
+
+
+class LayoutTable:
+    """Rules compiled into a lookup table indexed by feature signature."""
+
+    def __init__(self, rules: Iterable[LayoutRule]):
+        self.rules = list(rules)
+        classes = sorted({name for rule in self.rules for name in rule.classes})
+        self._class_bits = {name: 1 << i for i, name in enumerate(classes)}
+        self._shift = len(classes)
+        bits = len(classes) + len(FEATURES)
+        if bits > MAX_SIGNATURE_BITS:
+            raise ValueError(
+                f"Too many layout classes in rules ({len(classes)}); "
+                f"at most {MAX_SIGNATURE_BITS - len(FEATURES)} are supported"
+            )
+
+        compiled = [(*self._match_bits(rule), rule) for rule in self.rules]
+        self.table: list[LayoutRule | None] = [
+            next((rule for mask, value, rule in compiled if sig & mask == value), None)
+            for sig in range(1 << bits)
+        ]
+
+    def _match_bits(self, rule: LayoutRule) -> tuple[int, int]:
+        """Return (mask, value) such that a signature matches when equal."""
+        mask = value = 0
+        for name in rule.classes:
+            mask |= self._class_bits[name]
+            value |= self._class_bits[name]
+        for feature, present in rule.when.items():
+            bit = 1 << (self._shift + FEATURES.index(feature))
+            mask |= bit
+            if present:
+                value |= bit
+        return mask, value
+
+    def signature(self, features) -> int:
+        """Encode a SlideFeatures as a table index."""
+        sig = 0
+        for name in features.classes:
+            sig |= self._class_bits.get(name, 0)
+        flags = (
+            features.has_h1
+            | features.has_description << 1
+            | (features.code_lines > 0) << 2
+            | (features.bullet_count > 0) << 3
+            | (features.table_rows > 0) << 4
+        )
+        return sig | flags << self._shift
+
+    def lookup(self, features) -> LayoutRule | None:
+        """Return the first rule matching the slide, if any."""
+        return self.table[self.signature(features)]
+
+    def fingerprint(self) -> str:
+        """Return a stable hash of the rules."""
+        payload = json.dumps(
+            [asdict(rule) for rule in self.rules], sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _check_keys(data: dict, allowed: Iterable[str], where: str) -> None:
+    unknown = set(data) - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown {where} keys: {', '.join(sorted(unknown))}")
+
+
+def _limit_from_dict(data: dict) -> Limit:
+    _check_keys(data, ("measure", "label", "max", "recommended"), "limit")
+    if data.get("measure") not in MEASURES:
+        raise ValueError(
+            f"Limit measure must be one of {', '.join(MEASURES)}: {data.get('measure')!r}"
+        )
+    try:
+        return Limit(**data)
+    except TypeError as e:
+        raise ValueError(f"Invalid limit {data}: {e}") from None
+
+
+def rule_from_dict(data: dict) -> LayoutRule:
+    """Build a LayoutRule from its JSON/YAML form, rejecting unknown keys."""
+    if not isinstance(data, dict):
+        raise ValueError(f"Layout rule must be a mapping: {data!r}")
+    _check_keys(data, ("limits", "classes", "when", "skip"), "rule")
+    when = data.get("when", {})
+    _check_keys(when, FEATURES, "when")
+    if not all(isinstance(present, bool) for present in when.values()):
+        raise ValueError(f"when values must be true or false: {when}")
+    return LayoutRule(
+        limits=[_limit_from_dict(limit) for limit in data.get("limits", [])],
+        classes=list(data.get("classes", [])),
+        when=dict(when),
+        skip=bool(data.get("skip", False)),
+    )
+
+
+def load_profile(path: Path) -> LayoutProfile:
+    """Read a layout profile from a JSON or YAML file."""
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".yaml", ".yml"):
+        # Imported here so runs without a YAML profile skip loading PyYAML
+        try:
+            import yaml
+        except ImportError:  # pragma: no cover - only needed for YAML profiles
+            raise ValueError("YAML profiles need PyYAML (pip install pyyaml)") from None
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValueError(f"{path}: {e}") from None
+    else:
+        data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: a layout profile must be a mapping")
+    _check_keys(data, ("constraints", "rules", "inherit"), "profile")
+    return LayoutProfile(
+        constraints=dict(data.get("constraints", {})),
+        rules=[rule_from_dict(rule) for rule in data.get("rules", [])],
+        inherit=bool(data.get("inherit", True)),
+    )
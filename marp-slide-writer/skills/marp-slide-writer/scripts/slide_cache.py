@@ -0,0 +1,130 @@
+"""Persistent per-slide result cache for validate_slides.py.
+
+Results are stored in a small SQLite database keyed by a hash of the slide
+text, the LayoutConstraints fingerprint and the validator version, so only
+slides that changed since the last run are re-checked. SQLite keeps the
+cache safe to share between the worker processes of a parallel run, and a
+lock makes one instance safe to share between the threads of the server.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_MAX_ENTRIES = 50_000
+
+
+def default_cache_path() -> Path:
+    """Return the cache file location (honours XDG_CACHE_HOME)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "marp-slide-writer" / "validate_slides.sqlite"
+
+
+class SlideCache:
+    """Size-bounded on-disk cache of per-slide validation results.
+
+    Values are JSON-serializable lists. Any SQLite failure is treated as a
+    cache miss so a broken cache never breaks validation.
+    """
+
+    def __init__(
+        self, path: Path | None = None, max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._touched: dict[str, float] = {}
+        self._pending: dict[str, str] = {}
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Access is serialized by self._lock
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, used REAL NOT NULL)"
+            )
+        except (OSError, sqlite3.Error):
+            self._conn = None
+
+    def get(self, key: str) -> list | None:
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key: str) -> list | None:
+        if key in self._pending:
+            self.hits += 1
+            return json.loads(self._pending[key])
+        if self._conn is None:
+            self.misses += 1
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched[key] = time.time()
+        return json.loads(row[0])
+
+    def put(self, key: str, value: list) -> None:
+        """Queue a value to be written on the next flush."""
+        encoded = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._pending[key] = encoded
+
+    def flush(self) -> None:
+        """Write queued entries, refresh usage times and evict old entries."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._conn is None or not (self._pending or self._touched):
+            return
+        now = time.time()
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries (key, value, used) "
+                    "VALUES (?, ?, ?)",
+                    [(k, v, now) for k, v in self._pending.items()],
+                )
+                self._conn.executemany(
+                    "UPDATE entries SET used = ? WHERE key = ?",
+                    [(t, k) for k, t in self._touched.items()],
+                )
+                self._evict()
+        except sqlite3.Error:
+            pass
+        self._pending.clear()
+        self._touched.clear()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries beyond max_entries."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY used ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def close(self) -> None:
+        """Flush and close the database."""
+        with self._lock:
+            self._flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,137 @@
+"""Git-diff-aware deck selection for validate_slides.py.
+
+Asks git which decks changed since a ref and maps the changed line ranges of
+each deck onto the slides ``_split_slides`` produces, so pre-commit hooks and
+CI re-check only the slides a diff touched while slide numbers stay global.
+"""
+
+import re
+import subprocess
+from pathlib import Path
+
+from validate_slides import FRONTMATTER_RE, SLIDE_SEPARATOR_RE
+
+# New-file side of a hunk header: "@@ -a,b +start,count @@"
+HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+LineRange = tuple[int, int]
+
+
+class GitError(Exception):
+    """git is missing, the ref is unknown or the cwd is not a repository."""
+
+
+def _git(args: list[str], cwd: Path | None = None) -> str:
+    try:
+        proc = subprocess.run(
+            ["git", "-c", "core.quotePath=false", *args],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            check=True,
+        )
+    except FileNotFoundError:
+        raise GitError("git is not installed") from None
+    except subprocess.CalledProcessError as e:
+        raise GitError(e.stderr.strip() or f"git {args[0]} failed") from None
+    return proc.stdout
+
+
+def parse_diff(diff: str, top: Path) -> dict[Path, list[LineRange]]:
+    """Collect the changed line ranges of each file in a ``-U0`` diff.
+
+    Ranges are 1-based and inclusive in the new file. A pure deletion marks
+    the lines on both sides of where the text was removed.
+    """
+    changed: dict[Path, list[LineRange]] = {}
+    current: list[LineRange] | None = None
+    previous = ""
+    for line in diff.splitlines():
+        # An added line starting with "++" also begins with "+++ "
+        if line.startswith("+++ ") and previous.startswith("--- "):
+            # git appends a tab to names containing spaces
+            name = line[4:].rstrip("\t")
+            current = (
+                None
+                if name == "/dev/null"
+                else changed.setdefault((top / name[2:]).resolve(), [])
+            )
+        elif current is not None and (match := HUNK_RE.match(line)):
+            start = int(match.group(1))
+            count = 1 if match.group(2) is None else int(match.group(2))
+            if count:
+                current.append((start, start + count - 1))
+            else:
+                current.append((start, start + 1))
+        previous = line
+    return changed
+
+
+def changed_lines(
+    ref: str, pattern: str = "slides.md", cwd: Path | None = None
+) -> dict[Path, list[LineRange] | None]:
+    """Return the changed line ranges of decks modified since ``ref``.
+
+    The working tree is compared with ``ref``, so staged and unstaged edits
+    both count. Keys are resolved paths; decks git does not track yet map to
+    None and are checked in full.
+    """
+    top = Path(_git(["rev-parse", "--show-toplevel"], cwd).strip())
+    pathspec = f":(glob)**/{pattern}"
+    diff = _git(
+        [
+            "diff",
+            "--unified=0",
+            "--no-color",
+            "--no-ext-diff",
+            "--src-prefix=a/",
+            "--dst-prefix=b/",
+            "--diff-filter=AMR",
+            ref,
+            "--",
+            pathspec,
+        ],
+        top,
+    )
+    changed: dict[Path, list[LineRange] | None] = dict(parse_diff(diff, top))
+    untracked = _git(
+        ["ls-files", "--others", "--exclude-standard", "--", pathspec], top
+    )
+    for name in untracked.splitlines():
+        changed[(top / name).resolve()] = None
+    return changed
+
+
+def slide_line_spans(content: str) -> list[LineRange]:
+    """Return the 1-based line range of each slide from ``_split_slides``.
+
+    Each range also covers the ``---`` lines around the slide, so editing or
+    deleting a separator marks the slides on both sides; the first slide
+    also covers the frontmatter.
+    """
+    match = FRONTMATTER_RE.match(content)
+    pos = match.end() if match else 0
+    line = content.count("\n", 0, pos) + 1
+    spans: list[LineRange] = []
+    separators = SLIDE_SEPARATOR_RE.finditer(content, pos)
+    while True:
+        separator = next(separators, None)
+        end = separator.start() if separator else len(content)
+        last = line + content.count("\n", pos, end)
+        if content[pos:end].strip():
+            spans.append((line - 1 if spans else 1, last + 1))
+        if separator is None:
+            return spans
+        # "\n---\n" ends the slide's last line and spans the "---" line
+        line = last + 2
+        pos = separator.end()
+
+
+def slides_touching(content: str, ranges: list[LineRange]) -> set[int]:
+    """Return the 1-based numbers of the slides intersecting any range."""
+    return {
+        num
+        for num, (first, last) in enumerate(slide_line_spans(content), 1)
+        if any(start <= last and end >= first for start, end in ranges)
+    }
@@ -0,0 +1,154 @@
+"""Per-check and per-slide timing for validate_slides.py.
+
+A SlideProfiler instruments one SlideValidator by shadowing its methods on
+the instance, so validators created without a profiler run the plain class
+methods with no extra overhead. Each stage (splitting, feature extraction,
+layout selection, every ``_check_limit`` branch by label, text lengths,
+nesting and user checks) gets call counts plus total and self time, and every
+slide gets its wall time. An optional cProfile run can be dumped for pstats.
+"""
+
+import cProfile
+import functools
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class StageStats:
+    """Timing of one instrumented stage."""
+
+    calls: int = 0
+    total: float = 0.0
+    # Time not spent in other instrumented stages
+    own: float = 0.0
+
+
+@dataclass
+class SlideTiming:
+    """Wall time of one validated slide."""
+
+    deck: str
+    slide_num: int
+    seconds: float
+
+
+@dataclass
+class SlideProfiler:
+    """Collect stage and slide timings from instrumented validators."""
+
+    stages: dict[str, StageStats] = field(default_factory=dict)
+    slides: list[SlideTiming] = field(default_factory=list)
+    deck: str = ""
+    cprofile: cProfile.Profile | None = None
+    _stack: list[float] = field(default_factory=list)
+
+    def instrument(self, validator) -> None:
+        """Wrap the validator's stages on the instance."""
+        fixed = {
+            "split": validator._split_slides,
+            "extract_features": validator._extract_features,
+            "check_layout": validator._check_layout,
+            "check_text_lengths": validator._check_text_lengths,
+            "check_nesting": validator._check_nesting,
+        }
+        for stage, method in fixed.items():
+            setattr(
+                validator, method.__name__, self._wrap(method, lambda *_, s=stage: s)
+            )
+
+        # One stage per limit label, i.e. per branch of the layout chain
+        validator._check_limit = self._wrap(
+            validator._check_limit,
+            lambda results, num, value, max_val, rec, label: f"limit:{label}",
+        )
+        validator.checks = [
+            self._wrap(check, lambda *_, n=check.__qualname__: f"check:{n}")
+            for check in validator.checks
+        ]
+        validator._validate_slide = self._wrap_slide(validator._validate_slide)
+
+        validate_file = validator.validate_file
+
+        @functools.wraps(validate_file)
+        def validate_file_for_deck(filepath: Path, lines=None):
+            self.deck = str(filepath)
+            return validate_file(filepath, lines)
+
+        validator.validate_file = validate_file_for_deck
+
+    def _wrap(self, func: Callable, stage_of: Callable[..., str]) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stage = stage_of(*args, **kwargs)
+            self._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = self._stack.pop()
+                stats = self.stages.setdefault(stage, StageStats())
+                stats.calls += 1
+                stats.total += elapsed
+                stats.own += elapsed - nested
+                if self._stack:
+                    self._stack[-1] += elapsed
+
+        return wrapper
+
+    def _wrap_slide(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(num: int, slide: str):
+            start = time.perf_counter()
+            try:
+                return func(num, slide)
+            finally:
+                self.slides.append(
+                    SlideTiming(self.deck, num, time.perf_counter() - start)
+                )
+
+        return wrapper
+
+    def start_cprofile(self) -> None:
+        """Also record a cProfile of everything until stop_cprofile()."""
+        self.cprofile = cProfile.Profile()
+        self.cprofile.enable()
+
+    def stop_cprofile(self, dump_path: Path | None = None) -> None:
+        """Stop cProfile and optionally write the stats for pstats/snakeviz."""
+        if self.cprofile is None:
+            return
+        self.cprofile.disable()
+        if dump_path is not None:
+            self.cprofile.dump_stats(str(dump_path))
+
+    def slowest_stages(self, top: int = 10) -> list[tuple[str, StageStats]]:
+        """Stages ordered by self time."""
+        return sorted(self.stages.items(), key=lambda item: -item[1].own)[:top]
+
+    def slowest_slides(self, top: int = 10) -> list[SlideTiming]:
+        return sorted(self.slides, key=lambda s: -s.seconds)[:top]
+
+    def print_report(self, top: int = 10) -> None:
+        """Print the slowest stages and slides."""
+        total = sum(s.seconds for s in self.slides)
+        print("\n⏱  Profile")
+        print("=" * 50)
+        print(f"{len(self.slides)} slides validated in {total * 1000:.1f}ms")
+
+        print("\nSlowest checks (self time):")
+        for stage, stats in self.slowest_stages(top):
+            per_call = stats.own / stats.calls * 1e6 if stats.calls else 0.0
+            # Stage names come last: limit labels contain wide characters
+            print(
+                f"  {stats.own * 1000:8.2f}ms self {stats.total * 1000:8.2f}ms total "
+                f"{stats.calls:7d} calls {per_call:7.1f}µs/call  {stage}"
+            )
+
+        print("\nSlowest slides:")
+        for timing in self.slowest_slides(top):
+            deck = f"{timing.deck} " if timing.deck else ""
+            print(f"  {deck}Slide {timing.slide_num}: {timing.seconds * 1000:.2f}ms")
@@ -0,0 +1,282 @@
+"""Resident validation server for editor and hook integrations.
+
+Keeps one SlideValidator (with its compiled patterns and result cache) warm
+and answers JSON-lines requests on stdin/stdout or a Unix socket, so an
+editor or a git hook pays the interpreter start-up and cache open once.
+Each request is one JSON object per line:
+
+    {"id": 1, "method": "validate", "params": {"path": "slides/slides.md"}}
+
+and gets one response line with the same id:
+
+    {"id": 1, "ok": true, "result": {"results": [...], "summary": {...}}}
+
+Requests are handled on a thread pool and may complete out of order. When the
+transcription-tools plugin is installed next to this one, ``fix_srt``
+applies its text rules to SRT files with the same warm process.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import TextIO
+
+from layout_rules import LayoutRule
+from slide_cache import SlideCache
+from validate_slides import (
+    LayoutConstraints,
+    Level,
+    SlideValidator,
+    ValidationResult,
+    count_levels,
+)
+
+SRT_SCRIPTS = (
+    Path(__file__).resolve().parents[4]
+    / "transcription-tools"
+    / "skills"
+    / "srt-transcription-fixer"
+    / "scripts"
+)
+DEFAULT_SRT_RULES = ("trailing-punctuation",)
+# Modifications echoed back by fix_srt
+MAX_SRT_LOG = 50
+
+
+class RequestError(Exception):
+    """A request that cannot be served; reported back to the client."""
+
+
+def _result_dict(r: ValidationResult) -> dict:
+    return {**asdict(r), "level": r.level.value}
+
+
+def _load_srt_tools():
+    """Import the srt-transcription-fixer modules used by fix_srt."""
+    if SRT_SCRIPTS.is_dir() and str(SRT_SCRIPTS) not in sys.path:
+        # Appended so these scripts never shadow this directory's modules
+        sys.path.append(str(SRT_SCRIPTS))
+    try:
+        import remove_trailing_punctuation
+        import text_rules
+    except ImportError:
+        raise RequestError("fix_srt needs the transcription-tools plugin") from None
+    return remove_trailing_punctuation, text_rules
+
+
+class SlideServer:
+    """Dispatches requests to a shared validator.
+
+    The validator keeps no per-run state and the cache serializes its own
+    access, so requests run concurrently on one instance.
+    """
+
+    def __init__(self, validator: SlideValidator | None = None, jobs: int = 4):
+        self.validator = validator or SlideValidator()
+        self.executor = ThreadPoolExecutor(max_workers=jobs)
+        self.started = time.time()
+        self.requests = 0
+        self.stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._srt_rules: dict[tuple, list] = {}
+        self.methods: dict[str, Callable[[dict], object]] = {
+            "ping": lambda params: "pong",
+            "validate": self.validate,
+            "validate_slide": self.validate_slide,
+            "fix_srt": self.fix_srt,
+            "stats": self.stats,
+            "shutdown": self.shutdown,
+        }
+
+    def handle(self, line: str) -> str | None:
+        """Answer one request line; None for blank lines."""
+        if not line.strip():
+            return None
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise RequestError(f"Invalid JSON: {e}") from None
+            if not isinstance(request, dict):
+                raise RequestError("Request must be a JSON object")
+            request_id = request.get("id")
+            method = self.methods.get(request.get("method"))
+            if method is None:
+                raise RequestError(f"Unknown method: {request.get('method')!r}")
+            params = request.get("params") or {}
+            if not isinstance(params, dict):
+                raise RequestError("params must be a JSON object")
+            with self._lock:
+                self.requests += 1
+            response = {"id": request_id, "ok": True, "result": method(params)}
+        except RequestError as e:
+            response = {"id": request_id, "ok": False, "error": str(e)}
+        except Exception as e:
+            # Keep serving; the client sees what went wrong
+            response = {
+                "id": request_id,
+                "ok": False,
+                "error": f"{type(e).__name__}: {e}",
+            }
+        return json.dumps(response, ensure_ascii=False)
+
+    def _report(self, results: list[ValidationResult]) -> dict:
+        counts = count_levels(results)
+        return {
+            "results": [_result_dict(r) for r in results],
+            "summary": {level.value: counts[level] for level in Level},
+        }
+
+    def validate(self, params: dict) -> dict:
+        """Validate a deck given as ``path`` or inline ``content``."""
+        if "content" in params:
+            return self._report(self.validator.validate_content(params["content"]))
+        if "path" not in params:
+            raise RequestError("validate needs 'path' or 'content'")
+        path = Path(params["path"])
+        if not path.is_file():
+            raise RequestError(f"File not found: {path}")
+        return self._report(self.validator.validate_file(path))
+
+    def validate_slide(self, params: dict) -> dict:
+        """Validate one slide's text as slide ``num`` (default 1)."""
+        if "slide" not in params:
+            raise RequestError("validate_slide needs 'slide'")
+        num = int(params.get("num", 1))
+        return self._report(self.validator.validate_slide(num, params["slide"]))
+
+    def fix_srt(self, params: dict) -> dict:
+        """Apply transcription-tools text rules to an SRT file in place."""
+        if "path" not in params:
+            raise RequestError("fix_srt needs 'path'")
+        fixer, text_rules = _load_srt_tools()
+
+        names = tuple(params.get("rules") or DEFAULT_SRT_RULES)
+        glossary = params.get("glossary")
+        # Rules hold only compiled patterns and are reused until the glossary
+        # changes; hit counts live on each request's Pipeline
+        mtime = os.stat(glossary).st_mtime_ns if glossary else None
+        key = (names, glossary, mtime)
+        with self._lock:
+            rules = self._srt_rules.get(key)
+        if rules is None:
+            rules = text_rules.Pipeline.from_names(names, glossary=glossary).rules
+            with self._lock:
+                self._srt_rules[key] = rules
+        pipeline = text_rules.Pipeline(rules)
+        modified, changes = fixer.process_srt(
+            params["path"], params.get("output"), MAX_SRT_LOG, pipeline
+        )
+        return {
+            "modified": modified,
+            "changes": [change.strip() for change in changes],
+            "rules": [asdict(stat) for stat in pipeline.stats],
+        }
+
+    def stats(self, params: dict) -> dict:
+        cache = self.validator.cache
+        return {
+            "uptime": round(time.time() - self.started, 3),
+            "requests": self.requests,
+            "cache": (
+                None if cache is None else {"hits": cache.hits, "misses": cache.misses}
+            ),
+        }
+
+    def shutdown(self, params: dict) -> str:
+        self.stopping.set()
+        return "bye"
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        if self.validator.cache is not None:
+            self.validator.cache.close()
+
+
+def serve_stdio(
+    server: SlideServer, stdin: TextIO = sys.stdin, stdout: TextIO = sys.stdout
+) -> int:
+    """Serve requests from stdin until EOF or a shutdown request."""
+    write_lock = threading.Lock()
+
+    def respond(line: str) -> None:
+        response = server.handle(line)
+        if response is not None:
+            with write_lock:
+                stdout.write(response + "\n")
+                stdout.flush()
+
+    def read() -> None:
+        try:
+            for line in stdin:
+                if server.stopping.is_set():
+                    break
+                server.executor.submit(respond, line)
+        except RuntimeError:
+            # Submitted after a shutdown request closed the pool
+            pass
+        server.stopping.set()
+
+    # Reading on a daemon thread lets a shutdown request end the server
+    # without waiting for the client to close stdin
+    threading.Thread(target=read, daemon=True).start()
+    server.stopping.wait()
+    server.close()
+    return 0
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """One client connection; its requests are answered in order."""
+
+    def handle(self) -> None:
+        app: SlideServer = self.server.app
+        for raw in self.rfile:
+            future = app.executor.submit(app.handle, raw.decode("utf-8"))
+            response = future.result()
+            if response is not None:
+                self.wfile.write(response.encode("utf-8") + b"\n")
+                self.wfile.flush()
+            if app.stopping.is_set():
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+def serve_socket(server: SlideServer, path: Path) -> int:
+    """Serve requests on a Unix socket until a shutdown request."""
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: Unix sockets are not supported on this platform")
+        return 1
+    path.unlink(missing_ok=True)
+    with socketserver.ThreadingUnixStreamServer(str(path), _Handler) as unix_server:
+        unix_server.daemon_threads = True
+        unix_server.app = server
+        print(f'🚀 Serving on {path} (send {{"method": "shutdown"}} to stop)')
+        try:
+            unix_server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    path.unlink(missing_ok=True)
+    server.close()
+    return 0
+
+
+def serve(
+    socket_path: Path | None = None,
+    cache: SlideCache | None = None,
+    constraints: LayoutConstraints | None = None,
+    rules: list[LayoutRule] | None = None,
+) -> int:
+    """Start a server with a warm validator on stdio or a Unix socket."""
+    server = SlideServer(SlideValidator(constraints, cache, rules=rules))
+    if socket_path is None:
+        return serve_stdio(server)
+    return serve_socket(server, socket_path)
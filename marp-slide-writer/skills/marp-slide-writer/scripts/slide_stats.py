@@ -0,0 +1,305 @@
+"""Corpus statistics for calibrating LayoutConstraints (``--stats``).
+
+Every slide of every deck goes through the validator's feature extraction
+and is matched to its layout rule, without running the checks. Bullet, code
+and table counts are collected per layout, and line widths and nesting
+levels per line kind, into compact integer arrays. Worker processes return
+those arrays per deck, and the summary uses NumPy percentiles. Suggested
+thresholds put the recommended value at the 90th percentile and the maximum
+at the 99th.
+"""
+
+import json
+import math
+import os
+from array import array
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - only needed for --stats
+    np = None
+
+from layout_rules import MEASURES, LayoutRule, Limit, default_rules
+from validate_slides import LayoutConstraints, SlideValidator
+
+PERCENTILES = (50, 90, 95, 99)
+RECOMMENDED_PERCENTILE = 90
+MAX_PERCENTILE = 99
+# Fewer samples than this keep the current threshold
+MIN_SAMPLES = 20
+
+# Line-level metrics and the (max, recommended) fields they calibrate
+WIDTH_FIELDS = {
+    "h1_width": ("h1_max_chars", "h1_recommended_chars"),
+    "bullet_width": ("bullet_max_chars", "bullet_recommended_chars"),
+    "code_width": ("code_max_chars", "code_recommended_chars"),
+}
+NEST_FIELD = "max_nest_level"
+
+Samples = dict[tuple[str, str], array]
+
+
+def layout_name(rule: LayoutRule | None) -> str:
+    """Name a layout by the classes and features its rule requires."""
+    if rule is None:
+        return "other"
+    parts = [*rule.classes]
+    parts += [name if present else f"no-{name}" for name, present in rule.when.items()]
+    return "+".join(parts) or "any"
+
+
+def chunk_samples(
+    paths: list[Path],
+    constraints: LayoutConstraints | None = None,
+    rules: list[LayoutRule] | None = None,
+) -> tuple[Counter, Samples, list[Path]]:
+    """Collect (slides per layout, samples, unreadable paths) for some decks.
+
+    One validator serves the whole chunk, since compiling the layout table
+    costs more than extracting a deck's features. Samples are keyed by
+    (layout, metric); lines are classified the way the text length and
+    nesting checks see them.
+    """
+    validator = SlideValidator(constraints, rules=rules)
+    slides: Counter = Counter()
+    samples: Samples = defaultdict(lambda: array("I"))
+    missing = []
+
+    for path in paths:
+        try:
+            content = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            missing.append(path)
+            continue
+        for slide in validator._split_slides(content):
+            features = validator._extract_features(slide)
+            rule = validator.layout.lookup(features)
+            name = layout_name(rule)
+            slides[name] += 1
+            if rule is not None and rule.skip:
+                continue
+            for measure in MEASURES:
+                value = getattr(features, measure)
+                if value:
+                    samples[(name, measure)].append(value)
+            for line in features.lines:
+                if line.is_h1:
+                    samples[(name, "h1_width")].append(line.width)
+                elif line.bullet is not None:
+                    samples[(name, "bullet_width")].append(line.width)
+                elif line.in_code:
+                    if line.text.strip():
+                        samples[(name, "code_width")].append(line.width)
+                if not line.in_code and line.indent >= 0:
+                    samples[(name, "nest_level")].append(line.indent // 2)
+    return slides, dict(samples), missing
+
+
+def summarize(values: "np.ndarray") -> dict[str, float]:
+    """Count, percentiles and maximum of a sample array."""
+    if not len(values):
+        return {"n": 0}
+    points = np.percentile(values, PERCENTILES)
+    result = {"n": int(len(values))}
+    result.update({f"p{p}": float(v) for p, v in zip(PERCENTILES, points)})
+    result["max"] = int(values.max())
+    return result
+
+
+@dataclass
+class CorpusStats:
+    """Samples merged over a corpus of decks."""
+
+    decks: int = 0
+    slides: Counter = field(default_factory=Counter)
+    samples: dict[tuple[str, str], "np.ndarray"] = field(default_factory=dict)
+    missing: list[Path] = field(default_factory=list)
+
+    def values(self, metric: str, layout: str | None = None) -> "np.ndarray":
+        """Samples of one metric, for one layout or all of them."""
+        if layout is not None:
+            return self.samples.get((layout, metric), np.empty(0, dtype=np.uint32))
+        parts = [v for (_, m), v in self.samples.items() if m == metric]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.uint32)
+
+    def suggest(
+        self, constraints: LayoutConstraints, rules: list[LayoutRule]
+    ) -> dict[str, int]:
+        """Suggest a value for every constraint with enough samples.
+
+        Count limits are calibrated per layout of ``rules`` (the rules the
+        samples were collected with); limits that do not read a constraint,
+        such as those from a layout profile, have nothing to suggest.
+        """
+        suggested: dict[str, int] = {}
+
+        def fit(values, max_field: str, recommended_field: str | None) -> None:
+            if len(values) < MIN_SAMPLES:
+                return
+            if recommended_field is None:
+                # A limit without a recommended value only warns
+                suggested[max_field] = math.ceil(
+                    np.percentile(values, RECOMMENDED_PERCENTILE)
+                )
+                return
+            recommended, maximum = np.percentile(
+                values, (RECOMMENDED_PERCENTILE, MAX_PERCENTILE)
+            )
+            suggested[recommended_field] = math.ceil(recommended)
+            suggested[max_field] = max(math.ceil(maximum), math.ceil(recommended))
+
+        for rule in rules:
+            for limit in rule.limits:
+                if limit.max_field is None:
+                    continue
+                values = self.values(limit.measure, layout_name(rule))
+                fit(values, limit.max_field, limit.recommended_field)
+        for metric, (max_field, recommended_field) in WIDTH_FIELDS.items():
+            fit(self.values(metric), max_field, recommended_field)
+        levels = self.values("nest_level")
+        if len(levels) >= MIN_SAMPLES:
+            suggested[NEST_FIELD] = math.ceil(np.percentile(levels, MAX_PERCENTILE))
+        return suggested
+
+
+def collect(
+    paths: list[Path],
+    jobs: int | None = None,
+    constraints: LayoutConstraints | None = None,
+    rules: list[LayoutRule] | None = None,
+) -> CorpusStats:
+    """Stream decks through a process pool and merge their samples."""
+    worker = partial(chunk_samples, constraints=constraints, rules=rules)
+    stats = CorpusStats(decks=len(paths))
+    merged: dict[tuple[str, str], array] = defaultdict(lambda: array("I"))
+
+    def merge(result: tuple[Counter, Samples, list[Path]]) -> None:
+        slides, samples, missing = result
+        stats.slides.update(slides)
+        stats.missing.extend(missing)
+        for key, values in samples.items():
+            merged[key].extend(values)
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(paths) <= 1:
+        merge(worker(paths))
+    else:
+        # Workers take whole chunks so each builds one validator per chunk
+        size = max(1, len(paths) // (jobs * 4))
+        chunks = [paths[i : i + size] for i in range(0, len(paths), size)]
+        with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as executor:
+            for result in executor.map(worker, chunks):
+                merge(result)
+    stats.decks -= len(stats.missing)
+    stats.samples = {key: np.asarray(values) for key, values in merged.items()}
+    return stats
+
+
+def _format_row(label: str, summary: dict[str, float], current: str) -> str:
+    if not summary["n"]:
+        return f"  {label:<34} {0:>7}"
+    points = " ".join(f"{summary[f'p{p}']:>6.1f}" for p in PERCENTILES)
+    return f"  {label:<34} {summary['n']:>7} {points} {summary['max']:>6} {current:>10}"
+
+
+def _current(constraints: LayoutConstraints, max_field: str, rec_field) -> str:
+    maximum = getattr(constraints, max_field)
+    if rec_field is None:
+        return str(maximum)
+    return f"{getattr(constraints, rec_field)}/{maximum}"
+
+
+def _limit_current(limit: Limit) -> str:
+    if limit.recommended is None:
+        return str(limit.max)
+    return f"{limit.recommended}/{limit.max}"
+
+
+def print_stats(
+    stats: CorpusStats, constraints: LayoutConstraints, rules: list[LayoutRule]
+) -> None:
+    """Print percentiles per layout and line kind, then suggested changes."""
+    print(
+        f"\n📊 Corpus statistics: {stats.decks} decks, {sum(stats.slides.values())} slides"
+    )
+    print("=" * 50)
+    header = " ".join(f"{f'p{p}':>6}" for p in PERCENTILES)
+    columns = f"  {'':<34} {'n':>7} {header} {'max':>6} {'rec/max':>10}"
+
+    print("\nSlides per layout:")
+    for name, count in stats.slides.most_common():
+        print(f"  {name:<34} {count:>7}")
+
+    print("\nCounts per layout (lines):")
+    print(columns)
+    for rule in rules:
+        name = layout_name(rule)
+        for limit in rule.limits:
+            current = _limit_current(limit)
+            values = stats.values(limit.measure, name)
+            print(_format_row(f"{name} {limit.measure}", summarize(values), current))
+
+    print("\nLine widths (display chars) and nesting:")
+    print(columns)
+    for metric, (max_field, rec_field) in WIDTH_FIELDS.items():
+        current = _current(constraints, max_field, rec_field)
+        print(_format_row(metric, summarize(stats.values(metric)), current))
+    levels = stats.values("nest_level")
+    print(
+        _format_row(
+            "nest_level", summarize(levels), str(getattr(constraints, NEST_FIELD))
+        )
+    )
+
+    suggested = stats.suggest(constraints, rules)
+    changes = {
+        name: value
+        for name, value in suggested.items()
+        if value != getattr(constraints, name)
+    }
+    print(
+        f"\n💡 SUGGESTED THRESHOLDS (recommended = p{RECOMMENDED_PERCENTILE}, "
+        f"max = p{MAX_PERCENTILE}, at least {MIN_SAMPLES} samples):"
+    )
+    if not changes:
+        print("  Current constraints already match the corpus")
+    for name, value in changes.items():
+        print(f"  {name}: {getattr(constraints, name)} → {value}")
+    print("\n" + "=" * 50)
+
+
+def run_stats(
+    paths: list[Path],
+    jobs: int | None = None,
+    constraints: LayoutConstraints | None = None,
+    rules: list[LayoutRule] | None = None,
+    profile_out: Path | None = None,
+) -> int:
+    """Entry point for ``--stats``."""
+    if np is None:
+        print("Error: --stats needs NumPy (pip install numpy)")
+        return 1
+    constraints = constraints or LayoutConstraints()
+    if rules is None:
+        rules = default_rules(constraints)
+    stats = collect(paths, jobs, constraints, rules)
+    for path in stats.missing:
+        print(f"Error: Cannot read {path}")
+    if not stats.decks:
+        return 1
+    print_stats(stats, constraints, rules)
+
+    if profile_out is not None:
+        # Loadable with --layout-profile
+        profile = {"constraints": stats.suggest(constraints, rules)}
+        profile_out.write_text(
+            json.dumps(profile, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+        )
+        print(f"Wrote suggested constraints to {profile_out}")
+    return 0
@@ -0,0 +1,176 @@
+"""Watch mode for validate_slides.py.
+
+Polls decks for changes, re-splits only the changed file and re-validates
+just the slides whose text differs from the previous parse. Each save prints
+the results that appeared or cleared instead of the whole report.
+"""
+
+import difflib
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from layout_rules import LayoutRule
+from validate_slides import (
+    LayoutConstraints,
+    Level,
+    SlideValidator,
+    ValidationResult,
+    count_levels,
+    discover_decks,
+    print_report,
+)
+
+
+@dataclass
+class DeckState:
+    """Last parse of a watched deck."""
+
+    stamp: tuple[int, int] | None = None
+    slides: list[str] = field(default_factory=list)
+    results: list[list[ValidationResult]] = field(default_factory=list)
+
+    def all_results(self) -> list[ValidationResult]:
+        """Flatten per-slide results in slide order."""
+        return [r for per_slide in self.results for r in per_slide]
+
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    """Return (mtime_ns, size) or None if the file is gone."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _renumber(results: list[ValidationResult], num: int) -> list[ValidationResult]:
+    """Copy results onto a new slide number."""
+    if all(r.slide_num == num for r in results):
+        return results
+    return [ValidationResult(num, r.level, r.message, r.detail) for r in results]
+
+
+def _key(r: ValidationResult) -> tuple[Level, str, str]:
+    return r.level, r.message, r.detail
+
+
+def update_deck(
+    validator: SlideValidator, state: DeckState, content: str
+) -> tuple[int, list[ValidationResult], list[ValidationResult]]:
+    """Re-validate changed slides in place.
+
+    Returns:
+        (re-checked slide count, added results, cleared results)
+    """
+    slides = validator._split_slides(content)
+    matcher = difflib.SequenceMatcher(None, state.slides, slides, autojunk=False)
+    results: list[list[ValidationResult]] = []
+    added: list[ValidationResult] = []
+    cleared: list[ValidationResult] = []
+    rechecked = 0
+
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            for offset, old in enumerate(state.results[i1:i2]):
+                results.append(_renumber(old, j1 + offset + 1))
+            continue
+
+        fresh = [validator.validate_slide(j + 1, slides[j]) for j in range(j1, j2)]
+        rechecked += j2 - j1
+        results.extend(fresh)
+
+        old_flat = [r for per_slide in state.results[i1:i2] for r in per_slide]
+        new_flat = [r for per_slide in fresh for r in per_slide]
+        remaining = Counter(_key(r) for r in old_flat)
+        for r in new_flat:
+            if remaining[_key(r)]:
+                remaining[_key(r)] -= 1
+            else:
+                added.append(r)
+        remaining = Counter(_key(r) for r in new_flat)
+        for r in old_flat:
+            if remaining[_key(r)]:
+                remaining[_key(r)] -= 1
+            else:
+                cleared.append(r)
+
+    state.slides = slides
+    state.results = results
+    return rechecked, added, cleared
+
+
+def _print_delta(
+    label: str,
+    state: DeckState,
+    rechecked: int,
+    added: list[ValidationResult],
+    cleared: list[ValidationResult],
+    elapsed: float,
+) -> None:
+    """Print what changed since the previous parse."""
+    stamp = time.strftime("%H:%M:%S")
+    print(
+        f"\n[{stamp}] {label}: {rechecked} slide(s) re-checked "
+        f"in {elapsed * 1000:.1f}ms"
+    )
+    for r in added:
+        print(f"  + Slide {r.slide_num} {r.level.value}: {r.message}")
+        if r.detail:
+            print(f"    → {r.detail}")
+    for r in cleared:
+        print(f"  - Slide {r.slide_num} {r.level.value}: {r.message} (cleared)")
+    if not added and not cleared:
+        print("  (no change in results)")
+    counts = count_levels(state.all_results())
+    print(
+        f"  Summary: {counts[Level.ERROR]} errors, "
+        f"{counts[Level.WARNING]} warnings, {counts[Level.INFO]} info"
+    )
+
+
+def watch(
+    targets: list[str],
+    pattern: str = "slides.md",
+    interval: float = 0.2,
+    validator: SlideValidator | None = None,
+    constraints: LayoutConstraints | None = None,
+    rules: list[LayoutRule] | None = None,
+) -> int:
+    """Poll decks and print result deltas until interrupted.
+
+    Without ``validator`` one is built from ``constraints`` and ``rules``.
+    """
+    validator = validator or SlideValidator(constraints, rules=rules)
+    states: dict[Path, DeckState] = {}
+
+    print(f"👀 Watching {', '.join(targets)} (Ctrl+C to stop)")
+    try:
+        while True:
+            for path in discover_decks(targets, pattern):
+                state = states.setdefault(path, DeckState())
+                stamp = _stamp(path)
+                if stamp is None or stamp == state.stamp:
+                    continue
+                try:
+                    content = path.read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError) as e:
+                    print(f"Error: Cannot read {path}: {e}")
+                    continue
+
+                started = time.perf_counter()
+                first_run = state.stamp is None
+                state.stamp = stamp
+                rechecked, added, cleared = update_deck(validator, state, content)
+                elapsed = time.perf_counter() - started
+
+                if first_run:
+                    print_report(path, state.all_results(), label=str(path))
+                else:
+                    _print_delta(str(path), state, rechecked, added, cleared, elapsed)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    return 0
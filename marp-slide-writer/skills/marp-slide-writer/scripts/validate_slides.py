@@ -7,14 +7,168 @@ slides display correctly during YouTube recording.
 Usage:
     python validate_slides.py <slides.md>
     python validate_slides.py episodes/20260101_example/slides/slides.md
+    python validate_slides.py episodes/ --jobs 8
+    python validate_slides.py "episodes/*/slides/slides.md"
+    python validate_slides.py --watch slides/slides.md
+    python validate_slides.py --profile slides/slides.md
+    python validate_slides.py --changed-since origin/main episodes/
+    python validate_slides.py --layout-profile shorts.yaml slides/slides.md
+    python validate_slides.py --serve --socket /tmp/marp-validate.sock
+    python validate_slides.py --stats episodes/
+    python validate_slides.py --format ndjson --max-errors 10 huge.md
 """
 
+import argparse
+import glob
+import hashlib
+import io
+import itertools
+import json
+import os
 import re
 import sys
-from dataclasses import dataclass
+import unicodedata
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import asdict, dataclass, field
 from enum import Enum
+from functools import lru_cache, partial
 from pathlib import Path
 
+from layout_rules import LayoutRule, LayoutTable, default_rules, load_profile
+from slide_cache import DEFAULT_MAX_ENTRIES, SlideCache, default_cache_path
+from slide_profile import SlideProfiler
+
+# Bump when check logic changes so cached results are invalidated
+VALIDATOR_VERSION = "1.3.0"
+
+# Compiled patterns shared by the built-in checks and user-defined checks
+PATTERNS: dict[str, re.Pattern[str]] = {}
+
+
+def register_pattern(name: str, pattern: str, flags: int = 0) -> re.Pattern[str]:
+    """Compile a pattern once and register it under ``name``.
+
+    Registering the same name again returns the existing pattern; a
+    different pattern under an existing name raises ValueError.
+    """
+    compiled = re.compile(pattern, flags)
+    existing = PATTERNS.setdefault(name, compiled)
+    if existing.pattern != compiled.pattern or existing.flags != compiled.flags:
+        raise ValueError(f"Pattern {name!r} is already registered")
+    return existing
+
+
+FRONTMATTER_RE = register_pattern("frontmatter", r"^---\n.*?\n---\n", re.DOTALL)
+SLIDE_SEPARATOR_RE = register_pattern("slide_separator", r"\n---\n")
+CLASS_RE = register_pattern("class", r"<!-- _class: (.+?) -->")
+TABLE_SEPARATOR_RE = register_pattern("table_separator", r"^\|[-: |]+\|$")
+# group 1: indent before the marker, group 2: whitespace after it
+LIST_MARKER_RE = register_pattern("list_marker", r"^(\s*)[-*](\s*)")
+
+
+# Display width in half units: narrow chars are 2 (1.0), wide chars 3 (1.5)
+_ZERO_WIDTH, _NARROW, _WIDE, _UNKNOWN = 0, 2, 3, 255
+# Emoji skin tone modifiers merge into the preceding emoji
+_EMOJI_MODIFIERS = range(0x1F3FB, 0x1F400)
+# Large BMP blocks with a uniform width, filled up front
+_UNIFORM_RANGES = (
+    (0x0000, 0x0080, _NARROW),  # ASCII
+    (0x3400, 0x4DC0, _WIDE),  # CJK Extension A
+    (0x4E00, 0xA000, _WIDE),  # CJK Unified Ideographs
+    (0xAC00, 0xD7A4, _WIDE),  # Hangul Syllables
+    (0xE000, 0xF900, _WIDE),  # Private Use (ambiguous)
+)
+
+
+def _char_units(char: str) -> int:
+    """Classify one character by its East Asian width."""
+    if unicodedata.combining(char) or unicodedata.category(char) in ("Mn", "Me", "Cf"):
+        return _ZERO_WIDTH
+    if ord(char) in _EMOJI_MODIFIERS:
+        return _ZERO_WIDTH
+    # Ambiguous chars (→, ①, ...) render full width in Japanese fonts
+    if unicodedata.east_asian_width(char) in ("W", "F", "A"):
+        return _WIDE
+    return _NARROW
+
+
+def _build_bmp_table() -> bytearray:
+    """Width units for every BMP code point; other entries fill in lazily."""
+    table = bytearray([_UNKNOWN]) * 0x10000
+    for start, end, units in _UNIFORM_RANGES:
+        table[start:end] = bytes([units]) * (end - start)
+    return table
+
+
+_BMP_WIDTHS = _build_bmp_table()
+
+
+@lru_cache(maxsize=16384)
+def _wide_units(text: str) -> int:
+    """Sum width units of a non-ASCII string."""
+    table = _BMP_WIDTHS
+    total = 0
+    for cp in map(ord, text):
+        units = table[cp] if cp < 0x10000 else _UNKNOWN
+        if units == _UNKNOWN:
+            units = _char_units(chr(cp))
+            if cp < 0x10000:
+                table[cp] = units
+        total += units
+    return total
+
+
+def display_width(text: str) -> int:
+    """Return the display width of text (wide chars count as 1.5)."""
+    if text.isascii():
+        return len(text)
+    return _wide_units(text) // 2
+
+
+def iter_slides(lines: Iterable[str]) -> Iterator[str]:
+    """Yield slides one at a time from markdown lines, e.g. an open file.
+
+    Splits exactly like ``SlideValidator._split_slides`` without holding the
+    document: the frontmatter is dropped, a ``---`` line separates slides
+    unless it directly follows another separator, and slides are stripped
+    with empty ones skipped. Only an unclosed frontmatter block is buffered.
+    """
+    it = iter(lines)
+    first = next(it, None)
+    if first is None:
+        return
+    body: Iterable[str] = itertools.chain([first], it)
+    if first == "---\n":
+        header = [first]
+        for line in it:
+            header.append(line)
+            # The closing line cannot directly follow the opening one
+            if line == "---\n" and len(header) > 2:
+                body = it
+                break
+        else:
+            # Never closed, so it is content rather than frontmatter
+            body = header
+
+    slide: list[str] = []
+    # A separator needs a newline before it that no separator consumed
+    after_separator = True
+    for line in body:
+        if line == "---\n" and not after_separator:
+            text = "".join(slide).strip()
+            if text:
+                yield text
+            slide = []
+            after_separator = True
+            continue
+        slide.append(line)
+        after_separator = False
+    text = "".join(slide).strip()
+    if text:
+        yield text
+
 
 class Level(Enum):
     """Validation message level."""
@@ -85,256 +239,299 @@ class LayoutConstraints:
     # Nesting
     max_nest_level: int = 2
 
+    def fingerprint(self) -> str:
+        """Return a stable hash of all constraint values."""
+        payload = json.dumps(asdict(self), sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
 
-class SlideValidator:
-    """Validates Marp slides against layout constraints."""
 
-    def __init__(self, constraints: LayoutConstraints | None = None):
-        self.constraints = constraints or LayoutConstraints()
-        self.results: list[ValidationResult] = []
+@dataclass
+class SlideLine:
+    """Single slide line classified for the checks."""
+
+    text: str
+    in_code: bool = False
+    is_h1: bool = False
+    bullet: str | None = None  # Bullet body without the marker
+    indent: int = -1  # Leading whitespace before a -/* marker
+    width: int = 0  # Display width of the checked text
 
-    def validate_file(self, filepath: Path) -> list[ValidationResult]:
-        """Validate a Marp markdown file."""
-        content = filepath.read_text(encoding="utf-8")
-        return self.validate_content(content)
 
-    def validate_content(self, content: str) -> list[ValidationResult]:
-        """Validate Marp markdown content."""
-        self.results = []
-        slides = self._split_slides(content)
+@dataclass
+class SlideFeatures:
+    """Slide features collected in a single pass over its lines."""
+
+    classes: list[str] = field(default_factory=list)
+    has_h1: bool = False
+    has_description: bool = False
+    bullet_count: int = 0
+    code_lines: int = 0
+    code_blocks: int = 0
+    table_rows: int = 0
+    lines: list[SlideLine] = field(default_factory=list)
+
 
-        for i, slide in enumerate(slides, 1):
-            self._validate_slide(i, slide)
+# User-defined check: (slide number, features) -> results
+SlideCheck = Callable[[int, SlideFeatures], Iterable[ValidationResult]]
 
-        return self.results
+
+class SlideValidator:
+    """Validates Marp slides against layout constraints.
+
+    Results are collected per call rather than on the instance, so one
+    validator can serve concurrent requests.
+    """
+
+    def __init__(
+        self,
+        constraints: LayoutConstraints | None = None,
+        cache: SlideCache | None = None,
+        checks: Iterable[SlideCheck] = (),
+        profiler: SlideProfiler | None = None,
+        rules: Iterable[LayoutRule] | None = None,
+    ):
+        self.constraints = constraints or LayoutConstraints()
+        self.cache = cache
+        self.checks = list(checks)
+        # Compiled once; rules default to the built-in layouts for constraints
+        self.layout = LayoutTable(
+            default_rules(self.constraints) if rules is None else rules
+        )
+        check_names = ",".join(
+            f"{check.__module__}.{check.__qualname__}" for check in self.checks
+        )
+        self._cache_salt = (
+            f"{VALIDATOR_VERSION}:{self.constraints.fingerprint()}:"
+            f"{self.layout.fingerprint()}:{check_names}:"
+        )
+        # Instruments this instance only; unprofiled validators run unwrapped
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.instrument(self)
+
+    def validate_file(
+        self, filepath: Path, lines: list[tuple[int, int]] | None = None
+    ) -> list[ValidationResult]:
+        """Validate a Marp markdown file.
+
+        ``lines`` restricts the checks to the slides containing those
+        (first, last) line ranges.
+        """
+        content = filepath.read_text(encoding="utf-8")
+        if lines is None:
+            return self.validate_content(content)
+
+        from slide_diff import slides_touching
+
+        return self.validate_content(content, slides_touching(content, lines))
+
+    def validate_content(
+        self, content: str, only: set[int] | None = None
+    ) -> list[ValidationResult]:
+        """Validate Marp markdown content.
+
+        ``only`` restricts the checks to those 1-based slide numbers.
+        """
+        return list(self._validate_slides(self._split_slides(content), only))
+
+    def iter_validate(
+        self, lines: Iterable[str], only: set[int] | None = None
+    ) -> Iterator[ValidationResult]:
+        """Validate slides as they are read from ``lines`` (e.g. an open file).
+
+        Results are yielded slide by slide and only the current slide is held
+        in memory. Closing the generator early still flushes the cache.
+        """
+        return self._validate_slides(iter_slides(lines), only)
+
+    def _validate_slides(
+        self, slides: Iterable[str], only: set[int] | None
+    ) -> Iterator[ValidationResult]:
+        """Yield the results of each slide in turn."""
+        try:
+            for i, slide in enumerate(slides, 1):
+                if only is not None and i not in only:
+                    continue
+                if self.cache is None:
+                    yield from self._validate_slide(i, slide)
+                else:
+                    yield from self._validate_slide_cached(i, slide)
+        finally:
+            if self.cache is not None:
+                self.cache.flush()
+
+    def validate_slide(self, num: int, slide: str) -> list[ValidationResult]:
+        """Validate one already-split slide and return only its results."""
+        return self._validate_slide(num, slide)
+
+    def _validate_slide_cached(self, num: int, slide: str) -> list[ValidationResult]:
+        """Validate a slide, reusing cached results for unchanged text."""
+        key = hashlib.sha256((self._cache_salt + slide).encode("utf-8")).hexdigest()
+        cached = self.cache.get(key)
+        if cached is not None:
+            return [
+                ValidationResult(num, Level(level), message, detail)
+                for level, message, detail in cached
+            ]
+
+        results = self._validate_slide(num, slide)
+        self.cache.put(key, [[r.level.value, r.message, r.detail] for r in results])
+        return results
 
     def _split_slides(self, content: str) -> list[str]:
         """Split content into individual slides."""
         # Remove YAML frontmatter
-        content = re.sub(r"^---\n.*?\n---\n", "", content, flags=re.DOTALL)
+        content = FRONTMATTER_RE.sub("", content, count=1)
         # Split by slide separator
-        slides = re.split(r"\n---\n", content)
+        slides = SLIDE_SEPARATOR_RE.split(content)
         return [s.strip() for s in slides if s.strip()]
 
-    def _validate_slide(self, num: int, slide: str) -> None:
+    def _validate_slide(self, num: int, slide: str) -> list[ValidationResult]:
         """Validate a single slide."""
-        # Parse slide components
-        classes = self._extract_classes(slide)
-        has_h1 = bool(re.search(r"^# [^#]", slide, re.MULTILINE))
-        has_h2 = bool(re.search(r"^## ", slide, re.MULTILINE))
-        has_description = self._has_description(slide)
-        bullet_count = self._count_bullets(slide)
-        code_lines = self._count_code_lines(slide)
-        table_rows = self._count_table_rows(slide)
-        code_blocks = self._count_code_blocks(slide)
-
-        # Skip title/section slides
-        if "title" in classes or "section" in classes:
+        results: list[ValidationResult] = []
+        features = self._extract_features(slide)
+        self._check_layout(results, num, features)
+        for check in self.checks:
+            results.extend(check(num, features))
+        return results
+
+    def _check_layout(
+        self, results: list[ValidationResult], num: int, features: SlideFeatures
+    ) -> None:
+        """Run the built-in layout checks on a slide."""
+        rule = self.layout.lookup(features)
+        if rule is not None and rule.skip:
             return
 
         # Check multiple code blocks
-        if code_blocks > 1:
+        if features.code_blocks > 1:
             self._add_result(
+                results,
                 num,
                 Level.WARNING,
                 "複数コードブロック",
-                f"{code_blocks}個のコードブロックがあります。1スライド1ブロック推奨",
+                f"{features.code_blocks}個のコードブロックがあります。1スライド1ブロック推奨",
             )
 
-        # Determine constraints based on configuration
-        c = self.constraints
-
-        if "no-header" in classes and code_lines > 0:
-            self._check_limit(
-                num,
-                code_lines,
-                c.noheader_code_max,
-                c.noheader_code_recommended,
-                "コード行数(no-header)",
-            )
-        elif "small-text" in classes and bullet_count > 0:
-            self._check_limit(
-                num,
-                bullet_count,
-                c.smalltext_bullet_max,
-                c.smalltext_bullet_recommended,
-                "箇条書き行数(small-text)",
-            )
-        elif "subtitle-safe" in classes and bullet_count > 0:
+        # Limits of the layout the slide's signature selects
+        for limit in rule.limits if rule is not None else ():
+            value = getattr(features, limit.measure)
             self._check_limit(
-                num,
-                bullet_count,
-                c.subtitlesafe_bullet_max,
-                c.subtitlesafe_bullet_recommended,
-                "箇条書き行数(subtitle-safe)",
+                results, num, value, limit.max, limit.recommended, limit.label
             )
-        elif has_h1:
-            if has_description and code_lines > 0:
-                self._check_limit(
-                    num,
-                    code_lines,
-                    c.h1_desc_code_max,
-                    c.h1_desc_code_recommended,
-                    "コード行数(h1+説明文+コード)",
-                )
-            elif has_description and bullet_count > 0:
-                self._check_limit(
-                    num,
-                    bullet_count,
-                    c.h1_desc_bullet_max,
-                    c.h1_desc_bullet_recommended,
-                    "箇条書き行数(h1+説明文+箇条書き)",
-                )
-            elif bullet_count > 0 and code_lines > 0:
-                # Combined bullet + code
-                if bullet_count > c.h1_bullet_code_bullet_max:
-                    self._add_result(
-                        num,
-                        Level.WARNING,
-                        "箇条書き過多(h1+箇条書き+コード)",
-                        f"{bullet_count}行 > 推奨{c.h1_bullet_code_bullet_max}行",
-                    )
-                if code_lines > c.h1_bullet_code_code_max:
-                    self._add_result(
-                        num,
-                        Level.WARNING,
-                        "コード過多(h1+箇条書き+コード)",
-                        f"{code_lines}行 > 推奨{c.h1_bullet_code_code_max}行",
-                    )
-            elif code_lines > 0:
-                self._check_limit(
-                    num,
-                    code_lines,
-                    c.h1_code_max,
-                    c.h1_code_recommended,
-                    "コード行数(h1+コード)",
-                )
-            elif bullet_count > 0:
-                self._check_limit(
-                    num,
-                    bullet_count,
-                    c.h1_bullet_max,
-                    c.h1_bullet_recommended,
-                    "箇条書き行数(h1+箇条書き)",
-                )
-            elif table_rows > 0:
-                self._check_limit(
-                    num,
-                    table_rows,
-                    c.h1_table_max,
-                    c.h1_table_recommended,
-                    "テーブル行数(h1+テーブル)",
-                )
 
         # Check text length
-        self._check_text_lengths(num, slide)
+        self._check_text_lengths(results, num, features)
 
         # Check nesting level
-        self._check_nesting(num, slide)
-
-    def _extract_classes(self, slide: str) -> list[str]:
-        """Extract CSS classes from slide."""
-        matches = re.findall(r"<!-- _class: (.+?) -->", slide)
-        classes = []
-        for match in matches:
-            classes.extend(match.split())
-        return classes
-
-    def _has_description(self, slide: str) -> bool:
-        """Check if slide has description text (non-bullet, non-code paragraph)."""
-        lines = slide.split("\n")
-        in_code = False
-        for line in lines:
-            if line.startswith("```"):
-                in_code = not in_code
-                continue
-            if in_code:
-                continue
-            # Skip headers, bullets, comments, empty lines
-            if (
-                line.startswith("#")
-                or line.startswith("-")
-                or line.startswith("*")
-                or line.startswith("|")
-                or line.startswith("<!--")
-                or line.startswith(">")
-                or not line.strip()
-            ):
-                continue
-            # Found a regular paragraph
-            if len(line.strip()) > 5:
-                return True
-        return False
-
-    def _count_bullets(self, slide: str) -> int:
-        """Count bullet list items."""
-        lines = slide.split("\n")
-        count = 0
+        self._check_nesting(results, num, features)
+
+    def _extract_features(self, slide: str) -> SlideFeatures:
+        """Classify every line of a slide in one pass."""
+        features = SlideFeatures()
         in_code = False
-        for line in lines:
+        pending_code_lines = 0
+
+        for line in slide.split("\n"):
+            # Classes, tables and h1 are detected regardless of fence state
+            if "<!--" in line:
+                for match in CLASS_RE.findall(line):
+                    features.classes.extend(match.split())
+            if line.startswith("|") and not TABLE_SEPARATOR_RE.match(line):
+                features.table_rows += 1
+            if line.startswith("# ") and line[2:3] != "#":
+                features.has_h1 = True
+
+            # Any fence opens a block, info strings included ("```bash title")
             if line.startswith("```"):
+                if in_code:
+                    # Only closed blocks contribute code lines
+                    features.code_lines += pending_code_lines
+                else:
+                    features.code_blocks += 1
+                    pending_code_lines = 0
                 in_code = not in_code
                 continue
+
+            info = SlideLine(line, in_code=in_code)
+            marker = LIST_MARKER_RE.match(line)
+            if line.startswith("# "):
+                info.is_h1 = True
+                info.width = display_width(line[2:])
+            elif marker and marker.group(2):
+                info.bullet = line[marker.end() :]
+                info.width = display_width(info.bullet)
+            elif in_code:
+                info.width = display_width(line)
+
             if in_code:
-                continue
-            if re.match(r"^\s*[-*]\s", line):
-                count += 1
-        return count
-
-    def _count_code_lines(self, slide: str) -> int:
-        """Count lines inside code blocks."""
-        matches = re.findall(r"```\w*\n(.*?)```", slide, re.DOTALL)
-        total = 0
-        for match in matches:
-            lines = [line for line in match.split("\n") if line.strip()]
-            total += len(lines)
-        return total
-
-    def _count_table_rows(self, slide: str) -> int:
-        """Count table rows (including header)."""
-        lines = slide.split("\n")
-        count = 0
-        for line in lines:
-            if line.startswith("|") and not re.match(r"^\|[-: |]+\|$", line):
-                count += 1
-        return count
-
-    def _count_code_blocks(self, slide: str) -> int:
-        """Count number of code blocks."""
-        return len(re.findall(r"```\w*\n", slide))
+                if line.strip():
+                    pending_code_lines += 1
+            else:
+                if marker:
+                    info.indent = len(marker.group(1))
+                if info.bullet is not None:
+                    features.bullet_count += 1
+                if (
+                    not features.has_description
+                    and not line.startswith(("#", "-", "*", "|", "<!--", ">"))
+                    and len(line.strip()) > 5
+                ):
+                    # Found a regular paragraph
+                    features.has_description = True
+
+            features.lines.append(info)
+
+        return features
 
     def _check_limit(
-        self, num: int, value: int, max_val: int, recommended: int, label: str
+        self,
+        results: list[ValidationResult],
+        num: int,
+        value: int,
+        max_val: int,
+        recommended: int | None,
+        label: str,
     ) -> None:
-        """Check value against limits and add appropriate result."""
-        if value > max_val:
+        """Check value against limits and add appropriate result.
+
+        Without a recommended value, ``max_val`` is a soft limit that only warns.
+        """
+        if recommended is None:
+            if value > max_val:
+                self._add_result(
+                    results, num, Level.WARNING, label, f"{value}行 > 推奨{max_val}行"
+                )
+        elif value > max_val:
             self._add_result(
-                num, Level.ERROR, f"{label}超過", f"{value}行 > 上限{max_val}行"
+                results,
+                num,
+                Level.ERROR,
+                f"{label}超過",
+                f"{value}行 > 上限{max_val}行",
             )
         elif value > recommended:
             self._add_result(
-                num, Level.INFO, f"{label}推奨超過", f"{value}行 > 推奨{recommended}行"
+                results,
+                num,
+                Level.INFO,
+                f"{label}推奨超過",
+                f"{value}行 > 推奨{recommended}行",
             )
 
-    def _check_text_lengths(self, num: int, slide: str) -> None:
+    def _check_text_lengths(
+        self, results: list[ValidationResult], num: int, features: SlideFeatures
+    ) -> None:
         """Check text lengths in slide."""
         c = self.constraints
-        lines = slide.split("\n")
-        in_code = False
 
-        for line in lines:
-            if line.startswith("```"):
-                in_code = not in_code
-                continue
-
-            # Count Japanese/wide characters as 1.5
-            char_count = self._count_chars(line)
-
-            if line.startswith("# ") and not line.startswith("## "):
-                text = line[2:]
-                text_len = self._count_chars(text)
+        for line in features.lines:
+            # Japanese/wide characters count as 1.5
+            text_len = line.width
+            if line.is_h1:
                 if text_len > c.h1_max_chars:
                     self._add_result(
+                        results,
                         num,
                         Level.WARNING,
                         "h1タイトル長すぎ",
@@ -342,97 +539,341 @@ class SlideValidator:
                     )
                 elif text_len > c.h1_recommended_chars:
                     self._add_result(
+                        results,
                         num,
                         Level.INFO,
                         "h1タイトル推奨超過",
                         f"{text_len}文字 > 推奨{c.h1_recommended_chars}文字",
                     )
-            elif re.match(r"^\s*[-*]\s", line):
-                text = re.sub(r"^\s*[-*]\s*", "", line)
-                text_len = self._count_chars(text)
+            elif line.bullet is not None:
                 if text_len > c.bullet_max_chars:
                     self._add_result(
+                        results,
                         num,
                         Level.WARNING,
                         "箇条書き1行長すぎ",
-                        f"{text_len}文字 > 上限{c.bullet_max_chars}文字: {text[:20]}...",
+                        f"{text_len}文字 > 上限{c.bullet_max_chars}文字: {line.bullet[:20]}...",
                     )
-            elif in_code:
-                if char_count > c.code_max_chars:
+            elif line.in_code:
+                if text_len > c.code_max_chars:
                     self._add_result(
+                        results,
                         num,
                         Level.INFO,
                         "コード1行長い",
-                        f"{char_count}文字 > 推奨{c.code_recommended_chars}文字",
+                        f"{text_len}文字 > 推奨{c.code_recommended_chars}文字",
                     )
 
-    def _count_chars(self, text: str) -> int:
-        """Count characters (wide chars count as 1.5)."""
-        count = 0
-        for char in text:
-            if ord(char) > 127:  # Non-ASCII (Japanese, etc.)
-                count += 1.5
-            else:
-                count += 1
-        return int(count)
-
-    def _check_nesting(self, num: int, slide: str) -> None:
+    def _check_nesting(
+        self, results: list[ValidationResult], num: int, features: SlideFeatures
+    ) -> None:
         """Check for excessive nesting levels."""
-        lines = slide.split("\n")
-        in_code = False
-        for line in lines:
-            if line.startswith("```"):
-                in_code = not in_code
-                continue
-            if in_code:
+        for line in features.lines:
+            if line.in_code or line.indent < 0:
                 continue
 
-            # Count leading spaces for bullets
-            match = re.match(r"^(\s*)[-*]", line)
-            if match:
-                indent = len(match.group(1))
-                # 2 spaces per level typically
-                level = indent // 2
-                if level > self.constraints.max_nest_level:
-                    self._add_result(
-                        num,
-                        Level.WARNING,
-                        "ネスト深すぎ",
-                        f"{level + 1}階層 > 推奨{self.constraints.max_nest_level + 1}階層",
-                    )
+            # 2 spaces per level typically
+            level = line.indent // 2
+            if level > self.constraints.max_nest_level:
+                self._add_result(
+                    results,
+                    num,
+                    Level.WARNING,
+                    "ネスト深すぎ",
+                    f"{level + 1}階層 > 推奨{self.constraints.max_nest_level + 1}階層",
+                )
 
     def _add_result(
-        self, slide_num: int, level: Level, message: str, detail: str = ""
+        self,
+        results: list[ValidationResult],
+        slide_num: int,
+        level: Level,
+        message: str,
+        detail: str = "",
     ) -> None:
         """Add a validation result."""
-        self.results.append(ValidationResult(slide_num, level, message, detail))
-
-
-def main() -> int:
-    """Main entry point."""
-    if len(sys.argv) < 2:
-        print("Usage: python validate_slides.py <slides.md>")
-        print("Example: python validate_slides.py episodes/20260101/slides/slides.md")
-        return 1
+        results.append(ValidationResult(slide_num, level, message, detail))
+
+
+def load_layout(path: Path) -> tuple[LayoutConstraints, list[LayoutRule]]:
+    """Build constraints and layout rules from a profile file."""
+    profile = load_profile(path)
+    try:
+        constraints = LayoutConstraints(**profile.constraints)
+    except TypeError as e:
+        raise ValueError(f"{path}: invalid constraints: {e}") from None
+    rules = profile.rules
+    if profile.inherit:
+        rules = [*rules, *default_rules(constraints)]
+    # Fail at startup rather than in every worker
+    LayoutTable(rules)
+    return constraints, rules
+
+
+def discover_decks(targets: list[str], pattern: str = "slides.md") -> list[Path]:
+    """Expand files, directories and glob patterns into deck paths.
+
+    Directories are searched recursively for files matching ``pattern``.
+    Paths that do not exist are returned as-is so the caller can report them.
+    """
+    decks: list[Path] = []
+    seen: set[Path] = set()
+
+    def add(path: Path) -> None:
+        key = path.resolve()
+        if key not in seen:
+            seen.add(key)
+            decks.append(path)
+
+    for target in targets:
+        if glob.has_magic(target):
+            candidates = [Path(p) for p in sorted(glob.glob(target, recursive=True))]
+        else:
+            candidates = [Path(target)]
+        for path in candidates:
+            if path.is_dir():
+                for found in sorted(path.rglob(pattern)):
+                    if found.is_file():
+                        add(found)
+            else:
+                add(path)
+    return decks
+
+
+def _validate_chunk(
+    decks: list[tuple[Path, list[tuple[int, int]] | None]],
+    cache_path: Path | None = None,
+    cache_size: int = DEFAULT_MAX_ENTRIES,
+    profiler: SlideProfiler | None = None,
+    constraints: LayoutConstraints | None = None,
+    rules: list[LayoutRule] | None = None,
+) -> list[tuple[Path, list[ValidationResult] | None]]:
+    """Validate (deck, line ranges) pairs in one worker (None if missing).
+
+    One validator and cache serve the whole chunk, since compiling the layout
+    table costs about as much as checking a small deck. A cache is opened
+    when ``cache_path`` is given. Line ranges limit the checks to the slides
+    containing those (first, last) ranges; None checks the whole deck.
+    """
+    cache = SlideCache(cache_path, cache_size) if cache_path else None
+    try:
+        validator = SlideValidator(
+            constraints, cache=cache, profiler=profiler, rules=rules
+        )
+        outcomes = []
+        for filepath, lines in decks:
+            if not filepath.is_file():
+                outcomes.append((filepath, None))
+            else:
+                outcomes.append((filepath, validator.validate_file(filepath, lines)))
+        return outcomes
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _chunked(items: list, jobs: int) -> list[list]:
+    """Split work into about four chunks per worker process."""
+    size = max(1, len(items) // (jobs * 4))
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def validate_paths(
+    paths: list[Path],
+    jobs: int | None = None,
+    cache_path: Path | None = None,
+    cache_size: int = DEFAULT_MAX_ENTRIES,
+    profiler: SlideProfiler | None = None,
+    changed: dict[Path, list[tuple[int, int]] | None] | None = None,
+    constraints: LayoutConstraints | None = None,
+    rules: list[LayoutRule] | None = None,
+) -> list[tuple[Path, list[ValidationResult] | None]]:
+    """Validate decks, fanning out to a process pool for multiple files.
+
+    A profiler collects in this process, so profiled runs stay sequential.
+    ``changed`` maps decks to the line ranges whose slides are checked
+    (None checks the whole deck).
+    """
+    worker = partial(
+        _validate_chunk,
+        cache_path=cache_path,
+        cache_size=cache_size,
+        profiler=profiler,
+        constraints=constraints,
+        rules=rules,
+    )
+    decks = [(path, changed.get(path) if changed else None) for path in paths]
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(paths) <= 1 or profiler is not None:
+        return worker(decks)
+
+    # Workers take whole chunks so each builds one validator per chunk
+    chunks = _chunked(decks, jobs)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as executor:
+        return [outcome for chunk in executor.map(worker, chunks) for outcome in chunk]
+
+
+def iter_deck_results(
+    paths: list[Path],
+    jobs: int | None = None,
+    cache_path: Path | None = None,
+    cache_size: int = DEFAULT_MAX_ENTRIES,
+    changed: dict[Path, list[tuple[int, int]] | None] | None = None,
+    constraints: LayoutConstraints | None = None,
+    rules: list[LayoutRule] | None = None,
+) -> Iterator[tuple[Path, Iterator[ValidationResult] | None]]:
+    """Yield (deck, results) with results produced lazily (None if missing).
+
+    With one deck or ``jobs <= 1`` every deck is read and checked slide by
+    slide in this process; otherwise decks are validated on a process pool
+    and arrive whole, in order. Close the generator (and the current results)
+    to stop early; queued decks are then cancelled.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs > 1 and len(paths) > 1:
+        worker = partial(
+            _validate_chunk,
+            cache_path=cache_path,
+            cache_size=cache_size,
+            constraints=constraints,
+            rules=rules,
+        )
+        decks = [(path, changed.get(path) if changed else None) for path in paths]
+        chunks = _chunked(decks, jobs)
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(chunks)))
+        try:
+            for chunk in executor.map(worker, chunks):
+                for path, results in chunk:
+                    yield path, None if results is None else (r for r in results)
+        finally:
+            executor.shutdown(cancel_futures=True)
+        return
+
+    cache = SlideCache(cache_path, cache_size) if cache_path else None
+    try:
+        validator = SlideValidator(constraints, cache=cache, rules=rules)
+        for path in paths:
+            if not path.is_file():
+                yield path, None
+                continue
+            ranges = changed.get(path) if changed else None
+            with path.open(encoding="utf-8") as f:
+                if ranges is None:
+                    yield path, validator.iter_validate(f)
+                    continue
+
+                from slide_diff import slides_touching
+
+                content = f.read()
+                only = slides_touching(content, ranges)
+                yield path, validator.iter_validate(io.StringIO(content), only)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def report_stream(
+    decks: Iterator[tuple[Path, Iterator[ValidationResult] | None]],
+    fmt: str = "text",
+    max_errors: int | None = None,
+    multiple: bool = True,
+) -> int:
+    """Report results as they are produced and return the exit code.
+
+    "ndjson" prints one JSON object per result as soon as it exists, one
+    with an ``error`` key per missing deck and a final ``summary`` object;
+    "text" prints each deck's usual report once the deck is done. Checking
+    stops once ``max_errors`` errors have been seen.
+    """
+    totals = {level: 0 for level in Level}
+    files = failed_files = missing = 0
+    stopped = False
+
+    def emit(record: dict) -> None:
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+
+    with closing(decks):
+        for path, results in decks:
+            files += 1
+            if results is None:
+                missing += 1
+                if fmt == "ndjson":
+                    emit({"file": str(path), "error": "File not found"})
+                else:
+                    print(f"Error: File not found: {path}")
+                continue
 
-    filepath = Path(sys.argv[1])
-    if not filepath.exists():
-        print(f"Error: File not found: {filepath}")
-        return 1
+            deck: list[ValidationResult] = []
+            errors = 0
+            with closing(results):
+                for r in results:
+                    totals[r.level] += 1
+                    errors += r.level == Level.ERROR
+                    if fmt == "ndjson":
+                        emit(
+                            {
+                                "file": str(path),
+                                "slide_num": r.slide_num,
+                                "level": r.level.value,
+                                "message": r.message,
+                                "detail": r.detail,
+                            }
+                        )
+                    else:
+                        deck.append(r)
+                    if max_errors is not None and totals[Level.ERROR] >= max_errors:
+                        stopped = True
+                        break
+            failed_files += errors > 0
+            if fmt == "text":
+                print_report(path, deck, label=str(path) if multiple else None)
+            if stopped:
+                break
+
+    if fmt == "ndjson":
+        emit(
+            {
+                "summary": {
+                    "files": files,
+                    "failed_files": failed_files,
+                    "missing": missing,
+                    **{level.value: totals[level] for level in Level},
+                    "stopped": stopped,
+                }
+            }
+        )
+    else:
+        if stopped:
+            print(f"\n⏹  Stopped after {totals[Level.ERROR]} errors (--max-errors)")
+        if multiple:
+            print("\n" + "#" * 50)
+            print(
+                f"Total: {files} files, {failed_files} with errors, {missing} missing"
+            )
+            print(
+                f"Summary: {totals[Level.ERROR]} errors, "
+                f"{totals[Level.WARNING]} warnings, {totals[Level.INFO]} info"
+            )
+    return 1 if failed_files or missing else 0
 
-    validator = SlideValidator()
-    results = validator.validate_file(filepath)
 
+def print_report(
+    filepath: Path, results: list[ValidationResult], label: str | None = None
+) -> None:
+    """Print validation results for one deck."""
+    label = label or filepath.name
     if not results:
-        print(f"✅ {filepath.name}: All slides pass validation!")
-        return 0
+        print(f"✅ {label}: All slides pass validation!")
+        return
 
     # Group by level
     errors = [r for r in results if r.level == Level.ERROR]
     warnings = [r for r in results if r.level == Level.WARNING]
     infos = [r for r in results if r.level == Level.INFO]
 
-    print(f"\n📊 Validation Results for {filepath.name}")
+    print(f"\n📊 Validation Results for {label}")
     print("=" * 50)
 
     if errors:
@@ -459,7 +900,291 @@ def main() -> int:
     print("\n" + "=" * 50)
     print(f"Summary: {len(errors)} errors, {len(warnings)} warnings, {len(infos)} info")
 
-    return 1 if errors else 0
+
+def count_levels(results: list[ValidationResult]) -> dict[Level, int]:
+    """Count results per level."""
+    counts = {level: 0 for level in Level}
+    for r in results:
+        counts[r.level] += 1
+    return counts
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Validate Marp slides against layout constraints.",
+        epilog="Example: python validate_slides.py episodes/20260101/slides/slides.md",
+    )
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        metavar="DIR_OR_GLOB",
+        help="slides.md files, directories or glob patterns",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--pattern",
+        default="slides.md",
+        help="file name pattern searched in directories (default: slides.md)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="re-check every slide without reading or writing the result cache",
+    )
+    parser.add_argument(
+        "--cache-file",
+        type=Path,
+        default=None,
+        help="result cache location (default: ~/.cache/marp-slide-writer/)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help=f"maximum cached slides before eviction (default: {DEFAULT_MAX_ENTRIES})",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and re-validate changed slides on every save",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.2,
+        help="polling interval in seconds for --watch (default: 0.2)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="report time per check and per slide (runs in-process, without cache)",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        help="number of slowest checks and slides to report (default: 10)",
+    )
+    parser.add_argument(
+        "--profile-dump",
+        type=Path,
+        default=None,
+        help="also write cProfile stats to this file (implies --profile)",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="keep a warm validator answering JSON-lines requests on stdin/stdout",
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help="with --serve, listen on this Unix socket instead of stdin/stdout",
+    )
+    parser.add_argument(
+        "--layout-profile",
+        type=Path,
+        default=None,
+        help="JSON/YAML file with extra layout rules and constraint overrides",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="report layout percentiles and suggested constraints (needs NumPy)",
+    )
+    parser.add_argument(
+        "--stats-profile",
+        type=Path,
+        default=None,
+        help="with --stats, write the suggested constraints as a layout profile",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "ndjson"),
+        default="text",
+        help="ndjson prints one JSON object per result as soon as it is found",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=None,
+        metavar="N",
+        help="stop checking after N errors",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="stop at the first error (same as --max-errors 1)",
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        default=None,
+        help="only check slides changed since this git ref (targets default to .)",
+    )
+    args = parser.parse_args(argv)
+    if args.fail_fast:
+        args.max_errors = 1
+    if args.max_errors is not None and args.max_errors < 1:
+        parser.error("--max-errors must be at least 1")
+    streaming = args.format == "ndjson" or args.max_errors is not None
+    if streaming and (args.profile or args.profile_dump):
+        parser.error(
+            "--profile cannot be combined with --format ndjson or --max-errors"
+        )
+    if not args.targets:
+        if args.changed_since:
+            args.targets = ["."]
+        elif not args.serve:
+            parser.error("the following arguments are required: DIR_OR_GLOB")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point."""
+    args = parse_args(argv)
+
+    constraints, rules = None, None
+    if args.layout_profile:
+        try:
+            constraints, rules = load_layout(args.layout_profile)
+        except (OSError, ValueError) as e:
+            print(f"Error: Cannot load layout profile: {e}")
+            return 1
+
+    if args.watch:
+        from slide_watch import watch
+
+        return watch(
+            args.targets,
+            args.pattern,
+            args.interval,
+            constraints=constraints,
+            rules=rules,
+        )
+
+    if args.serve:
+        from slide_server import serve
+
+        cache = None
+        if not args.no_cache:
+            cache = SlideCache(args.cache_file or default_cache_path(), args.cache_size)
+        return serve(args.socket, cache, constraints, rules)
+
+    paths = discover_decks(args.targets, args.pattern)
+    if not paths:
+        print(f"Error: No decks matching {args.pattern} found")
+        return 1
+
+    if args.stats:
+        from slide_stats import run_stats
+
+        return run_stats(paths, args.jobs, constraints, rules, args.stats_profile)
+
+    changed = None
+    if args.changed_since:
+        from slide_diff import GitError, changed_lines
+
+        try:
+            by_resolved = changed_lines(args.changed_since, args.pattern)
+        except GitError as e:
+            print(f"Error: {e}")
+            return 1
+        changed = {
+            path: by_resolved[path.resolve()]
+            for path in paths
+            if path.resolve() in by_resolved
+        }
+        paths = list(changed)
+        if not paths:
+            print(f"✅ No decks changed since {args.changed_since}")
+            return 0
+
+    if args.format == "ndjson" or args.max_errors is not None:
+        cache_path = (
+            None if args.no_cache else (args.cache_file or default_cache_path())
+        )
+        decks = iter_deck_results(
+            paths,
+            args.jobs,
+            cache_path,
+            args.cache_size,
+            changed,
+            constraints,
+            rules,
+        )
+        return report_stream(decks, args.format, args.max_errors, len(paths) > 1)
+
+    profiler = None
+    if args.profile or args.profile_dump:
+        # Cached slides would skip the checks being measured
+        profiler = SlideProfiler()
+        cache_path = None
+        if args.profile_dump:
+            profiler.start_cprofile()
+    else:
+        cache_path = (
+            None if args.no_cache else (args.cache_file or default_cache_path())
+        )
+    outcomes = validate_paths(
+        paths,
+        args.jobs,
+        cache_path,
+        args.cache_size,
+        profiler,
+        changed,
+        constraints,
+        rules,
+    )
+    if profiler is not None:
+        profiler.stop_cprofile(args.profile_dump)
+
+    # Single deck keeps the original report format
+    if len(outcomes) == 1:
+        filepath, results = outcomes[0]
+        if results is None:
+            print(f"Error: File not found: {filepath}")
+            return 1
+        print_report(filepath, results)
+        if profiler is not None:
+            profiler.print_report(args.profile_top)
+        return 1 if count_levels(results)[Level.ERROR] else 0
+
+    totals = {level: 0 for level in Level}
+    failed_files = 0
+    missing = 0
+    for filepath, results in outcomes:
+        if results is None:
+            print(f"Error: File not found: {filepath}")
+            missing += 1
+            continue
+        print_report(filepath, results, label=str(filepath))
+        counts = count_levels(results)
+        for level, n in counts.items():
+            totals[level] += n
+        if counts[Level.ERROR]:
+            failed_files += 1
+
+    print("\n" + "#" * 50)
+    print(
+        f"Total: {len(outcomes)} files, {failed_files} with errors, {missing} missing"
+    )
+    print(
+        f"Summary: {totals[Level.ERROR]} errors, "
+        f"{totals[Level.WARNING]} warnings, {totals[Level.INFO]} info"
+    )
+    if profiler is not None:
+        profiler.print_report(args.profile_top)
+
+    return 1 if failed_files or missing else 0
 
 
 if __name__ == "__main__":
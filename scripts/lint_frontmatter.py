@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""Lint the frontmatter of every skill, command and agent in the marketplace.
+
+Checks the rules of the claude-skill-creator, sub-agents-creator and
+custom-commands-creator guides (required fields, name format, description
+length and triggers, tools, model and color values). Files are linted on a
+process pool, and results are cached by content hash, so repeat runs only
+re-lint files that changed.
+
+Usage:
+    python scripts/lint_frontmatter.py
+    python scripts/lint_frontmatter.py --strict --jobs 8
+    python scripts/lint_frontmatter.py --json > lint.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from marketplace import ROOT, cache_path, iter_components, parse_frontmatter
+
+# Bump when the rules change so cached results are discarded
+LINT_VERSION = 1
+
+NAME_RE = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
+NAME_MAX = 64
+DESCRIPTION_MAX = 1024
+# "Bash", "Bash(git add:*)", "mcp__expo-mcp__*"
+TOOL_RE = re.compile(r"^(?:[A-Z][A-Za-z]*(?:\(.+\))?|mcp__[\w-]+(?:__[\w*-]+)?)$")
+MODELS = ("sonnet", "opus", "haiku", "inherit")
+COLORS = ("gray", "blue", "green", "red", "yellow", "purple")
+
+FIELDS = {
+    "skill": ("name", "description", "allowed-tools"),
+    "agent": ("name", "description", "tools", "model", "color"),
+    "command": (
+        "description",
+        "allowed-tools",
+        "argument-hint",
+        "model",
+        "disable-model-invocation",
+    ),
+}
+# Phrases the guides use to make skills and agents activate automatically
+TRIGGERS = {
+    "skill": ("Use when", "Use PROACTIVELY", "MUST BE USED"),
+    "agent": ("Use PROACTIVELY", "MUST BE USED"),
+}
+
+
+class Issue(NamedTuple):
+    """One lint finding; ``level`` is "error" or "warning"."""
+
+    level: str
+    line: int
+    message: str
+
+
+def _check_name(value, default_name: str, kind: str, line: int) -> list[Issue]:
+    if not isinstance(value, str) or not value:
+        return [Issue("error", line, "name must be a non-empty string")]
+    issues = []
+    if not NAME_RE.match(value):
+        issues.append(
+            Issue(
+                "error",
+                line,
+                f"name '{value}' must use lowercase letters, numbers and hyphens",
+            )
+        )
+    if len(value) > NAME_MAX:
+        issues.append(
+            Issue("error", line, f"name is {len(value)} chars (max {NAME_MAX})")
+        )
+    if value != default_name:
+        where = "directory" if kind == "skill" else "file"
+        issues.append(
+            Issue(
+                "warning",
+                line,
+                f"name '{value}' does not match the {where} name '{default_name}'",
+            )
+        )
+    return issues
+
+
+def _check_description(value, kind: str, line: int) -> list[Issue]:
+    if not isinstance(value, str) or not value:
+        return [Issue("error", line, "description must be a non-empty string")]
+    issues = []
+    if len(value) > DESCRIPTION_MAX:
+        issues.append(
+            Issue(
+                "error",
+                line,
+                f"description is {len(value)} chars (max {DESCRIPTION_MAX})",
+            )
+        )
+    triggers = TRIGGERS.get(kind)
+    if triggers and not any(trigger in value for trigger in triggers):
+        issues.append(
+            Issue(
+                "warning",
+                line,
+                f"description has no activation trigger ({' / '.join(triggers)})",
+            )
+        )
+    return issues
+
+
+def _check_tools(value, key: str, wildcards: bool, line: int) -> list[Issue]:
+    if isinstance(value, str):
+        value = value.split(",")
+    tools = [tool.strip() for tool in value]
+    if not any(tools):
+        return [Issue("error", line, f"{key} is empty (omit it to allow all tools)")]
+    issues = []
+    for tool in tools:
+        if not tool:
+            issues.append(Issue("error", line, f"{key} has an empty entry"))
+        elif not wildcards and "*" in tool.split("(", 1)[0]:
+            issues.append(
+                Issue("error", line, f"{key}: wildcards are not supported ('{tool}')")
+            )
+        elif not TOOL_RE.match(tool):
+            issues.append(Issue("warning", line, f"{key}: unknown tool '{tool}'"))
+    return issues
+
+
+def _check_choice(value, key: str, choices: tuple[str, ...], line: int) -> list[Issue]:
+    if value not in choices:
+        return [
+            Issue("error", line, f"{key} '{value}' must be one of {', '.join(choices)}")
+        ]
+    return []
+
+
+def lint_text(kind: str, default_name: str, text: str) -> list[Issue]:
+    """Lint one component file's text."""
+    fm = parse_frontmatter(text)
+    if fm is None:
+        if kind == "command":
+            return [
+                Issue(
+                    "warning",
+                    1,
+                    "No frontmatter; the first body line is used as the description",
+                )
+            ]
+        return [Issue("error", 1, "Missing frontmatter (file must start with '---')")]
+
+    issues = [Issue("error", line, message) for line, message in fm.errors]
+    lines = text.split("\n")
+    for num in range(2, (fm.end or len(lines) + 1)):
+        if "\t" in lines[num - 1]:
+            issues.append(Issue("error", num, "Tab character in frontmatter"))
+
+    fields, at = fm.fields, fm.lines
+    for key in fields:
+        if key not in FIELDS[kind]:
+            issues.append(Issue("warning", at[key], f"Unknown {kind} field '{key}'"))
+
+    if kind != "command":
+        if "name" in fields:
+            issues += _check_name(fields["name"], default_name, kind, at["name"])
+        else:
+            issues.append(Issue("error", 1, "Missing required field 'name'"))
+    if "description" in fields:
+        issues += _check_description(fields["description"], kind, at["description"])
+    elif kind == "command":
+        issues.append(
+            Issue(
+                "warning",
+                1,
+                "Missing 'description'; the first body line is used instead",
+            )
+        )
+    else:
+        issues.append(Issue("error", 1, "Missing required field 'description'"))
+
+    tools_key = "tools" if kind == "agent" else "allowed-tools"
+    if tools_key in fields:
+        issues += _check_tools(
+            fields[tools_key], tools_key, kind == "agent", at[tools_key]
+        )
+    if "model" in fields and kind != "skill":
+        issues += _check_choice(fields["model"], "model", MODELS, at["model"])
+    if "color" in fields and kind == "agent":
+        issues += _check_choice(fields["color"], "color", COLORS, at["color"])
+    if "disable-model-invocation" in fields and kind == "command":
+        issues += _check_choice(
+            fields["disable-model-invocation"],
+            "disable-model-invocation",
+            ("true", "false"),
+            at["disable-model-invocation"],
+        )
+    return sorted(issues, key=lambda issue: issue.line)
+
+
+def _lint_job(job: tuple[str, str, str]) -> list[Issue]:
+    return lint_text(*job)
+
+
+def _content_key(kind: str, default_name: str, data: bytes) -> str:
+    digest = hashlib.sha256(f"{LINT_VERSION}\0{kind}\0{default_name}\0".encode())
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def _load_cache(path: Path) -> dict[str, list[Issue]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return {
+            key: [Issue(*issue) for issue in issues]
+            for key, issues in data["results"].items()
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def _save_cache(path: Path, results: dict[str, list[Issue]]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"results": results}, f, ensure_ascii=False)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError:
+        pass
+
+
+def lint_marketplace(
+    root: Path = ROOT,
+    jobs: int | None = None,
+    cache_file: Path | None = None,
+    use_cache: bool = True,
+) -> tuple[list[dict], int]:
+    """Lint every component; returns (per-file reports, number of cache hits).
+
+    Files whose content hash is cached are not re-linted; the rest fan out to
+    a process pool. The cache keeps only the files of this run.
+    """
+    cache_file = cache_file or cache_path("lint", root)
+    cached = _load_cache(cache_file) if use_cache else {}
+
+    components, keys, pending = [], [], []
+    for component in iter_components(root):
+        data = component.path.read_bytes()
+        key = _content_key(component.kind, component.default_name, data)
+        components.append(component)
+        keys.append(key)
+        if key not in cached:
+            text = data.decode("utf-8", errors="replace")
+            pending.append((key, (component.kind, component.default_name, text)))
+
+    # Identical files (e.g. copied templates) are linted once
+    unique = dict(pending)
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(unique) <= 1:
+        fresh = [_lint_job(job) for job in unique.values()]
+    else:
+        chunksize = max(1, len(unique) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=min(jobs, len(unique))) as executor:
+            fresh = list(executor.map(_lint_job, unique.values(), chunksize=chunksize))
+    results = {**cached, **dict(zip(unique, fresh))}
+
+    reports = [
+        {
+            "plugin": component.plugin,
+            "kind": component.kind,
+            "path": str(component.path),
+            "issues": [issue._asdict() for issue in results[key]],
+        }
+        for component, key in zip(components, keys)
+    ]
+    if use_cache and (unique or len(cached) != len(set(keys))):
+        _save_cache(cache_file, {key: results[key] for key in keys})
+    return reports, len(components) - len(pending)
+
+
+def _display_path(path: str, root: Path) -> str:
+    try:
+        return str(Path(path).relative_to(root.resolve()))
+    except ValueError:
+        return path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Lint SKILL.md, agent and command frontmatter in the marketplace."
+    )
+    parser.add_argument(
+        "--root", type=Path, default=ROOT, help="marketplace root (default: this repo)"
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=None, help="worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--strict", action="store_true", help="exit with 1 on warnings too"
+    )
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    parser.add_argument("--cache-file", type=Path, default=None)
+    parser.add_argument(
+        "--no-cache", action="store_true", help="re-lint every file, skip the cache"
+    )
+    args = parser.parse_args()
+
+    try:
+        reports, hits = lint_marketplace(
+            args.root, args.jobs, args.cache_file, not args.no_cache
+        )
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: Cannot read marketplace at {args.root}: {e}")
+        return 1
+
+    issues = [issue for report in reports for issue in report["issues"]]
+    errors = sum(1 for issue in issues if issue["level"] == "error")
+    warnings = len(issues) - errors
+
+    if args.json:
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
+    else:
+        for report in reports:
+            path = _display_path(report["path"], args.root)
+            for issue in report["issues"]:
+                mark = "❌" if issue["level"] == "error" else "⚠️ "
+                print(f"{mark} {path}:{issue['line']}: {issue['message']}")
+        if not issues:
+            print(f"✅ All {len(reports)} files pass frontmatter lint!")
+        print(
+            f"Summary: {len(reports)} files ({hits} cached), "
+            f"{errors} errors, {warnings} warnings"
+        )
+
+    if errors or (args.strict and warnings):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Marketplace discovery and frontmatter parsing shared by the scripts here.
+
+Reads ``.claude-plugin/marketplace.json``, finds every skill
+(``skills/<name>/SKILL.md``), command (``commands/*.md``) and agent
+(``agents/*.md``) of the listed plugins, and parses their frontmatter the
+way Claude Code reads it: one ``key: value`` per line, where the value is
+everything after the first colon. Strict YAML would reject the unquoted
+``Examples: <example>Context: ...`` descriptions these files rely on.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MARKETPLACE_JSON = Path(".claude-plugin") / "marketplace.json"
+
+KINDS = ("skill", "command", "agent")
+KEY_RE = re.compile(r"^([A-Za-z][\w-]*)\s*:(.*)$")
+
+
+@dataclass
+class Component:
+    """One skill, command or agent file of a plugin."""
+
+    plugin: str
+    kind: str
+    path: Path
+
+    @property
+    def default_name(self) -> str:
+        """Name Claude Code uses when the frontmatter has none."""
+        return self.path.parent.name if self.kind == "skill" else self.path.stem
+
+
+@dataclass
+class Frontmatter:
+    """Parsed frontmatter block.
+
+    ``lines`` maps each key to its 1-based line; ``errors`` holds
+    (line, message) pairs for lines that could not be parsed.
+    """
+
+    fields: dict[str, str | list[str]] = field(default_factory=dict)
+    lines: dict[str, int] = field(default_factory=dict)
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    # Line of the closing "---"
+    end: int = 0
+
+
+def cache_path(prefix: str, root: Path = ROOT) -> Path:
+    """Return a cache file for one marketplace (honours XDG_CACHE_HOME)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    digest = hashlib.sha256(str(root.resolve()).encode("utf-8")).hexdigest()[:12]
+    return Path(base) / "tomada-claude-plugins" / f"{prefix}-{digest}.json"
+
+
+def load_marketplace(root: Path = ROOT) -> dict:
+    """Read the marketplace definition."""
+    return json.loads((root / MARKETPLACE_JSON).read_text(encoding="utf-8"))
+
+
+def plugin_dirs(root: Path = ROOT) -> list[tuple[str, Path]]:
+    """Return (plugin name, directory) for every plugin in marketplace.json."""
+    return [
+        (plugin["name"], (root / plugin["source"]).resolve())
+        for plugin in load_marketplace(root).get("plugins", [])
+    ]
+
+
+def _md_files(directory: Path) -> list[Path]:
+    try:
+        with os.scandir(directory) as it:
+            return sorted(
+                Path(entry.path)
+                for entry in it
+                if entry.name.endswith(".md") and entry.is_file()
+            )
+    except OSError:
+        return []
+
+
+def iter_components(root: Path = ROOT) -> Iterator[Component]:
+    """Yield every skill, command and agent file without reading them."""
+    for plugin, directory in plugin_dirs(root):
+        try:
+            with os.scandir(directory / "skills") as it:
+                skills = sorted(entry.path for entry in it if entry.is_dir())
+        except OSError:
+            skills = []
+        for skill in skills:
+            path = Path(skill) / "SKILL.md"
+            if path.is_file():
+                yield Component(plugin, "skill", path)
+        for path in _md_files(directory / "commands"):
+            yield Component(plugin, "command", path)
+        for path in _md_files(directory / "agents"):
+            yield Component(plugin, "agent", path)
+
+
+def _scalar(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def parse_frontmatter(text: str) -> Frontmatter | None:
+    """Parse the frontmatter at the top of a markdown file.
+
+    Returns None when the file has no frontmatter. Supports plain and quoted
+    scalars, inline ``[a, b]`` lists, ``- item`` block lists and indented
+    ``|``/``>`` block scalars.
+    """
+    lines = text.split("\n")
+    if not lines or lines[0].rstrip() != "---":
+        return None
+    fm = Frontmatter()
+    key: str | None = None
+    block: list[str] | None = None
+    # "\n" for "|" literal blocks, " " for ">" folded ones
+    joiner = "\n"
+
+    for num, line in enumerate(lines[1:], start=2):
+        if line.rstrip() == "---":
+            fm.end = num
+            break
+        if key is not None and (line.startswith((" ", "\t")) or not line.strip()):
+            # Continuation of the previous key
+            stripped = line.strip()
+            if block is not None:
+                block.append(stripped)
+            elif stripped.startswith("- "):
+                items = fm.fields.get(key)
+                if not isinstance(items, list):
+                    items = fm.fields[key] = []
+                items.append(_scalar(stripped[2:]))
+            elif stripped:
+                fm.fields[key] = f"{fm.fields[key]} {stripped}".strip()
+            continue
+
+        if block is not None:
+            fm.fields[key] = joiner.join(block).strip()
+            block = None
+        match = KEY_RE.match(line)
+        if not match:
+            fm.errors.append((num, f"Expected 'key: value': {line.strip()[:40]}"))
+            key = None
+            continue
+        key, value = match.group(1), match.group(2).strip()
+        if key in fm.fields:
+            fm.errors.append((num, f"Duplicate key '{key}'"))
+        fm.lines[key] = num
+        if value in ("|", ">", "|-", ">-"):
+            block = []
+            joiner = "\n" if value[0] == "|" else " "
+            fm.fields[key] = ""
+        elif value.startswith("[") and value.endswith("]"):
+            fm.fields[key] = [_scalar(v) for v in value[1:-1].split(",") if v.strip()]
+        else:
+            fm.fields[key] = _scalar(value)
+    else:
+        fm.errors.append((1, "Frontmatter is not closed with '---'"))
+
+    if block is not None:
+        fm.fields[key] = joiner.join(block).strip()
+    return fm
+
+
+def first_paragraph_line(text: str, start: int = 0) -> str:
+    """Return the first non-empty, non-heading line after ``start`` lines."""
+    for line in text.split("\n")[start:]:
+        stripped = line.strip()
+        if stripped and not stripped.startswith(("#", "---", "<!--")):
+            return stripped
+    return ""
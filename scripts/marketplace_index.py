@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Search the skills, commands and agents of the marketplace.
+
+The frontmatter of every component is parsed once into a compact JSON index
+with an inverted keyword index, cached under ~/.cache. On later runs only
+files whose mtime or size changed are re-read, so a lookup costs a stat per
+file instead of reading the plugin trees. English text is indexed by word
+and Japanese by character bigrams, so queries match descriptions in either
+language.
+
+Usage:
+    python scripts/marketplace_index.py スライド 作成
+    python scripts/marketplace_index.py "srt subtitle" --kind skill
+    python scripts/marketplace_index.py --list --json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+
+from marketplace import (
+    KINDS,
+    ROOT,
+    Component,
+    cache_path,
+    first_paragraph_line,
+    iter_components,
+    parse_frontmatter,
+)
+
+# Bump when the entry or token format changes so old caches are rebuilt
+INDEX_VERSION = 1
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can for from if in into is it of on or the this "
+    "to use used when with you your".split()
+)
+# ASCII words, or runs of kana and kanji (after NFKC normalization)
+TOKEN_RE = re.compile(r"[a-z0-9]+|[぀-ヿ㐀-䶿一-鿿]+")
+# Indexed text and its weight in the score
+WEIGHTS = {"name": 3, "plugin": 1, "description": 1, "argument-hint": 1}
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into words (English) and character bigrams (Japanese)."""
+    tokens = []
+    for run in TOKEN_RE.findall(unicodedata.normalize("NFKC", text).lower()):
+        if run.isascii():
+            if len(run) > 1 and run not in STOPWORDS:
+                tokens.append(run)
+        elif len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def parse_entry(component: Component, stat: os.stat_result) -> dict:
+    """Read one component file into an index entry."""
+    text = component.path.read_text(encoding="utf-8")
+    fm = parse_frontmatter(text)
+    fields = fm.fields if fm is not None else {}
+    description = fields.get("description")
+    if not isinstance(description, str) or not description:
+        # Commands without frontmatter are described by their first line
+        description = first_paragraph_line(text, fm.end if fm else 0)
+    name = fields.get("name")
+    return {
+        "plugin": component.plugin,
+        "kind": component.kind,
+        "name": name if isinstance(name, str) and name else component.default_name,
+        "description": description,
+        "path": str(component.path),
+        "fields": fields,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }
+
+
+def build_postings(entries: list[dict]) -> dict[str, list[list[int]]]:
+    """Map each token to [entry index, weight] pairs."""
+    postings: dict[str, dict[int, int]] = defaultdict(dict)
+    for i, entry in enumerate(entries):
+        for key, weight in WEIGHTS.items():
+            value = entry["fields"].get(key) if key == "argument-hint" else entry[key]
+            if not isinstance(value, str):
+                continue
+            for token in set(tokenize(value)):
+                postings[token][i] = postings[token].get(i, 0) + weight
+    return {token: sorted(hits.items()) for token, hits in postings.items()}
+
+
+class MarketplaceIndex:
+    """Entries plus the inverted index over their names and descriptions."""
+
+    def __init__(self, entries: list[dict], postings: dict[str, list[list[int]]]):
+        self.entries = entries
+        self.postings = postings
+
+    @classmethod
+    def load(
+        cls, root: Path = ROOT, cache_file: Path | None = None, rebuild: bool = False
+    ) -> "MarketplaceIndex":
+        """Load the cached index, re-parsing files whose mtime or size changed."""
+        cache_file = cache_file or cache_path("index", root)
+        cached_entries, cached_postings = [], None
+        if not rebuild:
+            try:
+                data = json.loads(cache_file.read_text(encoding="utf-8"))
+                if data.get("version") == INDEX_VERSION:
+                    cached_entries, cached_postings = data["entries"], data["postings"]
+            except (OSError, ValueError, KeyError):
+                pass
+        cached = {entry["path"]: entry for entry in cached_entries}
+
+        entries = []
+        changed = False
+        for component in iter_components(root):
+            stat = component.path.stat()
+            entry = cached.get(str(component.path))
+            if (
+                entry is None
+                or entry["mtime_ns"] != stat.st_mtime_ns
+                or entry["size"] != stat.st_size
+                or entry["plugin"] != component.plugin
+            ):
+                entry = parse_entry(component, stat)
+                changed = True
+            entries.append(entry)
+
+        # Postings refer to entries by position, so reuse them only for the same
+        # files in the same order
+        same_files = [e["path"] for e in entries] == [e["path"] for e in cached_entries]
+        if not changed and cached_postings is not None and same_files:
+            return cls(entries, cached_postings)
+        index = cls(entries, build_postings(entries))
+        index.save(cache_file)
+        return index
+
+    def save(self, path: Path) -> None:
+        """Write the index atomically; a failed write only costs a rebuild."""
+        data = {
+            "version": INDEX_VERSION,
+            "entries": self.entries,
+            "postings": self.postings,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(
+                prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+                os.replace(tmp_name, path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError:
+            pass
+
+    def search(
+        self, query: str, kind: str | None = None, limit: int = 10
+    ) -> list[tuple[int, dict]]:
+        """Return (score, entry) pairs, best first.
+
+        Entries matching more distinct query tokens rank first, then by the
+        summed weights of the matches.
+        """
+        matched: dict[int, int] = defaultdict(int)
+        scores: dict[int, int] = defaultdict(int)
+        for token in set(tokenize(query)):
+            for i, weight in self.postings.get(token, ()):
+                matched[i] += 1
+                scores[i] += weight
+        ranked = sorted(
+            (i for i in scores if kind is None or self.entries[i]["kind"] == kind),
+            key=lambda i: (-matched[i], -scores[i], self.entries[i]["name"]),
+        )
+        return [(scores[i], self.entries[i]) for i in ranked[:limit]]
+
+
+def _print_entry(entry: dict, score: int | None = None) -> None:
+    prefix = f"[{score:>3}] " if score is not None else ""
+    print(f"{prefix}{entry['kind']:<7} {entry['plugin']}:{entry['name']}")
+    print(f"        {entry['path']}")
+    description = entry["description"]
+    if len(description) > 100:
+        description = description[:100] + "..."
+    print(f"        {description}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Search skills, commands and agents in the marketplace."
+    )
+    parser.add_argument("query", nargs="*", help="keywords (Japanese or English)")
+    parser.add_argument("--kind", choices=KINDS, help="only this component type")
+    parser.add_argument("--list", action="store_true", help="list every component")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="print JSON")
+    parser.add_argument(
+        "--root", type=Path, default=ROOT, help="marketplace root (default: this repo)"
+    )
+    parser.add_argument("--cache-file", type=Path, default=None)
+    parser.add_argument(
+        "--rebuild", action="store_true", help="ignore the cache and re-read every file"
+    )
+    args = parser.parse_args()
+    if not args.query and not args.list:
+        parser.error("give a query or --list")
+
+    try:
+        index = MarketplaceIndex.load(args.root, args.cache_file, args.rebuild)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: Cannot index {args.root}: {e}")
+        return 1
+
+    if args.list:
+        results = [
+            (None, entry)
+            for entry in index.entries
+            if args.kind is None or entry["kind"] == args.kind
+        ]
+    else:
+        results = index.search(" ".join(args.query), args.kind, args.limit)
+
+    if args.json:
+        print(
+            json.dumps(
+                [{**entry, "score": score} for score, entry in results],
+                ensure_ascii=False,
+                indent=2,
+            )
+        )
+    elif not results:
+        print("No matching components")
+    else:
+        for score, entry in results:
+            _print_entry(entry, score)
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
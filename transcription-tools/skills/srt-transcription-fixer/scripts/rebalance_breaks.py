@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+字幕の区切り位置を調整するスクリプト
+
+前後の字幕にまたがって分断された単語・専門用語を検出し、数文字を隣の字幕へ
+移動して自然な区切りにする。番号・タイムコードは変更しない。
+
+区切りの判定:
+    - 用語集の語（transcription-fixer の変換パターンの正しい表記、--glossary の用語）の途中
+      （Claude | Code のように語の間の空白で分かれたものも含む）
+    - カタカナ語（フロントエ|ンド）の途中
+    - 小さい仮名・長音・句読点で始まる字幕（|ックエンド、|、厄介なことに）
+    - 漢字と送り仮名、活用語尾の間（混在さ|せる、指定していない|ので）
+    自然な区切り（句読点の後、助詞の後で漢字・カタカナ・英字が始まる位置）は変更しない。
+    英数字で終わる行と英数字で始まる行の境界は、英語の語の間の空白として扱う。
+    移動した文字と一緒に空白を付け直し、英数字の語の途中では区切らない。
+
+Usage:
+    python rebalance_breaks.py input.srt [output.srt]
+    python rebalance_breaks.py input.srt --dry-run
+    python rebalance_breaks.py input.srt --glossary terms.tsv --max-move 10
+
+    output.srtを省略すると、input.srtを上書きします。
+"""
+
+import argparse
+import os
+import re
+import sys
+from pathlib import Path
+
+import srt
+from text_rules import load_glossary, load_skill_glossary
+
+DEFAULT_MAX_MOVE = 10
+
+JAPANESE_RE = re.compile(r'[぀-ヿ㐀-鿿]')
+PARTICLES = set('はがをにでとやのもへ')
+SMALL_KANA = set('ぁぃぅぇぉっゃゅょゎァィゥェォッャュョヮヵヶー')
+PUNCTUATION = set('、。，．！？!?）」』】')
+# ひらがな同士の境界で、次の字幕の先頭に来ると不自然な活用語尾・接続助詞
+CONTINUATIONS = (
+    'て', 'せ', 'れ', 'ん', 'ので', 'のに', 'から', 'けど', 'けれど',
+    'ます', 'ません', 'ない', 'いる', 'いた', 'まれ', 'られ', 'させ',
+)
+
+# 区切り位置の評価値（0未満は不自然な区切り）
+SCORE_AFTER_PUNCTUATION = 3
+SCORE_BUNSETSU = 2
+SCORE_NEUTRAL = 0
+SCORE_CONTINUATION = -1
+SCORE_OKURIGANA = -2
+SCORE_WORD_SPLIT = -3
+SCORE_TERM_SPLIT = -5
+# 移動する文字数あたりの減点（同程度の区切りなら移動の少ない方を選ぶ）
+MOVE_PENALTY = 0.1
+
+
+def _char_class(char: str) -> str:
+    """文字種: H=ひらがな K=カタカナ C=漢字 A=英数字・記号 P=句読点 S=空白 O=その他"""
+    if char in PUNCTUATION:
+        return 'P'
+    if char.isspace():
+        return 'S'
+    if '぀' <= char <= 'ゟ':
+        return 'H'
+    if '゠' <= char <= 'ヿ':
+        return 'K'
+    if '㐀' <= char <= '鿿' or char in '々〆':
+        return 'C'
+    if char.isascii() and (char.isalnum() or char in '._/-#@'):
+        return 'A'
+    return 'O'
+
+
+def break_score(text: str, pos: int) -> int:
+    """text の pos 文字目の前で字幕を区切るときの自然さ"""
+    left, right = text[pos - 1], text[pos]
+    lc, rc = _char_class(left), _char_class(right)
+    if lc == 'P':
+        return SCORE_AFTER_PUNCTUATION
+    if rc == 'P' or right in SMALL_KANA:
+        return SCORE_WORD_SPLIT
+    if lc == 'S' or rc == 'S':
+        return SCORE_BUNSETSU
+    if lc == rc and lc in 'AK':
+        return SCORE_WORD_SPLIT
+    if lc == 'H' and rc in 'CKA':
+        return SCORE_BUNSETSU
+    if lc in 'CKA' and rc == 'H':
+        return SCORE_OKURIGANA
+    if lc == 'H' and rc == 'H':
+        if left not in PARTICLES and text.startswith(CONTINUATIONS, pos):
+            return SCORE_CONTINUATION
+        return SCORE_NEUTRAL
+    if lc == rc == 'C':
+        return SCORE_CONTINUATION
+    return SCORE_NEUTRAL
+
+
+def load_terms(glossary: str | Path | None = None) -> list[str]:
+    """
+    分断してはいけない用語を集める
+
+    transcription-fixer の変換パターンの正しい表記と、--glossary の用語集の両方を使う。
+    """
+    terms: set[str] = set()
+    mapping, _ = load_skill_glossary()
+    terms.update(mapping.values())
+    if glossary is not None:
+        mapping = load_glossary(glossary)
+        terms.update(mapping.values())
+    # 1文字の語は区切りの判定に影響しない
+    return sorted((t for t in terms if len(t) > 1), key=len, reverse=True)
+
+
+class Rebalancer:
+    """隣り合う字幕の境界を自然な位置に移動する"""
+
+    def __init__(self, terms: list[str] | None = None, max_move: int = DEFAULT_MAX_MOVE):
+        self.max_move = max_move
+        self.terms_re = re.compile('|'.join(map(re.escape, terms))) if terms else None
+        self.longest_term = max(map(len, terms), default=0) if terms else 0
+
+    def _term_spans(self, window: str) -> list[tuple[int, int]]:
+        if self.terms_re is None:
+            return []
+        return [m.span() for m in self.terms_re.finditer(window)]
+
+    def _score(self, window: str, pos: int, spans: list[tuple[int, int]]) -> int:
+        for start, end in spans:
+            if start < pos < end:
+                return SCORE_TERM_SPLIT
+        return break_score(window, pos)
+
+    def rebalance(self, prev: srt.Cue, cue: srt.Cue) -> str | None:
+        """
+        prev の最終行と cue の先頭行の境界を調整する
+
+        Returns:
+            移動した場合は修正内容の説明、移動しなかった場合は None
+        """
+        if not prev.lines or not cue.lines:
+            return None
+        left, right = prev.lines[-1], cue.lines[0]
+        if not left or not right or not JAPANESE_RE.search(left + right):
+            return None
+
+        # 境界の前後だけを見る（用語が境界をまたぐ分の余裕をとる）
+        width = self.max_move + self.longest_term
+        head, tail = left[:-width], left[-width:]
+        # 英数字同士の境界は語の間の空白（"API | Gateway" は "API Gateway"）
+        sep = ' ' if _char_class(left[-1]) == _char_class(right[0]) == 'A' else ''
+        window = tail + sep + right[:width]
+        boundary = len(tail)
+        spans = self._term_spans(window)
+
+        current = self._score(window, boundary, spans)
+        if current >= 0:
+            return None
+
+        best_pos, best_value = None, float(current)
+        # 前の字幕・次の字幕とも1文字以上は残す。同点なら範囲の先頭側
+        # （分断された語頭を次の字幕へ送る方）を優先する
+        lo = max(boundary - self.max_move, 1)
+        hi = min(boundary + self.max_move, len(window) - 1)
+        for pos in range(lo, hi + 1):
+            if pos == boundary:
+                continue
+            if _char_class(window[pos - 1]) == _char_class(window[pos]) == 'A':
+                # 英数字の語の途中では区切らない
+                continue
+            value = self._score(window, pos, spans) - MOVE_PENALTY * abs(pos - boundary)
+            if value > best_value:
+                best_pos, best_value = pos, value
+
+        if best_pos is None:
+            return None
+
+        joined = head + window + right[width:]
+        cut = len(head) + best_pos
+        new_left, new_right = joined[:cut].rstrip(), joined[cut:].lstrip()
+        if not new_left or not new_right:
+            return None
+        prev.lines[-1], cue.lines[0] = new_left, new_right
+        return f"{left} | {right} → {new_left} | {new_right}"
+
+
+def process_srt(
+    input_path: str,
+    output_path: str | None = None,
+    rebalancer: Rebalancer | None = None,
+    max_log: int | None = None,
+    dry_run: bool = False,
+) -> tuple[int, list[str]]:
+    """
+    SRTファイルの字幕の区切り位置を調整
+
+    直前の字幕1件だけを保持してストリーム処理し、一時ファイル経由でアトミックに書き出す。
+    dry_run のときはファイルを書き換えない。
+
+    Returns:
+        tuple: (調整した境界の数, 修正内容のリスト)
+    """
+    rebalancer = rebalancer or Rebalancer(load_terms())
+    input_file = Path(input_path)
+    if not input_file.exists():
+        raise FileNotFoundError(f"ファイルが見つかりません: {input_path}")
+
+    output_file = Path(output_path) if output_path else input_file
+    modified_count = 0
+    modifications = []
+
+    if dry_run:
+        output = open(os.devnull, 'w', encoding='utf-8')
+    else:
+        output = srt.atomic_write(output_file)
+    with open(input_file, encoding='utf-8', newline='') as src, output as dst:
+        fmt = srt.SrtFormat()
+        writer = srt.SrtWriter(dst, fmt)
+        prev = None
+        for cue in srt.iter_cues(src, fmt):
+            if prev is not None:
+                change = rebalancer.rebalance(prev, cue)
+                if change is not None:
+                    modified_count += 1
+                    if max_log is None or len(modifications) < max_log:
+                        modifications.append(f"  #{prev.index}: {change}")
+                writer.write(prev)
+            prev = cue
+        if prev is not None:
+            writer.write(prev)
+        writer.close()
+
+    return modified_count, modifications
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='前後の字幕にまたがって分断された単語を検出し、区切り位置を調整します',
+        usage=__doc__.split('Usage:\n', 1)[1].split('\n\n', 1)[0],
+    )
+    parser.add_argument('input', help='SRTファイル')
+    parser.add_argument('output', nargs='?', help='出力ファイル（省略時は上書き）')
+    parser.add_argument('--glossary', type=Path, help='分断してはいけない用語の用語集ファイル')
+    parser.add_argument(
+        '--max-move',
+        type=int,
+        default=DEFAULT_MAX_MOVE,
+        help=f'1つの境界で移動する最大文字数（既定: {DEFAULT_MAX_MOVE}）',
+    )
+    parser.add_argument('--dry-run', action='store_true', help='書き換えずに調整内容だけ表示')
+    args = parser.parse_args()
+
+    try:
+        rebalancer = Rebalancer(load_terms(args.glossary), args.max_move)
+        count, mods = process_srt(
+            args.input, args.output, rebalancer, max_log=20, dry_run=args.dry_run
+        )
+    except FileNotFoundError as e:
+        print(f"❌ エラー: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ 予期せぬエラー: {e}")
+        sys.exit(1)
+
+    if count > 0:
+        verb = '調整できます' if args.dry_run else '調整しました'
+        print(f"✅ {count}箇所の区切り位置を{verb}")
+        for mod in mods:
+            print(mod)
+        if count > len(mods):
+            print(f"  ... 他 {count - len(mods)} 件")
+    else:
+        print("✅ 調整すべき区切り位置はありませんでした")
+
+
+if __name__ == "__main__":
+    main()
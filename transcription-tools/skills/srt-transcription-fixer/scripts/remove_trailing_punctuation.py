@@ -4,102 +4,309 @@ SRTファイルの各字幕行末から句読点（、。）を削除するス
 
 Usage:
     python remove_trailing_punctuation.py input.srt [output.srt]
+    python remove_trailing_punctuation.py season1/ season2/ [--jobs N] [--output-dir DIR]
+    python remove_trailing_punctuation.py input.srt --rules trailing-punctuation,filler,glossary --glossary terms.tsv
 
     output.srtを省略すると、input.srtを上書きします。
+    ディレクトリや3つ以上のファイルを渡すと一括処理モードになり、
+    各ファイルを上書き（--output-dir 指定時はそのディレクトリへ出力）します。
+    --rules で複数の修正ルール（text_rules.py）を1回の読み書きでまとめて適用します。
+    --glossary だけを指定すると、用語集の置換と行末句読点の削除を適用します。
 """
 
+import argparse
+import os
 import sys
-import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import srt
+from text_rules import TRAILING_PUNCTUATION_RE, Pipeline, RuleStats, RULES
+
 
 def remove_trailing_punctuation(text: str) -> str:
     """行末の句読点（、。）を削除"""
-    return re.sub(r'[、。]+$', '', text)
+    return TRAILING_PUNCTUATION_RE.sub('', text)
 
 
-def process_srt(input_path: str, output_path: str | None = None) -> tuple[int, list[str]]:
+def process_srt(
+    input_path: str,
+    output_path: str | None = None,
+    max_log: int | None = None,
+    pipeline: Pipeline | None = None,
+) -> tuple[int, list[str]]:
     """
     SRTファイルを処理し、各字幕の行末句読点を削除
 
+    pipeline を渡すと、行末句読点の削除の代わりにそのルール群を1回の走査で適用する。
+    その場合、修正で空になった行は削除し、テキストが無くなった字幕は削除して番号を詰める。
+    pipeline を渡さない場合は、すべての字幕と番号をそのまま残す。
+
+    入力を字幕単位でストリーム処理して一時ファイルに書き出し、
+    最後にアトミックに置き換えるため、メモリ使用量はファイルサイズに依存しない。
+    改行コード（CRLF/LF）とBOM、字幕として解釈できない行は入力のまま保持する
+    （改行コードが混在している場合は最初の行の改行コードに統一し、警告を出す）。
+
+    Args:
+        max_log: 修正内容リストに保持する最大件数（Noneなら無制限）
+
     Returns:
         tuple: (修正した行数, 修正内容のリスト)
     """
+    transform = pipeline.apply if pipeline is not None else remove_trailing_punctuation
+    # 行・字幕の削除はルール指定時のみ（既定では字幕の番号を変えない）
+    prune = pipeline is not None
     input_file = Path(input_path)
     if not input_file.exists():
         raise FileNotFoundError(f"ファイルが見つかりません: {input_path}")
 
-    content = input_file.read_text(encoding='utf-8')
-    lines = content.split('\n')
-
+    output_file = Path(output_path) if output_path else input_file
     modified_count = 0
     modifications = []
-    result_lines = []
 
-    # SRT形式: 番号、タイムコード、テキスト、空行の繰り返し
-    i = 0
-    while i < len(lines):
-        line = lines[i]
+    with (
+        open(input_file, encoding='utf-8', newline='') as src,
+        srt.atomic_write(output_file) as dst,
+    ):
+        fmt = srt.SrtFormat()
+        writer = srt.SrtWriter(dst, fmt)
+        dropped = 0
+        for cue in srt.iter_cues(src, fmt):
+            # タイムコードはそのまま、テキスト行のみ処理
+            lines = []
+            for original in cue.lines:
+                modified = transform(original)
 
-        # 番号行（数字のみ）
-        if line.strip().isdigit():
-            result_lines.append(line)
-            i += 1
+                if original != modified:
+                    modified_count += 1
+                    if max_log is None or len(modifications) < max_log:
+                        removed = prune and not modified
+                        modifications.append(
+                            f"  {original} → {'（行を削除）' if removed else modified}"
+                        )
+                # フィラーだけの行など、修正で空になった行は削除する
+                if modified or not original or not prune:
+                    lines.append(modified)
 
-            # タイムコード行
-            if i < len(lines):
-                result_lines.append(lines[i])
-                i += 1
+            if cue.lines and not lines:
+                # テキストが無くなった字幕は削除し、以降の番号を詰める
+                dropped += 1
+                writer.drop(cue)
+                continue
+            cue.lines = lines
+            cue.index -= dropped
+            writer.write(cue)
+        writer.close()
 
-            # テキスト行（空行まで）
-            while i < len(lines) and lines[i].strip():
-                original = lines[i]
-                modified = remove_trailing_punctuation(original)
+    return modified_count, modifications
 
-                if original != modified:
-                    modified_count += 1
-                    modifications.append(f"  {original} → {modified}")
 
-                result_lines.append(modified)
-                i += 1
+def collect_srt_files(paths: list[str]) -> list[tuple[Path, Path]]:
+    """
+    ファイル・ディレクトリから処理対象のSRTファイルを集める
+
+    Returns:
+        list: (SRTファイル, 出力先の基準ディレクトリ) のリスト。
+              ディレクトリ指定時は相対パスを保って出力するため、基準はそのディレクトリ。
+    """
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend((f, path) for f in sorted(path.rglob('*.srt')) if f.is_file())
         else:
-            # 空行やその他
-            result_lines.append(line)
-            i += 1
+            files.append((path, path.parent))
+    return files
 
-    # 出力
-    output_file = Path(output_path) if output_path else input_file
-    output_file.write_text('\n'.join(result_lines), encoding='utf-8')
 
-    return modified_count, modifications
+def _process_one(
+    task: tuple[Path, Path | None, Pipeline | None],
+) -> tuple[Path, int, str | None, list[RuleStats]]:
+    """
+    ワーカープロセスで1ファイルを処理（例外は文字列で返す）
 
+    同じチャンクのタスクは1つの pipeline を共有して受け取るため、
+    ファイルごとの集計を返せるよう、ルールを共有した新しい Pipeline で処理する。
+    """
+    input_file, output_file, pipeline = task
+    if pipeline is not None:
+        pipeline = Pipeline(pipeline.rules)
+    try:
+        count, _ = process_srt(
+            str(input_file), output_file and str(output_file), max_log=0, pipeline=pipeline
+        )
+        return input_file, count, None, pipeline.stats if pipeline else []
+    except Exception as e:
+        return input_file, 0, str(e), []
 
-def main():
-    if len(sys.argv) < 2:
-        print(__doc__)
-        sys.exit(1)
 
-    input_path = sys.argv[1]
-    output_path = sys.argv[2] if len(sys.argv) > 2 else None
+def process_batch(
+    files: list[tuple[Path, Path]],
+    output_dir: Path | None = None,
+    jobs: int | None = None,
+    pipeline: Pipeline | None = None,
+) -> list[tuple[Path, int, str | None]]:
+    """
+    複数のSRTファイルをプロセスプールで処理
+
+    pipeline の集計は各ワーカーの結果を合算して pipeline.stats に反映する。
+
+    Returns:
+        list: (ファイル, 修正した行数, エラー内容) のリスト
+    """
+    tasks = []
+    for input_file, base in files:
+        output_file = None
+        if output_dir is not None:
+            output_file = output_dir / input_file.relative_to(base)
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+        tasks.append((input_file, output_file, pipeline))
+
+    jobs = jobs or os.cpu_count() or 1
+    results = []
+
+    def collect(outcomes) -> None:
+        for path, count, error, stats in outcomes:
+            if pipeline is not None:
+                pipeline.merge_stats(stats)
+            results.append((path, count, error))
 
+    if jobs <= 1 or len(tasks) <= 1:
+        collect(map(_process_one, tasks))
+        return results
+
+    chunksize = max(1, len(tasks) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+        collect(executor.map(_process_one, tasks, chunksize=chunksize))
+    return results
+
+
+def run_single(
+    input_path: str, output_path: str | None, pipeline: Pipeline | None = None
+) -> int:
+    """1ファイルを処理して修正内容を表示"""
     try:
-        count, mods = process_srt(input_path, output_path)
+        # 表示するのは最初の10件のみなので、それ以上は保持しない
+        count, mods = process_srt(input_path, output_path, max_log=10, pipeline=pipeline)
 
-        if count > 0:
+        if count > 0 and pipeline is not None:
+            print(f"✅ {count}行を修正しました")
+            for mod in mods:
+                print(mod)
+            if count > len(mods):
+                print(f"  ... 他 {count - len(mods)} 件")
+        elif count > 0:
             print(f"✅ {count}箇所の行末句読点を削除しました")
-            for mod in mods[:10]:  # 最初の10件を表示
+            for mod in mods:
                 print(mod)
-            if len(mods) > 10:
-                print(f"  ... 他 {len(mods) - 10} 件")
+            if count > len(mods):
+                print(f"  ... 他 {count - len(mods)} 件")
+        elif pipeline is not None:
+            print("✅ 修正すべき箇所はありませんでした")
         else:
             print("✅ 削除すべき行末句読点はありませんでした")
 
     except FileNotFoundError as e:
         print(f"❌ エラー: {e}")
-        sys.exit(1)
+        return 1
     except Exception as e:
         print(f"❌ 予期せぬエラー: {e}")
-        sys.exit(1)
+        return 1
+    return 0
+
+
+def run_batch(
+    paths: list[str],
+    output_dir: Path | None,
+    jobs: int | None,
+    pipeline: Pipeline | None = None,
+) -> int:
+    """複数ファイルを一括処理して集計結果を表示"""
+    files = collect_srt_files(paths)
+    if not files:
+        print("❌ エラー: 処理対象のSRTファイルが見つかりません")
+        return 1
+
+    results = process_batch(files, output_dir, jobs, pipeline)
+
+    total = 0
+    modified_files = 0
+    errors = []
+    for path, count, error in results:
+        if error is not None:
+            errors.append((path, error))
+            continue
+        total += count
+        if count > 0:
+            modified_files += 1
+            print(f"  {path}: {count}箇所")
+
+    summary = f"計 {total}行" if pipeline else f"計 {total}箇所の行末句読点を削除"
+    print(
+        f"✅ {len(results) - len(errors)}ファイルを処理しました"
+        f"（修正 {modified_files}ファイル、{summary}）"
+    )
+    for path, error in errors:
+        print(f"❌ エラー: {path}: {error}")
+    return 1 if errors else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='SRTファイルの各字幕行末から句読点（、。）を削除します',
+        usage=__doc__.split('Usage:\n', 1)[1].split('\n\n', 1)[0],
+    )
+    parser.add_argument('paths', nargs='+', help='SRTファイルまたはディレクトリ')
+    parser.add_argument('-o', '--output-dir', type=Path, help='一括処理時の出力先ディレクトリ')
+    parser.add_argument('-j', '--jobs', type=int, help='並列プロセス数（既定: CPU数）')
+    parser.add_argument(
+        '--in-place', action='store_true', help='2ファイル指定時も両方を上書き処理する'
+    )
+    parser.add_argument(
+        '--rules',
+        help=f"適用するルールをカンマ区切りで指定（{', '.join(RULES)}）",
+    )
+    parser.add_argument(
+        '--glossary',
+        type=Path,
+        help='glossary ルールの用語集ファイル（--rules 省略時は glossary,trailing-punctuation を適用）',
+    )
+    args = parser.parse_args()
+
+    pipeline = None
+    names = None
+    if args.rules:
+        names = [name.strip() for name in args.rules.split(',') if name.strip()]
+        if args.glossary is not None and 'glossary' not in names:
+            print("❌ エラー: --glossary を使うには --rules に glossary を含めてください")
+            sys.exit(1)
+    elif args.glossary is not None:
+        # --glossary だけの指定は、用語集の置換と行末句読点の削除
+        names = ['glossary', 'trailing-punctuation']
+    if names is not None:
+        try:
+            pipeline = Pipeline.from_names(names, glossary=args.glossary)
+        except (ValueError, OSError) as e:
+            print(f"❌ エラー: {e}")
+            sys.exit(1)
+
+    paths = args.paths
+    # 従来の `input.srt [output.srt]` 形式
+    legacy = (
+        args.output_dir is None
+        and not args.in_place
+        and not Path(paths[0]).is_dir()
+        and (len(paths) == 1 or (len(paths) == 2 and not Path(paths[1]).is_dir()))
+    )
+    if legacy:
+        code = run_single(paths[0], paths[1] if len(paths) == 2 else None, pipeline)
+    else:
+        code = run_batch(paths, args.output_dir, args.jobs, pipeline)
+
+    if pipeline is not None:
+        print("ルール別の集計:")
+        for line in pipeline.report():
+            print(line)
+    sys.exit(code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+SRT字幕の共通パーサー／シリアライザー
+
+transcription-tools の各スクリプトから共有して使うモジュール。
+
+- Cue: タイムスタンプをミリ秒の整数で持つ `__slots__` の軽量な字幕型
+- iter_cues: ファイルハンドルから字幕を1件ずつ読み出す（CRLF、BOM、空行抜けに対応）
+- SrtWriter: 読み込んだ形式（改行コード、BOM、末尾の空行）を保ったまま書き出す
+- atomic_write: 一時ファイルに書き出してから置き換える（各スクリプトの上書き保存）
+
+字幕として解釈できない行（最初の字幕より前の行、タイムコードが壊れた字幕など）は
+そのまま保持するため、読み込んで書き出すとバイト単位で元に戻る。
+改行コードが混在していて元に戻せない入力は、最初の行の改行コードに統一して
+書き出し、警告（UserWarning）を出す。
+"""
+
+import io
+import os
+import re
+import shutil
+import tempfile
+import warnings
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, TextIO
+
+BOM = '\ufeff'
+
+TIMING_RE = re.compile(
+    r'^\s*(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})\s*-->\s*'
+    r'(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})(.*)$'
+)
+# format_timestamp の出力と同じ書式のタイムコード（元の行を保持しなくてよい）
+CANONICAL_TIMING_RE = re.compile(
+    r'\d\d:[0-5]\d:[0-5]\d,\d{3} --> \d\d:[0-5]\d:[0-5]\d,\d{3}'
+)
+
+
+class Cue:
+    """字幕1件（タイムスタンプはミリ秒）"""
+
+    __slots__ = ('index', 'start', 'end', 'lines', 'settings', 'source')
+
+    def __init__(
+        self,
+        index: int,
+        start: int,
+        end: int,
+        lines: list[str] | None = None,
+        settings: str = '',
+        source: tuple | None = None,
+    ):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.lines = lines if lines is not None else []
+        # タイムコード行の終了時刻より後ろ（位置指定など）
+        self.settings = settings
+        # 標準の書式で書き出すと元に戻らない字幕の元の行:
+        # (直前の字幕以外の行, 番号行, 番号, タイムコード行)
+        # 直前の行が標準の区切りなら None、番号行が無ければ番号行は None
+        self.source = source
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(self.lines)
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self.lines = value.split('\n') if value else []
+
+    @property
+    def duration(self) -> int:
+        return self.end - self.start
+
+    def timing_line(self) -> str:
+        return f"{format_timestamp(self.start)} --> {format_timestamp(self.end)}{self.settings}"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Cue):
+            return NotImplemented
+        return (
+            self.index == other.index
+            and self.start == other.start
+            and self.end == other.end
+            and self.lines == other.lines
+            and self.settings == other.settings
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"Cue({self.index}, {format_timestamp(self.start)}, "
+            f"{format_timestamp(self.end)}, {self.lines!r})"
+        )
+
+
+@dataclass
+class SrtFormat:
+    """読み込んだファイルの書式（書き出し時に再現する）"""
+
+    newline: str = '\n'
+    bom: bool = False
+    # 最終行が改行で終わっているか
+    final_newline: bool = True
+    # 最後の字幕の本文より後ろの行（空行・字幕として解釈できない行）
+    trailer: list[str] = field(default_factory=list)
+    # 改行コードが混在しておらず、元のバイト列に戻せるか
+    # （混在していても、ストリームで書き出すため newline は最初の行のまま）
+    round_trip: bool = True
+
+
+def parse_timestamp(value: str) -> int:
+    """'HH:MM:SS,mmm' をミリ秒に変換"""
+    match = re.fullmatch(r'\s*(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})\s*', value)
+    if not match:
+        raise ValueError(f"不正なタイムスタンプです: {value!r}")
+    return _to_ms(*match.groups())
+
+
+def format_timestamp(ms: int) -> str:
+    """ミリ秒を 'HH:MM:SS,mmm' に変換"""
+    seconds, millis = divmod(ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{millis:03d}"
+
+
+def _to_ms(h: str, m: str, s: str, frac: str) -> int:
+    # '5' は 500ms、'05' は 50ms として扱う
+    return ((int(h) * 60 + int(m)) * 60 + int(s)) * 1000 + int(frac.ljust(3, '0'))
+
+
+def _parse_timing(line: str) -> tuple[int, int, str] | None:
+    match = TIMING_RE.match(line)
+    if not match:
+        return None
+    g = match.groups()
+    return _to_ms(*g[0:4]), _to_ms(*g[4:8]), g[8].rstrip()
+
+
+def iter_cues(fh: TextIO, fmt: SrtFormat | None = None) -> Iterator[Cue]:
+    """
+    ファイルハンドルから字幕を1件ずつ読み出す
+
+    改行コードを判定できるよう `open(..., newline='')` で開いたハンドルを渡す。
+    fmt を渡すと、読み込んだ書式（改行コード、BOM、末尾の行）を記録する。
+    番号行が無い字幕、字幕間の空行抜けも許容する。
+    字幕の本文は空行までで、空行の後に続く字幕以外の行（タイムコードが壊れた
+    字幕など）は本文に含めず、次の字幕の source（最後なら fmt.trailer）に
+    そのまま残す。字幕は次の字幕が始まった時点（またはファイル末尾）で返す。
+    """
+    fmt = fmt if fmt is not None else SrtFormat()
+    lines = _iter_lines(fh, fmt)
+    pending: str | None = None
+    cue: Cue | None = None
+    # 直前の字幕の本文より後ろ（最初の字幕の前）の行
+    gap: list[str] = []
+    in_text = False
+    next_index = 1
+
+    while True:
+        if pending is not None:
+            line, pending = pending, None
+        else:
+            line = next(lines, None)
+        if line is None:
+            break
+
+        if not line.strip():
+            in_text = False
+            gap.append(line)
+            continue
+
+        # 番号行 + タイムコード行、またはタイムコード行のみで新しい字幕が始まる
+        timing_line = line
+        timing = _parse_timing(line)
+        index_line = None
+        if timing is None and line.strip().isdigit():
+            following = next(lines, None)
+            timing = _parse_timing(following) if following is not None else None
+            if timing is None:
+                pending = following
+            else:
+                index_line, timing_line = line, following
+
+        if timing is not None:
+            if cue is not None:
+                yield cue
+            start, end, settings = timing
+            index = int(index_line) if index_line is not None else next_index
+            standard_gap = gap == ([''] if cue is not None else [])
+            source = None
+            if (
+                not standard_gap
+                or index_line != str(index)
+                or not CANONICAL_TIMING_RE.match(timing_line)
+                or timing_line[29:] != settings
+            ):
+                source = (None if standard_gap else gap, index_line, index, timing_line)
+            cue = Cue(index, start, end, [], settings, source)
+            next_index = index + 1
+            gap = []
+            in_text = True
+        elif in_text:
+            cue.lines.append(line)
+        else:
+            # 字幕として解釈できない行は、次の字幕の前（またはファイル末尾）に残す
+            gap.append(line)
+
+    if cue is not None:
+        yield cue
+    fmt.trailer = gap
+
+
+def _iter_lines(fh: TextIO, fmt: SrtFormat) -> Iterator[str]:
+    """改行コードを除いた行を返しつつ、書式を記録する"""
+    first = True
+    for raw in fh:
+        if raw.endswith('\r\n'):
+            line, ending = raw[:-2], '\r\n'
+        elif raw.endswith('\n'):
+            line, ending = raw[:-1], '\n'
+        elif raw.endswith('\r'):
+            line, ending = raw[:-1], '\r'
+        else:
+            line, ending = raw, ''
+        if first:
+            first = False
+            if line.startswith(BOM):
+                fmt.bom = True
+                line = line[1:]
+            if ending:
+                fmt.newline = ending
+        elif ending and ending != fmt.newline:
+            fmt.round_trip = False
+        fmt.final_newline = bool(ending)
+        yield line
+
+
+class SrtWriter:
+    """字幕を1件ずつ書き出す"""
+
+    def __init__(self, fh: TextIO, fmt: SrtFormat | None = None):
+        self.fh = fh
+        self.fmt = fmt if fmt is not None else SrtFormat()
+        self.count = 0
+        self._started = False
+
+    def _line(self, line: str) -> None:
+        if self._started:
+            self.fh.write(self.fmt.newline + line)
+            return
+        self._started = True
+        self.fh.write(BOM + line if self.fmt.bom else line)
+
+    def write(self, cue: Cue) -> None:
+        if cue.source is None:
+            gap, index_line, timing_line = None, str(cue.index), cue.timing_line()
+        else:
+            gap, index_line, index, timing_line = cue.source
+            # 番号・タイムコードが変更されていなければ元の行をそのまま使う
+            if cue.index != index:
+                index_line = str(cue.index)
+            if _parse_timing(timing_line) != (cue.start, cue.end, cue.settings):
+                timing_line = cue.timing_line()
+        if gap is None:
+            # 前の字幕との区切りの空行
+            gap = [''] if self.count else []
+        for line in gap:
+            self._line(line)
+        if index_line is not None:
+            self._line(index_line)
+        self._line(timing_line)
+        for line in cue.lines:
+            self._line(line)
+        self.count += 1
+
+    def drop(self, cue: Cue) -> None:
+        """字幕を書き出さずに削除する（直前にある字幕以外の行は残す）"""
+        if cue.source is not None and cue.source[0] is not None:
+            for line in cue.source[0]:
+                self._line(line)
+
+    def write_all(self, cues: Iterable[Cue]) -> None:
+        for cue in cues:
+            self.write(cue)
+
+    def close(self) -> None:
+        """
+        最後の字幕の後ろの行と末尾の改行を書き出す（ハンドルは閉じない）
+
+        読み込んだ入力の改行コードが混在していた場合は、1種類に統一して
+        書き出したことを警告する。
+        """
+        if not self.fmt.round_trip:
+            name = {'\r\n': 'CRLF', '\n': 'LF', '\r': 'CR'}[self.fmt.newline]
+            warnings.warn(
+                f"改行コードが混在しているため、{name} に統一して書き出しました",
+                stacklevel=2,
+            )
+        for line in self.fmt.trailer:
+            self._line(line)
+        if self._started and self.fmt.final_newline:
+            self.fh.write(self.fmt.newline)
+
+
+def parse(text: str, fmt: SrtFormat | None = None) -> list[Cue]:
+    """文字列全体をパース"""
+    return list(iter_cues(io.StringIO(text, newline=''), fmt))
+
+
+def compose(cues: Iterable[Cue], fmt: SrtFormat | None = None) -> str:
+    """字幕のリストをSRT文字列に変換"""
+    buffer = io.StringIO()
+    writer = SrtWriter(buffer, fmt)
+    writer.write_all(cues)
+    writer.close()
+    return buffer.getvalue()
+
+
+def _copy_mode(target: Path, tmp_name: str) -> None:
+    """一時ファイルの権限を置き換え先に合わせる（新規作成時はumaskに従う）"""
+    if target.exists():
+        shutil.copymode(target, tmp_name)
+        return
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(tmp_name, 0o666 & ~umask)
+
+
+@contextmanager
+def atomic_write(path: str | Path, mode: str = 'w') -> Iterator[IO]:
+    """
+    path と同じディレクトリの一時ファイルに書き出し、ブロックを抜けたら置き換える
+
+    テキストモードは UTF-8・改行コードの変換なし（newline=''）で開く。
+    置き換え後の権限は元のファイルに合わせる。例外時は一時ファイルを削除し、
+    path は変更しない。
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        if 'b' in mode:
+            fh = os.fdopen(fd, mode)
+        else:
+            fh = os.fdopen(fd, mode, encoding='utf-8', newline='')
+        with fh:
+            yield fh
+        _copy_mode(path, tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+大きなSRTファイルのランダムアクセス用インデックス
+
+ファイルを mmap で開き、字幕ごとのバイトオフセットと開始・終了時刻（ミリ秒）を
+array で保持する（1件あたり32バイト）。時刻・字幕番号から二分探索で字幕を取り出し、
+字幕の範囲を差し替えるときも全体を再パースせず、変更点以降のバイトをそのまま写す。
+
+--save-index（または --build）を指定すると、インデックスを `<file>.srtidx` に
+サイドカーとして保存し、SRTファイルのサイズと更新時刻が一致する間は再利用する。
+既定ではサイドカーを読み書きしない。
+
+Usage:
+    python srt_index.py input.srt --at 01:23:45
+    python srt_index.py input.srt --cues 100 120
+    python srt_index.py input.srt --replace 100 120 fixed.srt
+    python srt_index.py input.srt --cues 100 120 --save-index
+    python srt_index.py input.srt --build
+"""
+
+import argparse
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import srt
+
+SIDECAR_SUFFIX = '.srtidx'
+SIDECAR_MAGIC = b'SRTIDX1\0'
+# magic, ファイルサイズ, 更新時刻(ns), 字幕数
+SIDECAR_HEADER = struct.Struct('<8sQQQ')
+BOM_BYTES = srt.BOM.encode('utf-8')
+COPY_CHUNK = 1 << 20
+
+TIMING_BYTES_RE = re.compile(
+    rb'^[ \t]*(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})[ \t]*-->[ \t]*'
+    rb'(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})',
+    re.MULTILINE,
+)
+INDEX_LINE_RE = re.compile(rb'[ \t]*(\d+)[ \t]*\r?\n')
+
+
+def _to_ms(groups: tuple[bytes, ...]) -> int:
+    h, m, s, frac = groups
+    return ((int(h) * 60 + int(m)) * 60 + int(s)) * 1000 + int(frac.ljust(3, b'0'))
+
+
+def parse_time(value: str) -> int:
+    """'HH:MM:SS[,mmm]'、'MM:SS' または秒数をミリ秒に変換"""
+    value = value.strip()
+    if ':' not in value:
+        return round(float(value) * 1000)
+    if value.count(':') == 1:
+        value = '0:' + value
+    if ',' not in value and '.' not in value:
+        value += ',0'
+    return srt.parse_timestamp(value)
+
+
+class SrtIndex:
+    """
+    SRTファイルの字幕位置のインデックス
+
+    字幕は先頭からの位置（0始まり）で扱う。offsets は字幕の開始バイト位置で、
+    末尾にファイルサイズを番兵として持つ。字幕のブロックは番号行から次の字幕の
+    番号行の直前まで（区切りの空行を含む）。
+    """
+
+    def __init__(self, path: str | Path, sidecar: bool = False):
+        self.path = Path(path)
+        self.sidecar = sidecar
+        self.sidecar_path = self.path.with_name(self.path.name + SIDECAR_SUFFIX)
+        self.offsets = array('q')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.numbers = array('q')
+        self._fh = None
+        self._mm: mmap.mmap | bytes = b''
+        self._open()
+        if not (self.sidecar and self._load_sidecar()):
+            self._build()
+            if self.sidecar:
+                self.save_sidecar()
+
+    # --- ファイルとインデックスの読み込み -----------------------------------
+
+    def _open(self) -> None:
+        self._fh = open(self.path, 'rb')
+        size = os.fstat(self._fh.fileno()).st_size
+        # 空ファイルは mmap できない
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def close(self) -> None:
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._mm = b''
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self) -> 'SrtIndex':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _stamp(self) -> tuple[int, int]:
+        st = os.stat(self.path)
+        return st.st_size, st.st_mtime_ns
+
+    def _build(self) -> None:
+        """タイムコード行を走査してインデックスを作る"""
+        mm = self._mm
+        offsets, starts, ends, numbers = array('q'), array('q'), array('q'), array('q')
+        base = len(BOM_BYTES) if mm[: len(BOM_BYTES)] == BOM_BYTES else 0
+        next_number = 1
+
+        for match in TIMING_BYTES_RE.finditer(mm):
+            offset, number = match.start(), None
+            # 直前の行が数字だけなら番号行として字幕に含める
+            if offset > base:
+                prev_start = max(mm.rfind(b'\n', base, offset - 1) + 1, base)
+                index_line = INDEX_LINE_RE.fullmatch(mm, prev_start, offset)
+                if index_line:
+                    offset, number = prev_start, int(index_line.group(1))
+            groups = match.groups()
+            offsets.append(offset)
+            starts.append(_to_ms(groups[0:4]))
+            ends.append(_to_ms(groups[4:8]))
+            numbers.append(number if number is not None else next_number)
+            next_number = numbers[-1] + 1
+
+        offsets.append(len(mm))
+        self.offsets, self.starts, self.ends, self.numbers = offsets, starts, ends, numbers
+
+    def _load_sidecar(self) -> bool:
+        """サイドカーが現在のファイルと一致すれば読み込む"""
+        try:
+            with open(self.sidecar_path, 'rb') as fh:
+                header = fh.read(SIDECAR_HEADER.size)
+                if len(header) != SIDECAR_HEADER.size:
+                    return False
+                magic, size, mtime_ns, count = SIDECAR_HEADER.unpack(header)
+                if magic != SIDECAR_MAGIC or (size, mtime_ns) != self._stamp():
+                    return False
+                arrays = [array('q') for _ in range(4)]
+                for arr, length in zip(arrays, (count + 1, count, count, count)):
+                    arr.fromfile(fh, length)
+        except (OSError, EOFError, struct.error):
+            return False
+        self.offsets, self.starts, self.ends, self.numbers = arrays
+        return True
+
+    def save_sidecar(self) -> None:
+        """インデックスを `<file>.srtidx` に保存（ネイティブのバイト順）"""
+        size, mtime_ns = self._stamp()
+        with srt.atomic_write(self.sidecar_path, 'wb') as fh:
+            fh.write(SIDECAR_HEADER.pack(SIDECAR_MAGIC, size, mtime_ns, len(self)))
+            for arr in (self.offsets, self.starts, self.ends, self.numbers):
+                arr.tofile(fh)
+
+    # --- 検索 --------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def position_at(self, ms: int) -> int | None:
+        """ms の時点に表示されている字幕の位置（開始時刻順に並んでいる前提）"""
+        i = bisect_right(self.starts, ms) - 1
+        # 重なりがある場合に備え、直前の数件まで遡って確認する
+        for j in range(i, max(i - 8, -1), -1):
+            if self.starts[j] <= ms < self.ends[j]:
+                return j
+        return None
+
+    def positions_between(self, start_ms: int, end_ms: int) -> range:
+        """開始時刻が [start_ms, end_ms) の字幕の位置"""
+        return range(bisect_left(self.starts, start_ms), bisect_left(self.starts, end_ms))
+
+    def position_of(self, number: int) -> int | None:
+        """字幕番号から位置を求める（番号が昇順なら二分探索）"""
+        i = bisect_left(self.numbers, number)
+        if i < len(self.numbers) and self.numbers[i] == number:
+            return i
+        try:
+            return self.numbers.index(number)
+        except ValueError:
+            return None
+
+    def raw(self, first: int, last: int | None = None) -> bytes:
+        """位置 first から last（含まない）までの字幕のバイト列"""
+        last = first + 1 if last is None else last
+        return bytes(self._mm[self.offsets[first] : self.offsets[last]])
+
+    def cue(self, position: int) -> srt.Cue:
+        return next(self.iter_cues(position, position + 1))
+
+    def iter_cues(self, first: int = 0, last: int | None = None) -> Iterator[srt.Cue]:
+        """位置 first から last（含まない）までの字幕だけをパースする"""
+        last = len(self) if last is None else last
+        if first >= last:
+            return
+        text = self.raw(first, last).decode('utf-8')
+        yield from srt.parse(text)
+
+    # --- 編集 --------------------------------------------------------------
+
+    def _newline(self) -> bytes:
+        end = self._mm.find(b'\n')
+        return b'\r\n' if end > 0 and self._mm[end - 1 : end] == b'\r' else b'\n'
+
+    def replace(self, first: int, last: int, cues: Iterable[srt.Cue]) -> None:
+        """
+        位置 first から last（含まない）までの字幕を cues に差し替える
+
+        差し替え範囲より前後のバイトはそのまま写し、一時ファイル経由でアトミックに
+        置き換える。インデックスは差し替えた範囲だけ更新し、以降のオフセットをずらす。
+        """
+        if not 0 <= first <= last <= len(self):
+            raise IndexError(f"範囲が不正です: {first}..{last}（字幕数 {len(self)}）")
+        cues = list(cues)
+        nl = self._newline()
+        begin, end = self.offsets[first], self.offsets[last]
+        bodies = [
+            nl.join(
+                [str(cue.index).encode(), cue.timing_line().encode('utf-8')]
+                + [line.encode('utf-8') for line in cue.lines]
+            )
+            for cue in cues
+        ]
+
+        prefix = b''
+        seps = [nl + nl] * len(bodies)
+        if last == len(self) and len(self):
+            # ファイル末尾を含む場合は、元の最後の字幕の後ろの改行・空行を引き継ぐ
+            block = self._mm[self.offsets[-2] : self.offsets[-1]]
+            tail_sep = block[len(block.rstrip(b'\r\n')) :]
+            if first > 0:
+                # 直前の字幕の本文の直後から書き換え、区切りの空行を付け直す
+                prev = self._mm[self.offsets[first - 1] : begin]
+                begin = self.offsets[first - 1] + len(prev.rstrip(b'\r\n'))
+                prefix = nl + nl if bodies else tail_sep
+            if bodies:
+                seps[-1] = tail_sep
+        blocks = [body + sep for body, sep in zip(bodies, seps)]
+        new_bytes = prefix + b''.join(blocks)
+
+        with srt.atomic_write(self.path, 'wb') as dst:
+            self._copy(dst, 0, begin)
+            dst.write(new_bytes)
+            self._copy(dst, end, len(self._mm))
+            # 置き換える前に mmap を閉じる
+            self.close()
+
+        # 差し替えた範囲のインデックスを作り直し、以降のオフセットをずらす
+        delta = len(new_bytes) - (end - begin)
+        cursor = begin + len(prefix)
+        offsets = array('q')
+        for block in blocks:
+            offsets.append(cursor)
+            cursor += len(block)
+        self.offsets[first:] = offsets + array(
+            'q', (offset + delta for offset in self.offsets[last:])
+        )
+        self.starts[first:last] = array('q', (cue.start for cue in cues))
+        self.ends[first:last] = array('q', (cue.end for cue in cues))
+        self.numbers[first:last] = array('q', (cue.index for cue in cues))
+
+        self._open()
+        if self.sidecar:
+            self.save_sidecar()
+
+    def _copy(self, dst, start: int, stop: int) -> None:
+        for pos in range(start, stop, COPY_CHUNK):
+            dst.write(self._mm[pos : min(pos + COPY_CHUNK, stop)])
+
+
+def _print_cues(cues: Iterable[srt.Cue]) -> None:
+    text = srt.compose(cues)
+    print(text, end='' if text.endswith('\n') else '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='大きなSRTファイルから時刻・字幕番号で字幕を取り出し、範囲を差し替えます',
+        usage=__doc__.split('Usage:\n', 1)[1].split('\n\n', 1)[0],
+    )
+    parser.add_argument('input', help='SRTファイル')
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument('--at', metavar='TIME', help='その時刻に表示されている字幕を表示')
+    action.add_argument(
+        '--cues', nargs=2, type=int, metavar=('N', 'M'), help='字幕番号 N〜M を表示'
+    )
+    action.add_argument(
+        '--replace',
+        nargs=3,
+        metavar=('N', 'M', 'FILE'),
+        help='字幕番号 N〜M を FILE の字幕に差し替える',
+    )
+    action.add_argument(
+        '--build', action='store_true', help='サイドカーを作成して件数を表示（--save-index を含む）'
+    )
+    parser.add_argument(
+        '--save-index',
+        action='store_true',
+        help='インデックスをサイドカー（.srtidx）に保存し、次回から再利用する',
+    )
+    args = parser.parse_args()
+
+    if not Path(args.input).exists():
+        print(f"❌ エラー: ファイルが見つかりません: {args.input}")
+        sys.exit(1)
+
+    try:
+        with SrtIndex(args.input, sidecar=args.save_index or args.build) as index:
+            if args.build:
+                print(f"✅ {len(index)}件の字幕をインデックスしました: {index.sidecar_path}")
+            elif args.at:
+                position = index.position_at(parse_time(args.at))
+                if position is None:
+                    print(f"その時刻に表示されている字幕はありません: {args.at}")
+                    sys.exit(1)
+                _print_cues([index.cue(position)])
+            else:
+                n, m = map(int, (args.cues or args.replace)[:2])
+                first, last = index.position_of(n), index.position_of(m)
+                if first is None or last is None or first > last:
+                    print(f"❌ エラー: 字幕番号 {n}〜{m} が見つかりません")
+                    sys.exit(1)
+                if args.cues:
+                    _print_cues(index.iter_cues(first, last + 1))
+                else:
+                    with open(args.replace[2], encoding='utf-8', newline='') as fh:
+                        cues = list(srt.iter_cues(fh))
+                    index.replace(first, last + 1, cues)
+                    print(f"✅ 字幕番号 {n}〜{m} を{len(cues)}件の字幕に差し替えました")
+    except (OSError, ValueError, UnicodeDecodeError) as e:
+        print(f"❌ エラー: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+SRT字幕のタイミング統計（読み取り速度・表示時間・間隔・重なり・順序）
+
+各ファイルの字幕の開始・終了時刻と文字数を NumPy の配列に読み込み、
+ベクトル演算でまとめて集計する。ファイル別と全体（シーズン単位など）のレポートを出力する。
+
+判定基準（--max-cps などで変更可）:
+    読み取り速度    1秒あたり4文字以下（日本語字幕の一般的な目安）
+    表示時間        5/6秒（20フレーム）以上、7秒以下
+    字幕間の間隔    2フレーム（約83ms）以上あける。0未満は重なり
+
+Usage:
+    python srt_stats.py input.srt
+    python srt_stats.py season1/ season2/ [--jobs N] [--json]
+    python srt_stats.py input.srt --max-cps 6 --worst 20
+
+    NumPy が必要です（pip install numpy）。
+"""
+
+import argparse
+import json
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - 実行時にメッセージを出す
+    np = None
+
+import srt
+from remove_trailing_punctuation import collect_srt_files
+
+
+@dataclass
+class Guidelines:
+    """字幕の読みやすさの基準"""
+
+    max_cps: float = 4.0
+    min_duration: int = 833
+    max_duration: int = 7000
+    min_gap: int = 83
+
+
+@dataclass
+class CueTimings:
+    """1ファイル分の字幕のタイミング（NumPy 配列）"""
+
+    path: str
+    numbers: 'np.ndarray'
+    starts: 'np.ndarray'
+    ends: 'np.ndarray'
+    chars: 'np.ndarray'
+    # 複数ファイルを連結したとき: 各ファイルの字幕数の累積とファイル名
+    bounds: 'np.ndarray | None' = None
+    sources: list[str] | None = None
+
+
+def _count_chars(lines: list[str]) -> int:
+    # 空白は読む文字に数えない
+    return sum(len(line) - line.count(' ') - line.count('　') for line in lines)
+
+
+def load_timings(path: str | Path) -> CueTimings:
+    """SRTファイルを1回走査して、番号・開始・終了・文字数の配列にする"""
+    numbers, starts, ends, chars = array('q'), array('q'), array('q'), array('q')
+    with open(path, encoding='utf-8', newline='') as fh:
+        for cue in srt.iter_cues(fh):
+            numbers.append(cue.index)
+            starts.append(cue.start)
+            ends.append(cue.end)
+            chars.append(_count_chars(cue.lines))
+    return CueTimings(
+        str(path),
+        np.frombuffer(numbers, dtype=np.int64),
+        np.frombuffer(starts, dtype=np.int64),
+        np.frombuffer(ends, dtype=np.int64),
+        np.frombuffer(chars, dtype=np.int64),
+    )
+
+
+def _percentiles(values: 'np.ndarray') -> dict[str, float]:
+    if values.size == 0:
+        return {}
+    p = np.percentile(values, [0, 50, 95, 100])
+    return {
+        'min': float(p[0]),
+        'median': float(p[1]),
+        'p95': float(p[2]),
+        'max': float(p[3]),
+        'mean': float(values.mean()),
+    }
+
+
+def analyze(timings: CueTimings, guidelines: Guidelines, worst: int = 10) -> dict:
+    """1ファイル（または連結した全体）のタイミングを集計する"""
+    starts, ends, chars = timings.starts, timings.ends, timings.chars
+    durations = ends - starts
+    positive = durations > 0
+    # 表示時間が0以下の字幕は速度を無限大として扱う
+    cps = np.full(durations.shape, np.inf)
+    np.divide(chars * 1000.0, durations, out=cps, where=positive)
+    cps[chars == 0] = 0.0
+
+    # 字幕間の間隔は、同じファイル内で隣り合う字幕同士で計算する
+    gaps = starts[1:] - ends[:-1]
+    backwards = starts[1:] < starts[:-1]
+    if timings.bounds is not None:
+        # gaps[k] は字幕 k と k+1 の間。前のファイルの最後と次のファイルの先頭の間を除く
+        breaks = timings.bounds[:-1] - 1
+        breaks = breaks[(breaks >= 0) & (breaks < gaps.size)]
+        gaps = np.delete(gaps, breaks)
+        backwards = np.delete(backwards, breaks)
+
+    too_fast = cps > guidelines.max_cps
+    worst_idx = np.argsort(-cps, kind='stable')[:worst]
+    worst_idx = worst_idx[too_fast[worst_idx]]
+
+    return {
+        'path': timings.path,
+        'cues': int(starts.size),
+        'total_ms': int(durations[positive].sum()),
+        'chars': int(chars.sum()),
+        'cps': _percentiles(cps[positive & (chars > 0)]),
+        'duration_ms': _percentiles(durations),
+        'gap_ms': _percentiles(gaps),
+        'too_fast': int(too_fast.sum()),
+        'too_short': int(((durations < guidelines.min_duration) & positive).sum()),
+        'too_long': int((durations > guidelines.max_duration).sum()),
+        'non_positive_duration': int((~positive).sum()),
+        'overlaps': int((gaps < 0).sum()),
+        'tight_gaps': int(((gaps >= 0) & (gaps < guidelines.min_gap)).sum()),
+        'out_of_order': int(backwards.sum()),
+        'worst': [
+            {
+                **_source(timings, i),
+                'number': int(timings.numbers[i]),
+                'start': srt.format_timestamp(int(starts[i])),
+                # 表示時間が0以下の字幕は JSON で扱えるよう None にする
+                'cps': float(cps[i]) if np.isfinite(cps[i]) else None,
+                'chars': int(chars[i]),
+                'duration_ms': int(durations[i]),
+            }
+            for i in worst_idx
+        ],
+    }
+
+
+def _source(timings: CueTimings, i: int) -> dict[str, str]:
+    """連結したタイミングの i 番目の字幕が属するファイル"""
+    if timings.sources is None:
+        return {}
+    return {'file': timings.sources[int(np.searchsorted(timings.bounds, i, side='right'))]}
+
+
+def concat(timings: list[CueTimings], path: str = '(全体)') -> CueTimings:
+    """複数ファイルのタイミングを連結する（ファイルの境目は間隔の計算から除く）"""
+    columns = {
+        name: np.concatenate([getattr(t, name) for t in timings])
+        for name in ('numbers', 'starts', 'ends', 'chars')
+    }
+    return CueTimings(
+        path,
+        **columns,
+        bounds=np.cumsum([t.starts.size for t in timings]),
+        sources=[t.path for t in timings],
+    )
+
+
+def _load_one(path: Path) -> tuple[CueTimings | None, str | None]:
+    """ワーカープロセスで1ファイルを読み込む（例外は文字列で返す）"""
+    try:
+        return load_timings(path), None
+    except Exception as e:
+        return None, f"{path}: {e}"
+
+
+def load_many(paths: list[Path], jobs: int | None = None) -> tuple[list[CueTimings], list[str]]:
+    """複数のSRTファイルをプロセスプールで読み込む"""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(paths) <= 1:
+        results = [_load_one(path) for path in paths]
+    else:
+        chunksize = max(1, len(paths) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as executor:
+            results = list(executor.map(_load_one, paths, chunksize=chunksize))
+    loaded = [timings for timings, _ in results if timings is not None]
+    errors = [error for _, error in results if error is not None]
+    return loaded, errors
+
+
+def _fmt_stats(stats: dict[str, float], unit: str, scale: float = 1.0) -> str:
+    if not stats:
+        return '-'
+    return (
+        f"中央値 {stats['median'] / scale:.1f}{unit} / 95% {stats['p95'] / scale:.1f}{unit}"
+        f" / 最小 {stats['min'] / scale:.1f}{unit} / 最大 {stats['max'] / scale:.1f}{unit}"
+    )
+
+
+def print_report(report: dict, guidelines: Guidelines) -> None:
+    """集計結果を表示"""
+    print(f"📊 {report['path']}: {report['cues']}件、{report['total_ms'] / 60000:.1f}分")
+    print(f"  読み取り速度: {_fmt_stats(report['cps'], '文字/秒')}")
+    print(f"  表示時間:     {_fmt_stats(report['duration_ms'], '秒', 1000)}")
+    print(f"  字幕間の間隔: {_fmt_stats(report['gap_ms'], '秒', 1000)}")
+
+    checks = [
+        ('too_fast', f"{guidelines.max_cps:g}文字/秒を超える字幕"),
+        ('too_short', f"表示時間が{guidelines.min_duration}ms未満"),
+        ('too_long', f"表示時間が{guidelines.max_duration}msを超える"),
+        ('non_positive_duration', '表示時間が0以下'),
+        ('overlaps', '前の字幕と重なっている'),
+        ('tight_gaps', f"前の字幕との間隔が{guidelines.min_gap}ms未満"),
+        ('out_of_order', '開始時刻が前の字幕より早い'),
+    ]
+    for key, label in checks:
+        if report[key]:
+            marker = '❌' if key in ('non_positive_duration', 'out_of_order') else '⚠️'
+            print(f"  {marker} {label}: {report[key]}件")
+    for cue in report['worst']:
+        source = f"{cue['file']} " if 'file' in cue else ''
+        print(
+            f"    {source}#{cue['number']} {cue['start']} "
+            f"{'∞' if cue['cps'] is None else format(cue['cps'], '.1f')}文字/秒（{cue['chars']}文字 / {cue['duration_ms']}ms）"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='SRT字幕の読み取り速度・表示時間・間隔・重なりを集計します',
+        usage=__doc__.split('Usage:\n', 1)[1].split('\n\n', 1)[0],
+    )
+    parser.add_argument('paths', nargs='+', help='SRTファイルまたはディレクトリ')
+    parser.add_argument('-j', '--jobs', type=int, help='並列プロセス数（既定: CPU数）')
+    parser.add_argument('--json', action='store_true', help='JSONで出力')
+    parser.add_argument('--worst', type=int, default=5, help='表示する速すぎる字幕の件数')
+    defaults = Guidelines()
+    parser.add_argument('--max-cps', type=float, default=defaults.max_cps)
+    parser.add_argument('--min-duration', type=int, default=defaults.min_duration)
+    parser.add_argument('--max-duration', type=int, default=defaults.max_duration)
+    parser.add_argument('--min-gap', type=int, default=defaults.min_gap)
+    args = parser.parse_args()
+
+    if np is None:
+        print("❌ エラー: NumPy が必要です（pip install numpy）")
+        sys.exit(1)
+
+    guidelines = Guidelines(args.max_cps, args.min_duration, args.max_duration, args.min_gap)
+    files = [path for path, _ in collect_srt_files(args.paths)]
+    if not files:
+        print("❌ エラー: 処理対象のSRTファイルが見つかりません")
+        sys.exit(1)
+
+    timings, errors = load_many(files, args.jobs)
+    reports = [analyze(t, guidelines, args.worst) for t in timings]
+    corpus = analyze(concat(timings), guidelines, args.worst) if len(timings) > 1 else None
+
+    if args.json:
+        output = {'guidelines': asdict(guidelines), 'files': reports, 'errors': errors}
+        if corpus is not None:
+            output['corpus'] = corpus
+        print(json.dumps(output, ensure_ascii=False, indent=2))
+    else:
+        for report in reports:
+            print_report(report, guidelines)
+        if corpus is not None:
+            print()
+            print_report(corpus, guidelines)
+        for error in errors:
+            print(f"❌ エラー: {error}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
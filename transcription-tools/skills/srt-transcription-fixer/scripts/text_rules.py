@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+字幕テキストの修正ルールとパイプライン
+
+ルールは名前で登録し、パターンは生成時に一度だけコンパイルする。
+Pipeline は字幕1行ごとに全ルールを順に適用するため、ルールを増やしても
+ファイルの読み書きは1回で済む。ルールごとの置換件数と処理時間を集計する。
+
+組み込みルール:
+    trailing-punctuation  行末の句読点（、。）を削除
+    filler                フィラー（えーと、あのー等）を削除
+    whitespace            連続する空白（全角含む）を1つにまとめ、前後の空白を削除
+    glossary              用語集による置換（--glossary で指定）
+
+glossary ルールは transcription-fixer の apply_glossary.py のオートマトンで置換し、
+語の境界・文脈依存の項目の扱いを apply_glossary.py と揃える。
+"""
+
+import json
+import re
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+# 用語集の置換は transcription-fixer の apply_glossary.py と共有する
+TRANSCRIPTION_FIXER_SCRIPTS = (
+    Path(__file__).resolve().parent.parent.parent / 'transcription-fixer' / 'scripts'
+)
+sys.path.insert(0, str(TRANSCRIPTION_FIXER_SCRIPTS))
+
+from apply_glossary import (  # noqa: E402
+    PATTERN_SECTION,
+    GlossaryAutomaton,
+    is_ambiguous,
+    load_skill_glossary,
+)
+
+TRAILING_PUNCTUATION_RE = re.compile(r'[、。]+$')
+FILLER_RE = re.compile(r'(?:えーっと|えーと|えっと|あのー+|うーん|えー+)[、,]?\s*')
+WHITESPACE_RE = re.compile(r'[ \t　]{2,}|　')
+
+
+class Rule(ABC):
+    """1行のテキストに適用する修正ルール"""
+
+    name = ''
+
+    @abstractmethod
+    def apply(self, text: str) -> tuple[str, int]:
+        """修正後のテキストと置換件数を返す"""
+
+
+class RegexRule(Rule):
+    """正規表現による置換ルール"""
+
+    def __init__(self, name: str, pattern: re.Pattern[str], repl: str | Callable = ''):
+        self.name = name
+        self.pattern = pattern
+        self.repl = repl
+
+    def apply(self, text: str) -> tuple[str, int]:
+        return self.pattern.subn(self.repl, text)
+
+
+class WhitespaceRule(Rule):
+    """空白の正規化（連続空白・全角空白を半角1つに、前後の空白を削除）"""
+
+    name = 'whitespace'
+
+    def apply(self, text: str) -> tuple[str, int]:
+        text, count = WHITESPACE_RE.subn(' ', text)
+        stripped = text.strip()
+        if stripped != text:
+            count += 1
+        return stripped, count
+
+
+class GlossaryRule(Rule):
+    """用語集（誤変換 → 正しい表記）による置換。apply_glossary.py と同じ規則で一致させる"""
+
+    name = 'glossary'
+
+    def __init__(self, mapping: dict[str, str]):
+        self.automaton = GlossaryAutomaton(mapping)
+
+    def apply(self, text: str) -> tuple[str, int]:
+        counter: Counter = Counter()
+        text = self.automaton.replace(text, counter)
+        return text, sum(counter.values())
+
+
+def load_glossary(path: str | Path) -> dict[str, str]:
+    """
+    用語集ファイルを読み込む
+
+    JSONオブジェクト、transcription-fixer の SKILL.md、またはタブ区切り・
+    「誤変換 → 正しい表記」形式のテキスト。「A / B → C」のように複数の誤変換を
+    まとめて書ける。# で始まる行は無視。
+    SKILL.md は apply_glossary.py と同じく文脈依存の項目を除いて読み込み、
+    テキスト形式でも正しい表記が文脈次第・複数・説明付きの項目は除く。
+    """
+    path = Path(path)
+    content = path.read_text(encoding='utf-8')
+    if path.suffix == '.json':
+        return dict(json.loads(content))
+    lines = content.splitlines()
+    if any(line.startswith(PATTERN_SECTION) for line in lines):
+        mapping, _ = load_skill_glossary(path)
+        return mapping
+
+    mapping = {}
+    for line in lines:
+        line = line.strip().lstrip('-').strip()
+        if not line or line.startswith('#'):
+            continue
+        if '\t' in line:
+            source, target = line.split('\t', 1)
+        elif '→' in line:
+            source, target = line.split('→', 1)
+        else:
+            continue
+        target = target.strip().strip('`')
+        if is_ambiguous(target):
+            continue
+        for term in source.split(' / '):
+            mapping[term.strip().strip('`')] = target
+    return mapping
+
+
+# ルール名 → ルールを生成する関数
+RULES: dict[str, Callable[..., Rule]] = {}
+
+
+def register_rule(name: str):
+    """ルールの生成関数を登録するデコレーター"""
+
+    def decorator(factory: Callable[..., Rule]) -> Callable[..., Rule]:
+        RULES[name] = factory
+        return factory
+
+    return decorator
+
+
+@register_rule('trailing-punctuation')
+def _trailing_punctuation(**_options) -> Rule:
+    return RegexRule('trailing-punctuation', TRAILING_PUNCTUATION_RE)
+
+
+@register_rule('filler')
+def _filler(**_options) -> Rule:
+    return RegexRule('filler', FILLER_RE)
+
+
+@register_rule('whitespace')
+def _whitespace(**_options) -> Rule:
+    return WhitespaceRule()
+
+
+@register_rule('glossary')
+def _glossary(glossary: str | Path | dict[str, str] | None = None, **_options) -> Rule:
+    if glossary is None:
+        raise ValueError("glossary ルールには用語集の指定が必要です（--glossary）")
+    mapping = glossary if isinstance(glossary, dict) else load_glossary(glossary)
+    return GlossaryRule(mapping)
+
+
+@dataclass
+class RuleStats:
+    """ルールごとの集計"""
+
+    name: str
+    hits: int = 0
+    lines: int = 0
+    ns: int = 0
+
+    def merge(self, other: 'RuleStats') -> None:
+        self.hits += other.hits
+        self.lines += other.lines
+        self.ns += other.ns
+
+
+class Pipeline:
+    """複数ルールを1行ずつまとめて適用する"""
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules = list(rules)
+        self.stats = [RuleStats(rule.name) for rule in self.rules]
+
+    @classmethod
+    def from_names(cls, names: Iterable[str], **options) -> 'Pipeline':
+        """登録済みのルール名からパイプラインを組み立てる"""
+        rules = []
+        for name in names:
+            if name not in RULES:
+                raise ValueError(
+                    f"不明なルールです: {name}（利用可能: {', '.join(RULES)}）"
+                )
+            rules.append(RULES[name](**options))
+        return cls(rules)
+
+    def apply(self, text: str) -> str:
+        for rule, stat in zip(self.rules, self.stats):
+            started = time.perf_counter_ns()
+            text, count = rule.apply(text)
+            stat.ns += time.perf_counter_ns() - started
+            if count:
+                stat.hits += count
+                stat.lines += 1
+        return text
+
+    def merge_stats(self, stats: Iterable[RuleStats]) -> None:
+        """別プロセスで集計した結果を合算する"""
+        for mine, other in zip(self.stats, stats):
+            mine.merge(other)
+
+    def report(self) -> list[str]:
+        """ルールごとの集計を表示用の行にする"""
+        lines = []
+        for stat in self.stats:
+            lines.append(
+                f"  {stat.name}: {stat.hits}件（{stat.lines}行） {stat.ns / 1e6:.1f}ms"
+            )
+        return lines
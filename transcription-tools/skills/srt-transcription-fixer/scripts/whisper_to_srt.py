@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Whisper の verbose JSON（セグメント・単語のタイムスタンプ）からSRTを生成するスクリプト
+
+JSON全体を読み込まず、"segments" 配列の要素を1件ずつデコードしてストリーム処理する。
+単語のタイムスタンプがあれば単語単位で字幕を組み立て、文字数・表示時間・無音の長さ・
+文末の句読点で区切る。区切り位置は rebalance_breaks.py と同じ文節境界の判定で選ぶ。
+各字幕には text_rules.py のルール（既定: 空白の正規化、用語集、行末句読点の削除）を
+その場で適用するため、数時間分の音声でもメモリ使用量は一定のまま1パスで字幕になる。
+
+Usage:
+    python whisper_to_srt.py transcript.json [output.srt]
+    python whisper_to_srt.py transcript.json output.srt --glossary terms.tsv
+    python whisper_to_srt.py transcript.json output.srt --max-chars 20 --rules trailing-punctuation
+
+    output.srtを省略すると、入力と同じ名前の .srt に出力します（- なら標準出力）。
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TextIO
+
+import srt
+from rebalance_breaks import break_score
+from text_rules import RULES, Pipeline
+
+CHUNK_SIZE = 1 << 16
+# デコード中のセグメント1件に許すバッファの上限（文字数）
+MAX_SEGMENT_CHARS = 1 << 24
+# "segments" を探すときの、文字列の外の構造文字と文字列の中の特殊文字
+STRUCTURE_RE = re.compile(r'["{}\[\]:,]')
+# 文字列の中身（エスケープを含む）。閉じる '"' かチャンク末尾の '\\' の手前まで
+STRING_BODY_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+# 保持するキーの長さ（"segments" と比べられれば十分）
+KEY_LIMIT = 16
+SENTENCE_END = tuple('。？！?!.')
+
+DEFAULT_MAX_CHARS = 24
+DEFAULT_MAX_DURATION = 7000
+DEFAULT_MAX_PAUSE = 800
+
+
+@dataclass
+class Word:
+    """タイムスタンプ付きの単語（またはセグメント全体）"""
+
+    start: int
+    end: int
+    text: str
+    # セグメントの最後の単語か
+    segment_end: bool = False
+
+
+def _skip_to_segments(fh: TextIO, buffer: str, chunk_size: int) -> str:
+    """
+    トップレベルのオブジェクトを読み進め、"segments" 配列の '[' の直後を返す
+
+    文字列の中（エスケープを含む）と入れ子の値は読み飛ばすため、全文テキストの中の
+    "segments" という文字列には一致しない。保持するのは読み取り中のキーのみ。
+    """
+    depth = 0
+    in_string = escape = False
+    # 読み取り中のキー（トップレベルのキーの位置の文字列のみ、先頭の KEY_LIMIT 文字）、
+    # 直前のキー
+    key: str | None = None
+    last_key = None
+    expect_key = after_colon = False
+
+    while True:
+        i = 0
+        while i < len(buffer):
+            if in_string:
+                if escape:
+                    escape = False
+                    if key is not None:
+                        key = (key + '\\' + buffer[i])[:KEY_LIMIT]
+                    i += 1
+                    continue
+                stop = STRING_BODY_RE.match(buffer, i).end()
+                if key is not None:
+                    key = (key + buffer[i : min(stop, i + KEY_LIMIT)])[:KEY_LIMIT]
+                if stop == len(buffer):
+                    break
+                i = stop + 1
+                if buffer[stop] == '\\':
+                    # エスケープされる文字は次のチャンクの先頭にある
+                    escape = True
+                else:
+                    in_string = False
+                    if key is not None:
+                        last_key, key = key, None
+                continue
+
+            match = STRUCTURE_RE.search(buffer, i)
+            if not match:
+                break
+            char, i = match.group(), match.end()
+            if char == '"':
+                in_string = True
+                if depth == 1 and expect_key:
+                    key, expect_key = '', False
+                else:
+                    after_colon = False
+            elif char in '{[':
+                if depth == 1 and after_colon and char == '[' and last_key == 'segments':
+                    return buffer[i:]
+                depth += 1
+                after_colon = False
+                expect_key = depth == 1
+            elif char in '}]':
+                depth -= 1
+                if depth <= 0:
+                    raise ValueError('"segments" が見つかりません')
+            elif depth == 1:
+                # ':' ならキーの値、',' なら次のキー
+                after_colon, expect_key = char == ':', char == ','
+        buffer = fh.read(chunk_size)
+        if not buffer:
+            raise ValueError('"segments" が見つかりません')
+
+
+def iter_segments(
+    fh: TextIO, chunk_size: int = CHUNK_SIZE, max_segment: int = MAX_SEGMENT_CHARS
+) -> Iterator[dict]:
+    """
+    Whisper の JSON から "segments" 配列の要素を1件ずつ返す
+
+    {"text": ..., "segments": [...]} 形式のほか、セグメントの配列だけのJSONにも対応する。
+    保持するのはデコード中のセグメント1件分のバッファのみで、max_segment 文字を
+    超えてもデコードできないセグメントはエラーにする（壊れたJSONで読み続けない）。
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+
+    def fill() -> bool:
+        nonlocal buffer
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            return False
+        buffer += chunk
+        return True
+
+    while not buffer.strip():
+        if not fill():
+            raise ValueError("JSON が空です")
+    buffer = buffer.lstrip()
+    if buffer.startswith('['):
+        buffer = buffer[1:]
+    elif buffer.startswith('{'):
+        # "segments": [ の直後まで読み飛ばす（先頭の全文テキストは保持しない）
+        buffer = _skip_to_segments(fh, buffer, chunk_size)
+    else:
+        raise ValueError("Whisper の JSON ではありません")
+
+    while True:
+        pos = 0
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+            pos += 1
+        buffer = buffer[pos:]
+        if buffer.startswith(']'):
+            return
+        if not buffer:
+            if not fill():
+                raise ValueError('"segments" の途中でファイルが終わっています')
+            continue
+        try:
+            segment, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            # セグメントがチャンクの境目をまたいでいる
+            if len(buffer) > max_segment:
+                raise ValueError(
+                    f"セグメントが {max_segment} 文字を超えてもデコードできません"
+                    "（JSON が壊れている可能性があります）"
+                ) from None
+            if not fill():
+                raise
+            continue
+        buffer = buffer[end:]
+        yield segment
+
+
+def _ms(seconds: float) -> int:
+    return round(seconds * 1000)
+
+
+def iter_words(segments: Iterable[dict]) -> Iterator[Word]:
+    """セグメントを単語の列にする（単語のタイムスタンプが無ければセグメント単位）"""
+    for segment in segments:
+        words = [w for w in segment.get('words') or () if 'start' in w and 'end' in w]
+        if words:
+            for i, word in enumerate(words, start=1):
+                yield Word(
+                    _ms(word['start']),
+                    _ms(word['end']),
+                    word.get('word', ''),
+                    segment_end=i == len(words),
+                )
+        elif segment.get('text', '').strip():
+            yield Word(
+                _ms(segment['start']), _ms(segment['end']), segment['text'], segment_end=True
+            )
+
+
+class CueBuilder:
+    """単語を字幕にまとめる"""
+
+    def __init__(
+        self,
+        max_chars: int = DEFAULT_MAX_CHARS,
+        max_duration: int = DEFAULT_MAX_DURATION,
+        max_pause: int = DEFAULT_MAX_PAUSE,
+    ):
+        self.max_chars = max_chars
+        self.max_duration = max_duration
+        self.max_pause = max_pause
+        self.pending: list[Word] = []
+
+    def _text(self, words: list[Word]) -> str:
+        return ''.join(word.text for word in words).strip()
+
+    def _emit(self, count: int) -> srt.Cue | None:
+        words, self.pending = self.pending[:count], self.pending[count:]
+        text = self._text(words)
+        if not text:
+            return None
+        # 番号は書き出し時に振る
+        return srt.Cue(0, words[0].start, words[-1].end, [text])
+
+    def _best_split(self) -> int:
+        """字幕に収まる範囲で、最も自然な単語の境目（先頭からの単語数）"""
+        joined = ''.join(word.text for word in self.pending)
+        best_count, best_score = 1, None
+        pos = 0
+        for count, word in enumerate(self.pending[:-1], start=1):
+            pos += len(word.text)
+            if count > 1 and len(joined[:pos].strip()) > self.max_chars:
+                break
+            if not joined[:pos].strip() or pos >= len(joined):
+                continue
+            score = break_score(joined, pos)
+            # 同点なら後ろの境目（字幕を長めにとる）を選ぶ
+            if best_score is None or score >= best_score:
+                best_count, best_score = count, score
+        return best_count
+
+    def feed(self, word: Word) -> Iterator[srt.Cue]:
+        if self.pending and word.start - self.pending[-1].end > self.max_pause:
+            yield from self.flush()
+
+        self.pending.append(word)
+        while len(self.pending) > 1 and (
+            len(self._text(self.pending)) > self.max_chars
+            or self.pending[-1].end - self.pending[0].start > self.max_duration
+        ):
+            cue = self._emit(self._best_split())
+            if cue is not None:
+                yield cue
+
+        # 文末、または十分な長さのあるセグメントの終わりで区切る
+        text = self._text(self.pending)
+        if text.endswith(SENTENCE_END) or (
+            word.segment_end and len(text) >= self.max_chars // 2
+        ):
+            yield from self.flush()
+
+    def flush(self) -> Iterator[srt.Cue]:
+        cue = self._emit(len(self.pending))
+        if cue is not None:
+            yield cue
+
+
+def convert(
+    fh: TextIO,
+    writer: srt.SrtWriter,
+    builder: CueBuilder | None = None,
+    pipeline: Pipeline | None = None,
+) -> int:
+    """
+    Whisper の JSON を読みながらSRTを書き出す
+
+    Returns:
+        int: 書き出した字幕の数
+    """
+    builder = builder or CueBuilder()
+    count = 0
+
+    def write(cues: Iterable[srt.Cue]) -> None:
+        nonlocal count
+        for cue in cues:
+            if pipeline is not None:
+                # 修正で空になった行・テキストが無くなった字幕は書き出さない
+                cue.lines = [line for line in map(pipeline.apply, cue.lines) if line]
+                if not cue.lines:
+                    continue
+            count += 1
+            cue.index = count
+            writer.write(cue)
+
+    for word in iter_words(iter_segments(fh)):
+        write(builder.feed(word))
+    write(builder.flush())
+    writer.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Whisper の verbose JSON からSRT字幕を生成します',
+        usage=__doc__.split('Usage:\n', 1)[1].split('\n\n', 1)[0],
+    )
+    parser.add_argument('input', help='Whisper の JSON（verbose_json / word_timestamps）')
+    parser.add_argument('output', nargs='?', help='出力SRT（- で標準出力）')
+    parser.add_argument(
+        '--max-chars',
+        type=int,
+        default=DEFAULT_MAX_CHARS,
+        help=f'1字幕の最大文字数（既定: {DEFAULT_MAX_CHARS}）',
+    )
+    parser.add_argument(
+        '--max-duration',
+        type=int,
+        default=DEFAULT_MAX_DURATION,
+        help=f'1字幕の最大表示時間（ms、既定: {DEFAULT_MAX_DURATION}）',
+    )
+    parser.add_argument(
+        '--max-pause',
+        type=int,
+        default=DEFAULT_MAX_PAUSE,
+        help=f'この長さ（ms）以上の無音で字幕を区切る（既定: {DEFAULT_MAX_PAUSE}）',
+    )
+    parser.add_argument(
+        '--rules',
+        help=f"適用するルールをカンマ区切りで指定（{', '.join(RULES)}。"
+        "既定: whitespace,glossary,trailing-punctuation。glossary は --glossary 指定時のみ）",
+    )
+    parser.add_argument('--glossary', type=Path, help='glossary ルールの用語集ファイル')
+    args = parser.parse_args()
+
+    if args.rules:
+        names = [name.strip() for name in args.rules.split(',') if name.strip()]
+        if args.glossary is not None and 'glossary' not in names:
+            print(
+                "❌ エラー: --glossary を使うには --rules に glossary を含めてください",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+    else:
+        names = ['whitespace', 'glossary', 'trailing-punctuation']
+        if args.glossary is None:
+            names.remove('glossary')
+    try:
+        pipeline = Pipeline.from_names(names, glossary=args.glossary)
+    except (ValueError, OSError) as e:
+        print(f"❌ エラー: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    input_file = Path(args.input)
+    if not input_file.exists():
+        print(f"❌ エラー: ファイルが見つかりません: {args.input}", file=sys.stderr)
+        sys.exit(1)
+    builder = CueBuilder(args.max_chars, args.max_duration, args.max_pause)
+
+    try:
+        with open(input_file, encoding='utf-8') as src:
+            if args.output == '-':
+                count = convert(src, srt.SrtWriter(sys.stdout), builder, pipeline)
+            else:
+                output_file = Path(args.output) if args.output else input_file.with_suffix('.srt')
+                with srt.atomic_write(output_file) as dst:
+                    count = convert(src, srt.SrtWriter(dst), builder, pipeline)
+    except (ValueError, OSError) as e:
+        print(f"❌ エラー: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.output != '-':
+        print(f"✅ {count}件の字幕を書き出しました: {output_file}")
+        print("ルール別の集計:")
+        for line in pipeline.report():
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
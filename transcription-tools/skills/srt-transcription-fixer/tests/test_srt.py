@@ -0,0 +1,143 @@
+"""
+srt モジュールの読み書きが元のバイト列に戻ることのテスト
+
+Usage:
+    python -m pytest transcription-tools/skills/srt-transcription-fixer/tests
+    python -m unittest discover transcription-tools/skills/srt-transcription-fixer/tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import srt  # noqa: E402
+from remove_trailing_punctuation import process_srt  # noqa: E402
+
+# 字幕として解釈できない行を含む入力
+MALFORMED = {
+    'preamble': (
+        'タイトル\n'
+        '\n'
+        '1\n00:00:01,000 --> 00:00:02,000\nこんにちは。\n'
+    ),
+    'broken_timing': (
+        '1\n00:00:00,500 --> 00:00:01,000\nあ。\n'
+        '\n'
+        '2\n00:00:01,000 -> 00:00:02,000\n壊れた字幕。\n'
+        '\n'
+        '3\n00:00:02,000 --> 00:00:03,000\nい。\n'
+    ),
+    'broken_first_cue': (
+        '1\n00:00:01,000 -> 00:00:02,000\n壊れた字幕。\n'
+        '\n'
+        '2\n00:00:02,000 --> 00:00:03,000\nい。\n'
+    ),
+    'dot_timestamps': '1\n00:00:01.500 --> 00:00:02.000  \nあ。\n',
+    'missing_index_and_blank_runs': (
+        '00:00:01,000 --> 00:00:02,000\nあ\n\n\n\n'
+        '5\n00:00:03,000 --> 00:00:04,000\nい\n\n\n'
+    ),
+    'crlf_bom_missing_blank': (
+        '\ufeff1\r\n00:00:01,000 --> 00:00:02,000\r\nあ\r\n'
+        '2\r\n00:00:03,000 --> 00:00:04,000\r\nい'
+    ),
+}
+# 改行コードが混在した入力（CRLF で始まり、LF の行が多い）
+MIXED_NEWLINES = (
+    '1\r\n00:00:01,000 --> 00:00:02,000\nあ。\n'
+    '\n'
+    '2\n00:00:03,000 --> 00:00:04,000\r\nい。\n'
+)
+# 字幕を1件も含まない入力
+CUELESS = {
+    'empty': '',
+    'blank_line': '\n',
+    'bom_only': '\ufeff',
+    'plain_text': 'これは字幕ではありません。\n\nただのテキスト、\n',
+}
+
+
+class RoundTripTest(unittest.TestCase):
+    def assert_round_trip(self, text: str) -> list[srt.Cue]:
+        fmt = srt.SrtFormat()
+        cues = srt.parse(text, fmt)
+        self.assertEqual(srt.compose(cues, fmt), text)
+        return cues
+
+    def test_malformed_input(self):
+        for name, text in MALFORMED.items():
+            with self.subTest(name):
+                self.assert_round_trip(text)
+
+    def test_cueless_input(self):
+        for name, text in CUELESS.items():
+            with self.subTest(name):
+                self.assertEqual(self.assert_round_trip(text), [])
+
+    def test_unparsable_lines_are_not_cue_text(self):
+        cues = self.assert_round_trip(MALFORMED['broken_timing'])
+        self.assertEqual([cue.lines for cue in cues], [['あ。'], ['い。']])
+
+    def test_changed_timing_is_reformatted(self):
+        fmt = srt.SrtFormat()
+        cues = srt.parse(MALFORMED['dot_timestamps'], fmt)
+        cues[0].end = 3000
+        self.assertEqual(
+            srt.compose(cues, fmt), '1\n00:00:01,500 --> 00:00:03,000\nあ。\n'
+        )
+
+    def test_mixed_newlines_use_the_first_line_ending(self):
+        fmt = srt.SrtFormat()
+        cues = srt.parse(MIXED_NEWLINES, fmt)
+        self.assertFalse(fmt.round_trip)
+        with self.assertWarns(UserWarning):
+            text = srt.compose(cues, fmt)
+        self.assertEqual(text, MIXED_NEWLINES.replace('\r\n', '\n').replace('\n', '\r\n'))
+
+
+class ProcessSrtTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'input.srt'
+
+    def process(self, text: str) -> str:
+        self.path.write_bytes(text.encode('utf-8'))
+        process_srt(str(self.path))
+        return self.path.read_bytes().decode('utf-8')
+
+    def test_only_cue_text_is_modified(self):
+        self.assertEqual(
+            self.process(MALFORMED['broken_timing']),
+            MALFORMED['broken_timing'].replace('あ。', 'あ').replace('い。', 'い'),
+        )
+
+    def test_punctuation_only_cue_is_kept_by_default(self):
+        text = (
+            '1\n00:00:01,000 --> 00:00:02,000\n。\n'
+            '\n'
+            '2\n00:00:03,000 --> 00:00:04,000\nい。\n'
+        )
+        self.assertEqual(self.process(text), text.replace('。', ''))
+
+    def test_cueless_file_is_unchanged(self):
+        for name, text in CUELESS.items():
+            with self.subTest(name):
+                self.assertEqual(self.process(text), text)
+
+    def test_mixed_newlines_are_unified(self):
+        with self.assertWarns(UserWarning):
+            text = self.process(MIXED_NEWLINES)
+        self.assertEqual(
+            text,
+            '1\r\n00:00:01,000 --> 00:00:02,000\r\nあ\r\n\r\n'
+            '2\r\n00:00:03,000 --> 00:00:04,000\r\nい\r\n',
+        )
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+text_rules の修正ルールのテスト
+
+Usage:
+    python -m pytest transcription-tools/skills/srt-transcription-fixer/tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from text_rules import Pipeline, Rule, load_glossary  # noqa: E402
+
+# text_rules が transcription-fixer の scripts をパスに追加している
+from apply_glossary import SKILL_MD  # noqa: E402
+
+
+class GlossaryRuleTest(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = Pipeline.from_names(['glossary'], glossary=SKILL_MD)
+
+    def test_terms_are_replaced(self):
+        self.assertEqual(self.pipeline.apply('クラウドコードを使う'), 'Claude Codeを使う')
+
+    def test_katakana_compounds_are_replaced(self):
+        self.assertEqual(self.pipeline.apply('エムシーピーサーバー'), 'MCPサーバー')
+
+    def test_context_terms_are_left_alone(self):
+        for text in ('4バイトのデータ', 'ドライバーを入れる', 'ターミナル駅で降りる', 'プランナー'):
+            with self.subTest(text):
+                self.assertEqual(self.pipeline.apply(text), text)
+
+    def test_ascii_terms_do_not_match_inside_words(self):
+        pipeline = Pipeline.from_names(['glossary'], glossary={'TS': 'TypeScript'})
+        self.assertEqual(pipeline.apply('TSVとTS'), 'TSVとTypeScript')
+
+
+class RuleTest(unittest.TestCase):
+    def test_rule_without_apply_cannot_be_created(self):
+        class Incomplete(Rule):
+            name = 'incomplete'
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+class LoadGlossaryTest(unittest.TestCase):
+    def load(self, text: str) -> dict[str, str]:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'terms.txt'
+            path.write_text(text, encoding='utf-8')
+            return load_glossary(path)
+
+    def test_slash_form(self):
+        self.assertEqual(
+            self.load('- cloud.md / クロード.md → CLAUDE.md\n'),
+            {'cloud.md': 'CLAUDE.md', 'クロード.md': 'CLAUDE.md'},
+        )
+
+    def test_tab_separated_and_comments(self):
+        self.assertEqual(self.load('# 用語集\nエムシーピー\tMCP\n'), {'エムシーピー': 'MCP'})
+
+    def test_ambiguous_targets_are_skipped(self):
+        self.assertEqual(self.load("ドライ → DRY (Don't Repeat Yourself)\n"), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+whisper_to_srt の "segments" 配列のストリーム読み込みのテスト
+
+Usage:
+    python -m pytest transcription-tools/skills/srt-transcription-fixer/tests
+"""
+
+import io
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from whisper_to_srt import iter_segments  # noqa: E402
+
+SEGMENTS = [{'start': i, 'end': i + 1, 'text': f'字幕{i}'} for i in range(3)]
+# "segments" の配列として読んではいけない箇所を含む入力
+DECOYS = {
+    'key_in_text': {
+        'text': '「"segments": [{"start": 9, "end": 9, "text": "x"}]」と読み上げた',
+        'segments': SEGMENTS,
+    },
+    'escaped_quote_before_key': {'text': '\\"segments\\": [', 'segments': SEGMENTS},
+    'nested_key': {
+        'meta': {'segments': [{'start': 9, 'end': 9, 'text': 'x'}]},
+        'segments': SEGMENTS,
+    },
+}
+
+
+class IterSegmentsTest(unittest.TestCase):
+    def read(self, text: str, **kwargs) -> list[dict]:
+        return list(iter_segments(io.StringIO(text), **kwargs))
+
+    def test_key_is_found_outside_strings_only(self):
+        for name, data in DECOYS.items():
+            for ensure_ascii in (True, False):
+                text = json.dumps(data, ensure_ascii=ensure_ascii)
+                # チャンクの境目がキー・エスケープの途中に来る場合も含める
+                for chunk_size in (1, 2, 3, 7, 1 << 16):
+                    with self.subTest(name, ensure_ascii=ensure_ascii, chunk_size=chunk_size):
+                        self.assertEqual(self.read(text, chunk_size=chunk_size), SEGMENTS)
+
+    def test_segment_array_only(self):
+        self.assertEqual(self.read(json.dumps(SEGMENTS), chunk_size=5), SEGMENTS)
+
+    def test_missing_segments(self):
+        for text in ('{"text": "segments"}', '{"text": "x", "other": [1]}'):
+            with self.subTest(text):
+                with self.assertRaises(ValueError):
+                    self.read(text, chunk_size=4)
+
+    def test_malformed_segment_is_capped(self):
+        text = '{"segments": [{"start": 0, "end": 1, "text": "a" ' + 'x' * 10000
+        with self.assertRaisesRegex(ValueError, 'デコードできません'):
+            self.read(text, chunk_size=100, max_segment=1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
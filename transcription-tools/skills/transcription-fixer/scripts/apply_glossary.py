@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+transcription-fixer の誤変換テーブルを機械的に適用するスクリプト
+
+SKILL.md の「主要な変換パターン」（`- 誤変換 / 誤変換 → 正しい表記`）を
+Aho-Corasick オートマトンにコンパイルし、最左最長一致で1パス置換する。
+文脈で判断が必要な項目（「文脈優先の判断」の表にある語、「〜文脈」の注記付き、
+「A / B」のように正解が複数ある項目、「DRY (Don't Repeat Yourself)」のように
+説明の括弧書きが付いた項目）は置換せず、モデルの判断に任せる。
+英数字で始まる/終わる語は、英数字の単語の途中（TSV の TS など）では一致させない。
+カタカナ語は複合語（エムシーピーサーバー → MCPサーバー）も置換するため、
+ほかの語の一部になりやすい語（バイト、ドライなど）は文脈優先の表に載せる。
+
+Usage:
+    python apply_glossary.py input.txt [output.txt]
+    python apply_glossary.py subtitle.srt [output.srt]
+    python apply_glossary.py --list
+
+    output を省略すると input を上書きします。
+    .srt ファイルは字幕テキストのみを置換し、番号・タイムコードは変更しません。
+"""
+
+import argparse
+import re
+import sys
+from collections import Counter, deque
+from pathlib import Path
+
+SKILL_DIR = Path(__file__).resolve().parent.parent
+SKILL_MD = SKILL_DIR / 'SKILL.md'
+# 共通SRTモジュールは srt-transcription-fixer 側にある
+sys.path.insert(0, str(SKILL_DIR.parent / 'srt-transcription-fixer' / 'scripts'))
+
+import srt  # noqa: E402
+
+PATTERN_SECTION = '### 2. 主要な変換パターン'
+ENTRY_RE = re.compile(r'^-\s+(.+?)\s+→\s+(.+?)\s*$')
+CONTEXT_TABLE_RE = re.compile(r'^\|\s*([^|\s]+)\s*\|.*\|.*\|$')
+# 正しい表記に付いた説明の括弧書き（"DRY (Don't Repeat Yourself)", "paths（…）"）
+ANNOTATION_RE = re.compile(r'\(.+\)|（.+）')
+
+
+def _is_word_char(char: str) -> bool:
+    """英数字の単語を構成する文字か（境界判定用）"""
+    return char.isascii() and (char.isalnum() or char == '_')
+
+
+class GlossaryAutomaton:
+    """誤変換 → 正しい表記 の辞書を Aho-Corasick オートマトンで一括置換する"""
+
+    def __init__(self, mapping: dict[str, str]):
+        # ノードごとの遷移・失敗リンク・出力リンク・深さ・置換先
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.output: list[int] = [0]
+        self.depth: list[int] = [0]
+        self.replacement: list[str | None] = [None]
+        # 英数字で始まる/終わる語は、前後に英数字が続かない位置でのみ一致させる
+        # （"TS" が "TSV" に一致しない）
+        self.bounded: list[tuple[bool, bool]] = [(False, False)]
+
+        for source, target in mapping.items():
+            if source and source != target:
+                self._add(source, target)
+        self._build_links()
+
+    def _add(self, source: str, target: str) -> None:
+        node = 0
+        for char in source:
+            nxt = self.goto[node].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(0)
+                self.depth.append(self.depth[node] + 1)
+                self.replacement.append(None)
+                self.bounded.append((False, False))
+                self.goto[node][char] = nxt
+            node = nxt
+        self.replacement[node] = target
+        self.bounded[node] = (_is_word_char(source[0]), _is_word_char(source[-1]))
+
+    def _build_links(self) -> None:
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                f = self.fail[node]
+                while f and char not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                fail = self.fail[child]
+                # 出力リンク: 失敗リンクをたどって最初に見つかる終端ノード
+                self.output[child] = (
+                    fail if self.replacement[fail] is not None else self.output[fail]
+                )
+
+    def replace(self, text: str, counter: Counter | None = None) -> str:
+        """最左最長一致で置換した文字列を返す"""
+        goto, fail, output = self.goto, self.fail, self.output
+        depth, replacement, bounded = self.depth, self.replacement, self.bounded
+
+        # 開始位置ごとの最長一致 (終了位置, 終端ノード)
+        longest: dict[int, tuple[int, int]] = {}
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            match = node if replacement[node] is not None else output[node]
+            while match:
+                start, end = i + 1 - depth[match], i + 1
+                left, right = bounded[match]
+                if not (
+                    (left and start > 0 and _is_word_char(text[start - 1]))
+                    or (right and end < len(text) and _is_word_char(text[end]))
+                ):
+                    if start not in longest or longest[start][0] < end:
+                        longest[start] = (end, match)
+                match = output[match]
+
+        if not longest:
+            return text
+
+        parts = []
+        pos = 0
+        for start in sorted(longest):
+            if start < pos:
+                continue
+            end, match = longest[start]
+            parts.append(text[pos:start])
+            parts.append(replacement[match])
+            if counter is not None:
+                counter[text[start:end]] += 1
+            pos = end
+        parts.append(text[pos:])
+        return ''.join(parts)
+
+
+def is_ambiguous(target: str) -> bool:
+    """正しい表記が文脈次第・複数・説明付きで、機械的に置換できない項目か"""
+    return '文脈' in target or ' / ' in target or bool(ANNOTATION_RE.search(target))
+
+
+def load_skill_glossary(path: Path = SKILL_MD) -> tuple[dict[str, str], list[str]]:
+    """
+    SKILL.md の変換パターンを読み込む
+
+    Returns:
+        tuple: (誤変換 → 正しい表記 の辞書, 文脈依存のため除外した誤変換のリスト)
+    """
+    mapping: dict[str, str] = {}
+    skipped: list[str] = []
+    context_terms: set[str] = set()
+    in_patterns = False
+    in_context_table = False
+    table_header_seen = False
+
+    for line in path.read_text(encoding='utf-8').splitlines():
+        if line.startswith('### 1. 文脈優先の判断'):
+            in_context_table = True
+            continue
+        if line.startswith(PATTERN_SECTION):
+            in_patterns, in_context_table = True, False
+            continue
+        if line.startswith('### ') or line.startswith('## '):
+            in_patterns = in_context_table = False
+            continue
+
+        if in_context_table:
+            match = CONTEXT_TABLE_RE.match(line)
+            if match and not set(match.group(1)) <= set('-'):
+                if table_header_seen:
+                    context_terms.add(match.group(1))
+                table_header_seen = True
+            continue
+        if not in_patterns:
+            continue
+
+        match = ENTRY_RE.match(line)
+        if not match:
+            continue
+        sources = [s.strip().strip('`') for s in match.group(1).split(' / ')]
+        target = match.group(2).strip().strip('`')
+        if is_ambiguous(target):
+            skipped.extend(sources)
+            continue
+        for source in sources:
+            if source in context_terms:
+                skipped.append(source)
+            else:
+                mapping[source] = target
+
+    # 文脈依存の語は他の項目から取り込まれていても除外する
+    for term in sorted(context_terms):
+        mapping.pop(term, None)
+        if term not in skipped:
+            skipped.append(term)
+    return mapping, skipped
+
+
+def apply_file(
+    automaton: GlossaryAutomaton,
+    input_path: str,
+    output_path: str | None = None,
+) -> Counter:
+    """
+    テキストまたはSRTファイルに置換を適用する（1行ずつストリーム処理）
+
+    Returns:
+        Counter: 置換した誤変換ごとの件数
+    """
+    input_file = Path(input_path)
+    if not input_file.exists():
+        raise FileNotFoundError(f"ファイルが見つかりません: {input_path}")
+    output_file = Path(output_path) if output_path else input_file
+
+    counter: Counter = Counter()
+    with (
+        open(input_file, encoding='utf-8', newline='') as src,
+        srt.atomic_write(output_file) as dst,
+    ):
+        if input_file.suffix.lower() == '.srt':
+            fmt = srt.SrtFormat()
+            writer = srt.SrtWriter(dst, fmt)
+            for cue in srt.iter_cues(src, fmt):
+                cue.lines = [automaton.replace(line, counter) for line in cue.lines]
+                writer.write(cue)
+            writer.close()
+        else:
+            for line in src:
+                dst.write(automaton.replace(line, counter))
+    return counter
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='transcription-fixer の誤変換テーブルを文字起こし・SRTに適用します'
+    )
+    parser.add_argument('input', nargs='?', help='入力ファイル（.srt またはテキスト）')
+    parser.add_argument('output', nargs='?', help='出力ファイル（省略時は上書き）')
+    parser.add_argument('--skill', type=Path, default=SKILL_MD, help='変換パターンを読むSKILL.md')
+    parser.add_argument('--list', action='store_true', help='適用する変換と除外した項目を表示')
+    args = parser.parse_args()
+
+    try:
+        mapping, skipped = load_skill_glossary(args.skill)
+    except OSError as e:
+        print(f"❌ エラー: {e}")
+        sys.exit(1)
+
+    if args.list:
+        for source, target in mapping.items():
+            print(f"{source} → {target}")
+        print(f"\n文脈依存のため除外: {', '.join(skipped)}")
+        return
+    if not args.input:
+        parser.print_usage()
+        sys.exit(1)
+
+    automaton = GlossaryAutomaton(mapping)
+    try:
+        counter = apply_file(automaton, args.input, args.output)
+    except FileNotFoundError as e:
+        print(f"❌ エラー: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ 予期せぬエラー: {e}")
+        sys.exit(1)
+
+    total = sum(counter.values())
+    if total:
+        print(f"✅ {total}箇所の誤変換を修正しました")
+        for source, count in counter.most_common(10):
+            print(f"  {source} → {mapping[source]}: {count}件")
+        if len(counter) > 10:
+            print(f"  ... 他 {len(counter) - 10} 種類")
+    else:
+        print("✅ 修正すべき誤変換はありませんでした")
+    print(f"💡 文脈で判断が必要な語（{'、'.join(skipped)}）は確認してください")
+
+
+if __name__ == "__main__":
+    main()